@@ -0,0 +1,10 @@
+"""Performance benchmarks for the Chess Club package.
+
+Run from the repository root with the package importable, e.g.:
+
+    PYTHONPATH=src python -m benchmarks --size medium --output results.json
+    PYTHONPATH=src python -m benchmarks --baseline results.json
+
+`generator` builds a seeded synthetic club in a SQLite file and `suite`
+times the hot paths and compares results against a stored baseline.
+"""
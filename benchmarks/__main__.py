@@ -0,0 +1,102 @@
+"""Command-line entry point: `python -m benchmarks --help`."""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import chess_club.db as db
+import chess_club.ranking as ranking
+
+from benchmarks import generator, suite
+
+SIZES = {
+    "small": (200, 5_000),
+    "medium": (2_000, 100_000),
+    "large": (10_000, 1_000_000),
+}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium",
+                        help="preset club size (players, matches)")
+    parser.add_argument("--players", type=int, help="override the preset player count")
+    parser.add_argument("--matches", type=int, help="override the preset match count")
+    parser.add_argument("--years", type=float, default=5.0, help="date spread of the generated matches")
+    parser.add_argument("--sections", type=int, default=1,
+                        help="split players into sections that never play each other")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", help="SQLite file to use; an existing file is reused as-is")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="run only these cases")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous JSON results file")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    players, matches = SIZES[args.size]
+    players = args.players or players
+    matches = args.matches or matches
+
+    tmpdir = None
+    path = args.db
+    if path is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, "bench.db")
+    reuse = os.path.exists(path)
+
+    conn = db.get_connection(path)
+    db.init_db(conn)
+    club = None
+    if not reuse:
+        start = time.perf_counter()
+        club = generator.generate_club(conn, players, matches, years=args.years, seed=args.seed,
+                                      sections=args.sections)
+        club["generate_seconds"] = time.perf_counter() - start
+        print(f"Generated {players} players / {matches} matches in {club['generate_seconds']:.1f}s")
+    if args.only and "recompute" not in args.only:
+        # targeted cases need the audits a full recompute writes
+        suite.quiet(ranking.recompute, conn)
+
+    results = suite.run_suite(conn, repeat=args.repeat, memory=not args.no_memory, only=args.only)
+    conn.close()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+    for name, stats in results.items():
+        peak = f"{stats['peak_kib']:>10.0f} KiB" if "peak_kib" in stats else ""
+        print(f"{name:34} median {stats['median'] * 1000:10.2f} ms  min {stats['min'] * 1000:10.2f} ms {peak}")
+
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "club": club if club is not None else {"db": path, "reused": True},
+        "repeat": args.repeat,
+        "environment": suite.environment(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+        print(f"Results written to {args.output}")
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print(f"\nCompared with {args.baseline}:")
+        for name, base, median, ratio, slow in suite.compare(results, baseline, args.threshold):
+            flag = "  REGRESSION" if slow else ""
+            print(f"{name:34} {base * 1000:10.2f} ms -> {median * 1000:10.2f} ms  x{ratio:5.2f}{flag}")
+            regressed = regressed or slow
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
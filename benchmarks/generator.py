@@ -0,0 +1,106 @@
+"""Seeded synthetic club generator.
+
+Players get a hidden playing strength and an activity weight, so a few
+regulars play most games while others appear rarely. Weekly tournaments are
+spread over the requested number of years and results are drawn from the
+strength difference with a realistic share of draws. Optionally players
+are split into sections that never meet, as in clubs with separate junior
+and senior circuits. The same seed always produces the same club.
+"""
+import itertools
+import math
+import random
+from datetime import date, timedelta
+
+import chess_club.repo as repo
+
+END_DATE = date(2025, 12, 31)
+CHUNK = 50_000
+
+
+def _draw_result(rng, strength1: float, strength2: float) -> float:
+    expected = 1.0 / (1.0 + 10 ** ((strength2 - strength1) / 400.0))
+    # draws are most common between evenly matched players
+    draw_p = 0.35 * (1.0 - abs(expected - 0.5) * 2.0)
+    roll = rng.random()
+    if roll < draw_p:
+        return 0.5
+    return 1.0 if rng.random() < expected else 0.0
+
+
+def generate_club(conn, players: int, matches: int, years: float = 5.0, seed: int = 1,
+                  sections: int = 1, end_date: date = END_DATE):
+    """Fill an initialised, empty database with a synthetic club.
+
+    With `sections` above one, players are dealt round-robin into that many
+    sections and only play within their own section.
+
+    Matches are written with `repo.bulk_insert_matches` in chunks of
+    `CHUNK` rows and counted in PlayerStats, but carry no rating audits: run
+    `ranking.recompute` before any targeted recompute. Returns a summary
+    dict with the generated counts and date range.
+    """
+    if sections < 1 or players < 2 * sections:
+        raise ValueError("Every section needs at least two players")
+    rng = random.Random(seed)
+
+    names = [f"Player {i:05d}" for i in range(players)]
+    repo.add_players(conn, names)
+    ids_by_name = repo.get_player_ids_by_name(conn, names)
+    pids = [ids_by_name[name] for name in names]
+    strength = [rng.gauss(1500.0, 300.0) for _ in pids]
+    activity = [rng.lognormvariate(0.0, 1.0) for _ in pids]
+
+    weeks = max(1, int(years * 52))
+    start = end_date - timedelta(weeks=weeks)
+    tournament_rows = [(f"Week {start + timedelta(weeks=w)}", (start + timedelta(weeks=w)).isoformat())
+                       for w in range(weeks)]
+    repo.add_tournaments(conn, tournament_rows)
+    tids_by_name = repo.get_tournaments_by_name(conn, [name for name, _ in tournament_rows])
+    tournaments = [(tids_by_name[name][0], date.fromisoformat(d)) for name, d in tournament_rows]
+    conn.commit()
+
+    members = [list(range(sec, players, sections)) for sec in range(sections)]
+    cumulative = [list(itertools.accumulate(activity[i] for i in group)) for group in members]
+    section_weights = [weights[-1] for weights in cumulative]
+
+    rows = []
+    rated = []
+    per_week = matches / weeks
+    written = 0
+    for week, (tid, tdate) in enumerate(tournaments):
+        # spread the remainder so exactly `matches` rows are produced
+        target = math.floor(per_week * (week + 1)) if week < weeks - 1 else matches
+        per_section = [0] * sections
+        for sec in rng.choices(range(sections), weights=section_weights, k=target - written):
+            per_section[sec] += 1
+        for sec, count in enumerate(per_section):
+            group = members[sec]
+            weights = cumulative[sec]
+            firsts = rng.choices(group, cum_weights=weights, k=count)
+            seconds = rng.choices(group, cum_weights=weights, k=count)
+            for i, j in zip(firsts, seconds):
+                while j == i:
+                    j = rng.choices(group, cum_weights=weights)[0]
+                result = _draw_result(rng, strength[i], strength[j])
+                match_date = (tdate + timedelta(days=rng.randrange(7))).isoformat()
+                rows.append((tid, pids[i], pids[j], result, match_date))
+                rated.append((pids[i], pids[j], result, match_date))
+        written = target
+        if len(rows) >= CHUNK or week == weeks - 1:
+            repo.bulk_insert_matches(conn, rows)
+            repo.add_matches_to_player_stats(conn, rated)
+            conn.commit()
+            rows = []
+            rated = []
+
+    return {
+        "players": players,
+        "matches": matches,
+        "tournaments": weeks,
+        "first_date": start.isoformat(),
+        "last_date": (start + timedelta(weeks=weeks - 1, days=6)).isoformat(),
+        "sections": sections,
+        "seed": seed,
+    }
+
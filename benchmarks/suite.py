@@ -0,0 +1,147 @@
+"""Timed benchmark cases and baseline comparison.
+
+Each case is timed `repeat` times with `time.perf_counter`; peak Python
+memory is measured in one extra run under `tracemalloc`, so the tracing
+overhead does not distort the timings. Output from functions that print
+(recompute, leaderboard) is discarded.
+"""
+import contextlib
+import io
+import platform
+import sqlite3
+import statistics
+import time
+import tracemalloc
+
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def _latest_match(conn):
+    return conn.execute(
+        "SELECT id, tournament_id, player1_id, player2_id, date FROM Matches "
+        "WHERE result IS NOT NULL ORDER BY date DESC, id DESC LIMIT 1"
+    ).fetchone()
+
+
+def _match_at_fraction(conn, fraction: float):
+    """Id of the rated match `fraction` of the way through replay order."""
+    (total,) = conn.execute("SELECT COUNT(*) FROM Matches WHERE result IS NOT NULL").fetchone()
+    offset = min(max(0, int(total * fraction)), max(0, total - 1))
+    (match_id,) = conn.execute(
+        "SELECT id FROM Matches WHERE result IS NOT NULL ORDER BY date, id LIMIT 1 OFFSET ?", (offset,)
+    ).fetchone()
+    return match_id
+
+
+def _most_active_player(conn):
+    return conn.execute("SELECT player_id FROM PlayerStats ORDER BY games DESC LIMIT 1").fetchone()[0]
+
+
+def build_cases(conn):
+    """Return `[(name, callable)]` for every benchmarked operation.
+
+    Cases that write are repeatable: `create_match` appends a game on the
+    latest date and `update_match` flips the result of the latest game, so
+    each run does the same amount of work.
+    """
+    _, tid, p1, p2, last_date = _latest_match(conn)
+    tail_match = _match_at_fraction(conn, 0.9)
+    busy_player = _most_active_player(conn)
+    midpoint = repo.get_match(conn, _match_at_fraction(conn, 0.5))[5]
+    results = [1.0, 0.0]
+
+    def create_match():
+        tournament.create_match(conn, tid, p1, p2, 0.5, last_date)
+
+    def update_match():
+        latest = _latest_match(conn)[0]
+        results.reverse()
+        tournament.update_match(conn, latest, results[0])
+
+    return [
+        ("recompute", lambda: quiet(ranking.recompute, conn)),
+        ("recompute_from_match_last_10pct", lambda: quiet(ranking.recompute_from_match, conn, tail_match)),
+        ("create_match", create_match),
+        ("update_match", update_match),
+        ("show_leaderboard", lambda: quiet(ranking.show_leaderboard, conn, True)),
+        ("leaderboard_as_of_midpoint", lambda: ranking.leaderboard_as_of(conn, midpoint)),
+        ("list_matches_for_player", lambda: repo.list_matches_for_player(conn, busy_player)),
+    ]
+
+
+def measure(fn, repeat: int = 3, memory: bool = True):
+    """Time `fn` and optionally record its tracemalloc peak in KiB."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    out = {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        out["peak_kib"] = round(peak / 1024, 1)
+    return out
+
+
+def run_suite(conn, repeat: int = 3, memory: bool = True, only=None):
+    """Run the selected cases (all by default) and return `{name: stats}`.
+
+    `recompute` always runs first when selected, since the other cases rely
+    on the rating audits it writes.
+    """
+    results = {}
+    for name, fn in build_cases(conn):
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, repeat, memory)
+    return results
+
+
+def environment():
+    """Describe the interpreter and libraries the results were taken with."""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "sqlite": sqlite3.sqlite_version,
+        "numpy": numpy_version,
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold: float = 1.2):
+    """Compare median timings against a baseline results dict.
+
+    Returns `[(name, baseline_median, median, ratio, regressed)]` for cases
+    present in both; a case regresses when it is more than `threshold` times
+    slower than the baseline.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, stats in results.items():
+        base = base_results.get(name)
+        if base is None or not base.get("median"):
+            continue
+        ratio = stats["median"] / base["median"]
+        rows.append((name, base["median"], stats["median"], ratio, ratio > threshold))
+    return rows
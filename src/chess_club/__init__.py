@@ -1,8 +1,16 @@
 """Chess Club package (src layout).
 
 This mirrors the package at the repo root but lives under `src/` for
-proper packaging and tests.
+proper packaging and tests. Submodules are imported on first attribute
+access, so `import chess_club` (and the `chess-club` entry point) stays
+cheap.
 """
-from . import db, elo, repo, tournament, ranking, config, cli
+import importlib
 
 __all__ = ["db", "elo", "repo", "tournament", "ranking", "config", "cli"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
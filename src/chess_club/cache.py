@@ -0,0 +1,83 @@
+"""Read-through LRU cache of player rows for one connection.
+
+`repo` reads player profiles (ratings, last game, game count) through the
+cache attached to `db.Connection` objects and drops entries whenever it
+writes those rows. Writes from other connections or processes are caught by
+`PRAGMA data_version`, which changes whenever another connection commits:
+the whole cache is then discarded before the next lookup.
+"""
+from collections import OrderedDict
+
+
+class PlayerCache:
+    """Bounded LRU of `{player_id: row}` with hit/miss counters.
+
+    `maxsize` 0 disables caching; lookups then always load (and count as
+    misses).
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._rows = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.resets = 0
+
+    def lookup(self, conn, player_ids, load):
+        """Return `{player_id: row}` for the existing players among `player_ids`.
+
+        Ids not cached are fetched together with `load(conn, ids)`, which
+        returns a dict of the rows it found. Unknown players are not cached.
+        """
+        self._check_version(conn)
+        rows = self._rows
+        found = {}
+        missing = []
+        for pid in player_ids:
+            row = rows.get(pid)
+            if row is None:
+                missing.append(pid)
+            else:
+                rows.move_to_end(pid)
+                found[pid] = row
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            loaded = load(conn, missing)
+            found.update(loaded)
+            if self.maxsize:
+                rows.update(loaded)
+                while len(rows) > self.maxsize:
+                    rows.popitem(last=False)
+        return found
+
+    def invalidate(self, player_ids):
+        """Drop the given players' rows after this connection wrote them."""
+        for pid in player_ids:
+            if self._rows.pop(pid, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every row (bulk writes, rollbacks, other writers)."""
+        self.invalidations += len(self._rows)
+        self._rows.clear()
+
+    def _check_version(self, conn):
+        (version,) = conn.execute("PRAGMA data_version").fetchone()
+        if self._version is not None and version != self._version and self._rows:
+            self.resets += 1
+            self._rows.clear()
+        self._version = version
+
+    def stats(self) -> dict:
+        """Counters since the connection was opened."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._rows),
+            "maxsize": self.maxsize,
+            "invalidations": self.invalidations,
+            "resets": self.resets,
+        }
@@ -1,11 +1,25 @@
 
-"""Interactive CLI for the Chess Club package (src layout).
-
+"""Command-line interface for the Chess Club package (src layout).
+
+Without a subcommand `chess-club` runs the interactive menu. Subcommands
+(`recompute`, `leaderboard`, `player-games`, `import`, `export`, `bench`) run one task
+non-interactively for scripts and cron jobs; `--json` prints
+machine-readable output and `--timing` reports wall time and rows processed
+on stderr. `--profile` (menu or subcommand) prints a per-operation time and
+SQL breakdown from `chess_club.metrics` on exit.
+
+`tournament` and `ranking` (and through them the rating engine and NumPy)
+are imported by the flows that use them, so the menu appears without
+loading them.
 """
+import argparse
+import contextlib
+import json
+import sys
+import time
+
 import chess_club.db as db
 import chess_club.repo as repo
-import chess_club.tournament as tournament
-import chess_club.ranking as ranking
 import chess_club.config as config
 
 
@@ -14,7 +28,8 @@ def add_player_flow(conn):
     if not name:
         return
     try:
-        repo.add_player(conn, name, config.DEFAULT_ELO)
+        with db.UnitOfWork(conn):
+            repo.add_player(conn, name, config.DEFAULT_ELO)
         print(f"✅ Player '{name}' added with initial Elo {config.DEFAULT_ELO}.")
     except Exception:
         print("⚠️ Player already exists or error adding player.")
@@ -24,7 +39,8 @@ def create_tournament_flow(conn):
     name = input("Enter tournament name: ").strip()
     tdate = input("Enter tournament date (YYYY-MM-DD): ").strip()
     try:
-        repo.add_tournament(conn, name, tdate)
+        with db.UnitOfWork(conn):
+            repo.add_tournament(conn, name, tdate)
         print(f"✅ Tournament '{name}' created on {tdate}.")
     except Exception:
         print("⚠️ Tournament already exists or error creating tournament.")
@@ -57,6 +73,9 @@ def open_tournament_flow(conn):
 
 
 def tournament_menu(conn, tid):
+    import chess_club.ranking as ranking
+    import chess_club.tournament as tournament
+
     while True:
         t = repo.get_tournament(conn, tid)
         if not t:
@@ -72,6 +91,8 @@ def tournament_menu(conn, tid):
         print("6. Delete Tournament")
         print("7. Delete Match")
         print("8. Update Match")
+        print("9. Pair Next Swiss Round")
+        print("10. Generate Round-Robin Schedule")
         choice = input("Select an option: ").strip()
 
         if choice == "1":
@@ -158,6 +179,9 @@ def tournament_menu(conn, tid):
             rows = repo.list_matches_for_tournament(conn, tid)
             print("\n📜 Tournament Matches:")
             for mid, p1, p2, result, d, p1_before, p1_after, p2_before, p2_after, p1_g_before, p1_g_after, p2_g_before, p2_g_after in rows:
+                if result is None:
+                    print(f"{d} [id {mid}]: {p1} vs {p2} (scheduled)")
+                    continue
                 if result == 1:
                     outcome = f"{p1} beat {p2}"
                 elif result == 0:
@@ -205,7 +229,8 @@ def tournament_menu(conn, tid):
             if not new_date:
                 new_date = cur_date
             try:
-                repo.update_tournament(conn, tid, new_name, new_date)
+                with db.UnitOfWork(conn):
+                    repo.update_tournament(conn, tid, new_name, new_date)
                 print("✅ Tournament updated.")
             except Exception:
                 print("⚠️ Error updating tournament.")
@@ -227,9 +252,10 @@ def tournament_menu(conn, tid):
                     continue
 
             try:
-                repo.delete_tournament(conn, tid)
-                # recompute ratings after removing matches
-                ranking.recompute(conn)
+                with db.UnitOfWork(conn):
+                    repo.delete_tournament(conn, tid)
+                    # recompute ratings after removing matches
+                    ranking.recompute(conn)
                 print("✅ Tournament and its games deleted. Ratings recomputed.")
                 return
             except Exception as e:
@@ -264,8 +290,9 @@ def tournament_menu(conn, tid):
                 print("Deletion cancelled.")
                 continue
             try:
-                repo.delete_match(conn, mid)
-                ranking.recompute(conn)
+                with db.UnitOfWork(conn):
+                    repo.delete_match(conn, mid)
+                    ranking.recompute(conn)
                 print("✅ Match deleted and ratings recomputed.")
             except Exception as e:
                 print("⚠️ Error deleting match:", e)
@@ -322,10 +349,36 @@ def tournament_menu(conn, tid):
             except Exception as e:
                 print("⚠️ Error updating match:", e)
             continue
+        elif choice == "9":
+            match_date = input(f"Round date (YYYY-MM-DD) (leave blank for '{tdate}'): ").strip() or None
+            try:
+                pairs = tournament.pair_swiss_round(conn, tid, match_date)
+            except ValueError as e:
+                print("⚠️ Cannot pair round:", e)
+                continue
+            _print_round(conn, tid, pairs)
+        elif choice == "10":
+            double = input("Double round-robin? (y/N): ").strip().lower() == "y"
+            try:
+                rounds = tournament.generate_round_robin(conn, tid, double)
+            except ValueError as e:
+                print("⚠️ Cannot generate schedule:", e)
+                continue
+            games = sum(len(rnd.pairs) for rnd in rounds)
+            print(f"✅ Scheduled {games} games in {len(rounds)} rounds. Enter results with option 8.")
         else:
             print("⚠️ Invalid choice. Try again.")
 
 
+def _print_round(conn, tid, pairs):
+    names = dict(repo.get_tournament_players(conn, tid))
+    print(f"\n♟️ Round {pairs.number} pairings (white first):")
+    for board, (mid, white, black) in enumerate(pairs.pairs, start=1):
+        print(f"{board:4d}. {names.get(white, white)} vs {names.get(black, black)} [match {mid}]")
+    if pairs.bye is not None:
+        print(f"  Bye: {names.get(pairs.bye, pairs.bye)}")
+
+
 def show_player_games_flow(conn):
     players = repo.list_players(conn)
     if not players:
@@ -352,13 +405,16 @@ def show_player_games_flow(conn):
         print("⚠️ Invalid player ID.")
         return
 
-    matches = repo.list_matches_for_player(conn, pid)
-    if not matches:
-        print("  (No matches for this player.)")
-        return
+    _print_player_games(conn, pid)
+
 
-    print(f"\n📚 Matches for player ID {pid}:")
-    for row in matches:
+def _print_player_games(conn, pid: int):
+    """Print a player's match history with rating changes, streaming the rows."""
+    printed = False
+    for row in repo.iter_matches_for_player(conn, pid):
+        if not printed:
+            print(f"\n📚 Matches for player ID {pid}:")
+            printed = True
         (
             mid, tname, mdate,
             p1id, p1name, p1_before, p1_after,
@@ -428,9 +484,13 @@ def show_player_games_flow(conn):
             print(f"{mdate} | Tournament: {tname or '(none)'} | {me_name} {outcome} vs {opp_name} | " + (g_part if g_part else "G2:(none)"))
         else:
             print(f"{mdate} | Tournament: {tname or '(none)'} | {me_name} {outcome} vs {opp_name} | " + (elo_part if elo_part else "Elo:(none)"))
+    if not printed:
+        print("  (No matches for this player.)")
 
 
 def delete_player_flow(conn):
+    import chess_club.tournament as tournament
+
     players = repo.list_players(conn)
     if not players:
         print("⚠️ No players in club.")
@@ -479,16 +539,40 @@ def delete_player_flow(conn):
             return
 
     try:
-        repo.delete_player(conn, pid)
-        ranking.recompute(conn)
-        print("✅ Player and their games deleted. Ratings recomputed.")
+        if tournament.delete_player(conn, pid):
+            print("✅ Player and their games deleted. Full ratings recompute was performed.")
+        else:
+            print("✅ Player and their games deleted. Targeted recompute applied.")
     except Exception as e:
         print("⚠️ Error deleting player:", e)
 
 
-def main():
-    conn = db.get_connection(config.DB_PATH)
-    db.init_db(conn)
+def leaderboard_flow(conn, show_provisional: bool):
+    import chess_club.ranking as ranking
+
+    page = 1
+    while True:
+        pages = ranking.show_leaderboard(conn, show_provisional, config.LEADERBOARD_PAGE_SIZE, page)
+        if pages <= 1:
+            return
+        choice = input(f"\nPage {page}/{pages} — enter a page number, 'n' for next (blank to return): ").strip().lower()
+        if not choice:
+            return
+        if choice == "n":
+            page = page + 1 if page < pages else 1
+            continue
+        try:
+            page = int(choice)
+        except ValueError:
+            print("⚠️ Invalid page number.")
+            continue
+        if not 1 <= page <= pages:
+            print("⚠️ Invalid page number.")
+            page = 1
+
+
+def menu(conn):
+    """Run the interactive menu until the user exits (closes `conn`)."""
     show_prov = config.SHOW_PROVISIONAL_IN_LEADERBOARD
     while True:
         state = "ON" if show_prov else "OFF"
@@ -511,12 +595,13 @@ def main():
         elif choice == "3":
             open_tournament_flow(conn)
         elif choice == "4":
-            ranking.show_leaderboard(conn, show_prov)
+            leaderboard_flow(conn, show_prov)
         elif choice == "5":
             print("👋 Goodbye!")
             conn.close()
             break
         elif choice == "6":
+            import chess_club.ranking as ranking
             ranking.recompute(conn)
         elif choice == "7":
             show_prov = not show_prov
@@ -530,5 +615,191 @@ def main():
             print("⚠️ Invalid choice. Try again.")
 
 
+
+def _player_game_records(pid: int, rows):
+    """Shape `repo.list_matches_for_player` rows from `pid`'s side for JSON."""
+    records = []
+    for row in rows:
+        mid, tname, mdate, p1id, p1name, p1_before, p1_after, p2id, p2name, p2_before, p2_after = row[:11]
+        g2 = row[11:23]
+        result = row[23]
+        if pid == p1id:
+            opp_id, opp_name, elo, mine = p2id, p2name, (p1_before, p1_after), g2[:6]
+            score = result
+        else:
+            opp_id, opp_name, elo, mine = p1id, p1name, (p2_before, p2_after), g2[6:]
+            score = 1.0 - result if result is not None else None
+        records.append({
+            "match_id": mid, "date": mdate, "tournament": tname,
+            "opponent_id": opp_id, "opponent": opp_name, "score": score,
+            "elo_before": elo[0], "elo_after": elo[1],
+            "g2_before": mine[0], "g2_after": mine[1],
+            "g2_rd_before": mine[2], "g2_rd_after": mine[3],
+            "g2_vol_before": mine[4], "g2_vol_after": mine[5],
+        })
+    return records
+
+
+def _cmd_recompute(conn, args):
+    import chess_club.ranking as ranking
+
+    if args.from_match is not None:
+        return ranking.recompute_from_match(conn, args.from_match)
+    return ranking.recompute(conn)
+
+
+def _cmd_leaderboard(conn, args):
+    import chess_club.ranking as ranking
+
+    if not args.json:
+        if args.as_of:
+            ranking.show_leaderboard_as_of(conn, args.as_of, config.SHOW_PROVISIONAL_IN_LEADERBOARD, args.limit)
+        else:
+            ranking.show_leaderboard(conn, config.SHOW_PROVISIONAL_IN_LEADERBOARD, page_size=args.limit or 0)
+        return None
+    if args.as_of:
+        rows = ranking.leaderboard_as_of(conn, args.as_of, limit=args.limit)
+    else:
+        rows = repo.get_leaderboard(conn, limit=args.limit)
+    out = [{"rank": rank, **dict(zip(repo.LEADERBOARD_FIELDS, row))} for rank, row in enumerate(rows, start=1)]
+    print(json.dumps(out, indent=2))
+    return len(rows)
+
+
+def _cmd_player_games(conn, args):
+    if repo.get_player(conn, args.player_id) is None:
+        raise ValueError(f"Player {args.player_id} not found")
+    if not args.json:
+        _print_player_games(conn, args.player_id)
+        return None
+    rows = repo.list_matches_for_player(conn, args.player_id)
+    print(json.dumps(_player_game_records(args.player_id, rows), indent=2))
+    return len(rows)
+
+
+def _cmd_import(conn, args):
+    import chess_club.importer as importer
+
+    # keep recompute progress messages out of JSON output
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        report = importer.import_matches(conn, args.file, fmt=args.format, create_missing=args.create_missing,
+                                         chunk_size=args.chunk_size)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"✅ Imported {report['imported']} matches.")
+        for line_no, message in report["errors"]:
+            print(f"⚠️ Line {line_no}: {message}")
+    return report["imported"] + len(report["errors"])
+
+
+def _cmd_export(conn, args):
+    import chess_club.export as export
+
+    if args.what == "matches":
+        return export.export_matches(conn, args.output, args.format, args.chunk_size)
+    return export.export_leaderboard(conn, args.output, args.format, chunk_size=args.chunk_size)
+
+
+def _cmd_bench(conn, args):
+    """Time in-memory replays of every stored match; nothing is written."""
+    import chess_club.engine as engine
+
+    matches = repo.get_all_matches_ordered(conn)
+    rated = sum(1 for row in matches if row[3] is not None)
+    print(f"Replaying {rated} rated matches (best of {args.repeat}):")
+    for name, replay in (("sequential", engine.replay), ("waves", engine.replay_waves)):
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            replay(matches, {})
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        rate = f"{rated / best:,.0f} matches/s" if best else "n/a"
+        print(f"  {name:10} {best:.3f}s  {rate}")
+    return rated
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="chess-club", description="Chess club ratings manager.")
+    parser.add_argument("--db", help=f"database file (default: DB_PATH, currently {config.DB_PATH})")
+    parser.add_argument("--timing", action="store_true", help="print wall time and rows processed to stderr")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-operation time and SQL breakdown to stderr on exit")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    cmd = commands.add_parser("recompute", help="recompute ratings from all matches")
+    cmd.add_argument("--from-match", type=int, metavar="ID", help="only replay from this match onwards")
+    cmd.set_defaults(handler=_cmd_recompute)
+
+    cmd = commands.add_parser("leaderboard", help="print the leaderboard")
+    cmd.add_argument("--json", action="store_true", help="print one JSON list ordered by rank")
+    cmd.add_argument("--limit", type=int, help="rows to print (per section without --json)")
+    cmd.add_argument("--as-of", metavar="DATE", help="standings at the end of DATE (YYYY-MM-DD)")
+    cmd.set_defaults(handler=_cmd_leaderboard)
+
+    cmd = commands.add_parser("player-games", help="print a player's match history")
+    cmd.add_argument("player_id", type=int, metavar="ID")
+    cmd.add_argument("--json", action="store_true", help="print the games as JSON")
+    cmd.set_defaults(handler=_cmd_player_games)
+
+    cmd = commands.add_parser("import", help="import matches from a CSV or JSON Lines file")
+    cmd.add_argument("file")
+    cmd.add_argument("--format", choices=("csv", "jsonl"), help="file format (default: from the extension)")
+    cmd.add_argument("--create-missing", action="store_true", help="create unknown players and tournaments")
+    cmd.add_argument("--chunk-size", type=int, default=1000, help="rows committed per transaction")
+    cmd.add_argument("--json", action="store_true", help="print the import report as JSON")
+    cmd.set_defaults(handler=_cmd_import)
+
+    cmd = commands.add_parser("export", help="stream match history or the leaderboard to CSV/JSON Lines")
+    cmd.add_argument("what", choices=("matches", "leaderboard"))
+    cmd.add_argument("--output", "-o", default="-", help="file to write (default: stdout)")
+    cmd.add_argument("--format", choices=("csv", "jsonl"), help="file format (default: from the extension, else csv)")
+    cmd.add_argument("--chunk-size", type=int, help="rows fetched per round trip (default: EXPORT_CHUNK_ROWS)")
+    cmd.set_defaults(handler=_cmd_export)
+
+    cmd = commands.add_parser("bench", help="time an in-memory replay of all matches")
+    cmd.add_argument("--repeat", type=int, default=3, help="runs per replay strategy (best is reported)")
+    cmd.set_defaults(handler=_cmd_bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the subcommand in `argv` (default: the process arguments), or the
+    interactive menu when none is given. Returns the exit status.
+    """
+    args = _parser().parse_args(argv)
+    conn = db.get_connection(args.db or config.DB_PATH)
+    db.init_db(conn)
+    if args.profile:
+        import chess_club.metrics as metrics
+
+        metrics.enable(conn)
+    try:
+        return _run(conn, args)
+    finally:
+        if args.profile:
+            metrics.report(file=sys.stderr)
+            metrics.disable()
+
+
+def _run(conn, args) -> int:
+    if args.command is None:
+        menu(conn)
+        return 0
+    start = time.perf_counter()
+    try:
+        rows = args.handler(conn, args)
+    except (ValueError, OSError) as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    if args.timing:
+        processed = f", {rows} rows" if rows is not None else ""
+        print(f"⏱️ {args.command}: {time.perf_counter() - start:.3f}s{processed}", file=sys.stderr)
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -40,12 +40,16 @@ OPERATIONAL_CONFIG_PATH = CONFIG_DIR / "operational_config.json"
 _DEFAULTS_BUSINESS: Dict[str, Any] = {
 	"MIN_GAMES_FOR_OFFICIAL": 10,
 	"SHOW_PROVISIONAL_IN_LEADERBOARD": True,
+	# Leaderboard rows per page in each section (0 = everything on one page)
+	"LEADERBOARD_PAGE_SIZE": 20,
 	"RATING_SYSTEM": "both",
 	"G2_DEFAULT_RATING": 1200.0,
 	"G2_DEFAULT_RD": 350.0,
 	"G2_DEFAULT_VOL": 0.06,
 	# Per-day RD increase constant used to grow RD with inactivity (units: rating points/day)
 	"G2_RD_INCREASE_PER_DAY": 1.0,
+	# Glicko-2 rating period length in days (0 = rate every game on its own)
+	"G2_RATING_PERIOD_DAYS": 0,
 	"ELO_K_THRESHOLDS": [20, 50],
 	"ELO_K_VALUES": [40, 20, 10],
 	"ELO_DECIMALS": 2,
@@ -54,6 +58,30 @@ _DEFAULTS_BUSINESS: Dict[str, Any] = {
 
 _DEFAULTS_OPERATIONAL: Dict[str, Any] = {
 	"DB_PATH": "chessclub.db",
+	# Connection tuning applied by db.get_connection / db.ReadPool
+	"DB_JOURNAL_MODE": "WAL",
+	"DB_SYNCHRONOUS": "NORMAL",
+	"DB_CACHE_SIZE_KIB": 65536,
+	"DB_MMAP_SIZE": 268435456,
+	"DB_TEMP_STORE": "MEMORY",
+	"DB_BUSY_TIMEOUT_MS": 5000,
+	# Player rows kept per connection by the repo's read-through cache (0 disables)
+	"PLAYER_CACHE_SIZE": 4096,
+	# Most queued live results ingest.ResultQueue records in one transaction
+	"INGEST_MAX_BATCH": 256,
+	# metrics: statements slower than this are kept with their query plan
+	"METRICS_SLOW_QUERY_MS": 100,
+	# Rows fetched per round trip by streaming reads and exports (repo.iter_*)
+	"EXPORT_CHUNK_ROWS": 1000,
+	# Full recomputes snapshot all player ratings every N rated matches (0 disables)
+	"CHECKPOINT_INTERVAL": 5000,
+	# Worker processes for full recomputes (0 = one per CPU, 1 = in-process only)
+	"RECOMPUTE_WORKERS": 0,
+	# Smallest rated-match count worth splitting across worker processes
+	"RECOMPUTE_PARALLEL_MIN_MATCHES": 50000,
+	# Replay waves of independent matches as NumPy batches when they average
+	# at least this many matches (0 = always replay match by match)
+	"RECOMPUTE_WAVE_MIN_WIDTH": 48,
 }
 
 
@@ -79,16 +107,34 @@ _OPERATIONAL = _load_json(OPERATIONAL_CONFIG_PATH, _DEFAULTS_OPERATIONAL)
 # Business config
 MIN_GAMES_FOR_OFFICIAL: int = _BUSINESS["MIN_GAMES_FOR_OFFICIAL"]
 SHOW_PROVISIONAL_IN_LEADERBOARD: bool = _BUSINESS["SHOW_PROVISIONAL_IN_LEADERBOARD"]
+LEADERBOARD_PAGE_SIZE: int = _BUSINESS["LEADERBOARD_PAGE_SIZE"]
 RATING_SYSTEM: str = _BUSINESS["RATING_SYSTEM"]
 G2_DEFAULT_RATING: float = _BUSINESS["G2_DEFAULT_RATING"]
 G2_DEFAULT_RD: float = _BUSINESS["G2_DEFAULT_RD"]
 G2_DEFAULT_VOL: float = _BUSINESS["G2_DEFAULT_VOL"]
 G2_RD_INCREASE_PER_DAY: float = _BUSINESS["G2_RD_INCREASE_PER_DAY"]
+G2_RATING_PERIOD_DAYS: int = _BUSINESS["G2_RATING_PERIOD_DAYS"]
 DEFAULT_ELO: int = _BUSINESS["DEFAULT_ELO"]
+ELO_K_THRESHOLDS: list = _BUSINESS["ELO_K_THRESHOLDS"]
+ELO_K_VALUES: list = _BUSINESS["ELO_K_VALUES"]
+ELO_DECIMALS: int = _BUSINESS["ELO_DECIMALS"]
 
 # Operational config
 DB_PATH: str = _OPERATIONAL["DB_PATH"]
-
+DB_JOURNAL_MODE: str = _OPERATIONAL["DB_JOURNAL_MODE"]
+DB_SYNCHRONOUS: str = _OPERATIONAL["DB_SYNCHRONOUS"]
+DB_CACHE_SIZE_KIB: int = _OPERATIONAL["DB_CACHE_SIZE_KIB"]
+DB_MMAP_SIZE: int = _OPERATIONAL["DB_MMAP_SIZE"]
+DB_TEMP_STORE: str = _OPERATIONAL["DB_TEMP_STORE"]
+DB_BUSY_TIMEOUT_MS: int = _OPERATIONAL["DB_BUSY_TIMEOUT_MS"]
+PLAYER_CACHE_SIZE: int = _OPERATIONAL["PLAYER_CACHE_SIZE"]
+INGEST_MAX_BATCH: int = _OPERATIONAL["INGEST_MAX_BATCH"]
+METRICS_SLOW_QUERY_MS: float = _OPERATIONAL["METRICS_SLOW_QUERY_MS"]
+EXPORT_CHUNK_ROWS: int = _OPERATIONAL["EXPORT_CHUNK_ROWS"]
+CHECKPOINT_INTERVAL: int = _OPERATIONAL["CHECKPOINT_INTERVAL"]
+RECOMPUTE_WORKERS: int = _OPERATIONAL["RECOMPUTE_WORKERS"]
+RECOMPUTE_PARALLEL_MIN_MATCHES: int = _OPERATIONAL["RECOMPUTE_PARALLEL_MIN_MATCHES"]
+RECOMPUTE_WAVE_MIN_WIDTH: int = _OPERATIONAL["RECOMPUTE_WAVE_MIN_WIDTH"]
 
 
 def reload() -> None:
@@ -98,20 +144,44 @@ def reload() -> None:
 	variables to reflect the new values.
 	"""
 	global _BUSINESS, _OPERATIONAL
-	global MIN_GAMES_FOR_OFFICIAL, SHOW_PROVISIONAL_IN_LEADERBOARD, RATING_SYSTEM
+	global MIN_GAMES_FOR_OFFICIAL, SHOW_PROVISIONAL_IN_LEADERBOARD, RATING_SYSTEM, LEADERBOARD_PAGE_SIZE
 	global DB_PATH, G2_DEFAULT_RATING, G2_DEFAULT_RD, G2_DEFAULT_VOL, DEFAULT_ELO
+	global G2_RD_INCREASE_PER_DAY, G2_RATING_PERIOD_DAYS, CHECKPOINT_INTERVAL
+	global ELO_K_THRESHOLDS, ELO_K_VALUES, ELO_DECIMALS
+	global RECOMPUTE_WORKERS, RECOMPUTE_PARALLEL_MIN_MATCHES, RECOMPUTE_WAVE_MIN_WIDTH
+	global DB_JOURNAL_MODE, DB_SYNCHRONOUS, DB_CACHE_SIZE_KIB, DB_MMAP_SIZE, DB_TEMP_STORE, DB_BUSY_TIMEOUT_MS
+	global PLAYER_CACHE_SIZE, INGEST_MAX_BATCH, METRICS_SLOW_QUERY_MS, EXPORT_CHUNK_ROWS
 
 	_BUSINESS = _load_json(BUSINESS_CONFIG_PATH, _DEFAULTS_BUSINESS)
 	_OPERATIONAL = _load_json(OPERATIONAL_CONFIG_PATH, _DEFAULTS_OPERATIONAL)
 
 	MIN_GAMES_FOR_OFFICIAL = _BUSINESS["MIN_GAMES_FOR_OFFICIAL"]
 	SHOW_PROVISIONAL_IN_LEADERBOARD = _BUSINESS["SHOW_PROVISIONAL_IN_LEADERBOARD"]
+	LEADERBOARD_PAGE_SIZE = _BUSINESS["LEADERBOARD_PAGE_SIZE"]
 	RATING_SYSTEM = _BUSINESS["RATING_SYSTEM"]
 	G2_DEFAULT_RATING = _BUSINESS["G2_DEFAULT_RATING"]
 	G2_DEFAULT_RD = _BUSINESS["G2_DEFAULT_RD"]
 	G2_DEFAULT_VOL = _BUSINESS["G2_DEFAULT_VOL"]
 	G2_RD_INCREASE_PER_DAY = _BUSINESS["G2_RD_INCREASE_PER_DAY"]
+	G2_RATING_PERIOD_DAYS = _BUSINESS["G2_RATING_PERIOD_DAYS"]
 	DEFAULT_ELO = _BUSINESS["DEFAULT_ELO"]
+	ELO_K_THRESHOLDS = _BUSINESS["ELO_K_THRESHOLDS"]
+	ELO_K_VALUES = _BUSINESS["ELO_K_VALUES"]
+	ELO_DECIMALS = _BUSINESS["ELO_DECIMALS"]
 	DB_PATH = _OPERATIONAL["DB_PATH"]
+	DB_JOURNAL_MODE = _OPERATIONAL["DB_JOURNAL_MODE"]
+	DB_SYNCHRONOUS = _OPERATIONAL["DB_SYNCHRONOUS"]
+	DB_CACHE_SIZE_KIB = _OPERATIONAL["DB_CACHE_SIZE_KIB"]
+	DB_MMAP_SIZE = _OPERATIONAL["DB_MMAP_SIZE"]
+	DB_TEMP_STORE = _OPERATIONAL["DB_TEMP_STORE"]
+	DB_BUSY_TIMEOUT_MS = _OPERATIONAL["DB_BUSY_TIMEOUT_MS"]
+	PLAYER_CACHE_SIZE = _OPERATIONAL["PLAYER_CACHE_SIZE"]
+	INGEST_MAX_BATCH = _OPERATIONAL["INGEST_MAX_BATCH"]
+	METRICS_SLOW_QUERY_MS = _OPERATIONAL["METRICS_SLOW_QUERY_MS"]
+	EXPORT_CHUNK_ROWS = _OPERATIONAL["EXPORT_CHUNK_ROWS"]
+	CHECKPOINT_INTERVAL = _OPERATIONAL["CHECKPOINT_INTERVAL"]
+	RECOMPUTE_WORKERS = _OPERATIONAL["RECOMPUTE_WORKERS"]
+	RECOMPUTE_PARALLEL_MIN_MATCHES = _OPERATIONAL["RECOMPUTE_PARALLEL_MIN_MATCHES"]
+	RECOMPUTE_WAVE_MIN_WIDTH = _OPERATIONAL["RECOMPUTE_WAVE_MIN_WIDTH"]
 
 
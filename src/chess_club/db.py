@@ -1,4 +1,9 @@
+import itertools
 import sqlite3
+import threading
+
+import chess_club.config as config
+import chess_club.cache as cache
 
 CREATE_PLAYERS = """
 CREATE TABLE IF NOT EXISTS Players (
@@ -17,23 +22,27 @@ CREATE TABLE IF NOT EXISTS Tournaments (
 )
 """
 
-CREATE_TOURNAMENT_PLAYERS = """
-CREATE TABLE IF NOT EXISTS TournamentPlayers (
+# Table bodies are kept separate from the CREATE statements so migrations can
+# rebuild a table under a temporary name with the current definition.
+TOURNAMENT_PLAYERS_COLUMNS = """
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     tournament_id INTEGER NOT NULL,
     player_id INTEGER NOT NULL,
-    FOREIGN KEY(tournament_id) REFERENCES Tournaments(id),
-    FOREIGN KEY(player_id) REFERENCES Players(id)
-)
+    byes INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY(tournament_id) REFERENCES Tournaments(id) ON DELETE CASCADE,
+    FOREIGN KEY(player_id) REFERENCES Players(id) ON DELETE CASCADE
+"""
+
+CREATE_TOURNAMENT_PLAYERS = f"""
+CREATE TABLE IF NOT EXISTS TournamentPlayers ({TOURNAMENT_PLAYERS_COLUMNS})
 """
 
-CREATE_MATCHES = """
-CREATE TABLE IF NOT EXISTS Matches (
+MATCHES_COLUMNS = """
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     tournament_id INTEGER NOT NULL,
     player1_id INTEGER NOT NULL,
     player2_id INTEGER NOT NULL,
-    result REAL NOT NULL,
+    result REAL,
     date TEXT NOT NULL,
     player1_elo_before REAL,
     player1_elo_after REAL,
@@ -51,33 +60,285 @@ CREATE TABLE IF NOT EXISTS Matches (
     player2_g2_rd_after REAL,
     player2_g2_vol_before REAL,
     player2_g2_vol_after REAL,
-    FOREIGN KEY(tournament_id) REFERENCES Tournaments(id),
-    FOREIGN KEY(player1_id) REFERENCES Players(id),
-    FOREIGN KEY(player2_id) REFERENCES Players(id)
+    player1_last_played_before TEXT,
+    player2_last_played_before TEXT,
+    FOREIGN KEY(tournament_id) REFERENCES Tournaments(id) ON DELETE CASCADE,
+    FOREIGN KEY(player1_id) REFERENCES Players(id) ON DELETE CASCADE,
+    FOREIGN KEY(player2_id) REFERENCES Players(id) ON DELETE CASCADE
+"""
+
+CREATE_MATCHES = f"""
+CREATE TABLE IF NOT EXISTS Matches ({MATCHES_COLUMNS})
+"""
+
+# Secondary indexes, each sized for specific repo queries:
+# - player1/player2: per-player history and opponent lookups (one index per
+#   side, queried as a UNION), ordered by date then id (implicit rowid).
+# - date_id: covering index for the full `ORDER BY date, id` replay.
+# - tournament_pairs: per-tournament listings, counts and deletes (ORDER BY
+#   id); covers the pairing history (players and result) read by Swiss pairing.
+# - tournament_players_*: registrations by tournament (covering) and by player.
+INDEXES = {
+    "idx_matches_player1": "Matches(player1_id, date)",
+    "idx_matches_player2": "Matches(player2_id, date)",
+    "idx_matches_date_id": "Matches(date, id, player1_id, player2_id, result)",
+    "idx_matches_tournament_pairs": "Matches(tournament_id, id, player1_id, player2_id, result)",
+    "idx_tournament_players_tournament": "TournamentPlayers(tournament_id, player_id)",
+    "idx_tournament_players_player": "TournamentPlayers(player_id)",
+    "idx_rating_checkpoints_position": "RatingCheckpoints(match_date, match_id)",
+}
+
+
+CREATE_PLAYER_STATS = """
+CREATE TABLE IF NOT EXISTS PlayerStats (
+    player_id INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    last_game TEXT,
+    FOREIGN KEY(player_id) REFERENCES Players(id) ON DELETE CASCADE
 )
 """
 
+CREATE_RATING_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS RatingCheckpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_date TEXT NOT NULL,
+    match_id INTEGER NOT NULL
+)
+"""
 
-def get_connection(path="chessclub.db"):
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA foreign_keys = ON")
+# Full player state after every rated match up to and including the
+# checkpoint's (match_date, match_id) position. Players without a row had
+# not played yet and start from configured defaults.
+CREATE_RATING_CHECKPOINT_PLAYERS = """
+CREATE TABLE IF NOT EXISTS RatingCheckpointPlayers (
+    checkpoint_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    elo REAL,
+    g2_rating REAL,
+    g2_rd REAL,
+    g2_vol REAL,
+    games INTEGER NOT NULL,
+    last_played TEXT,
+    last_match_id INTEGER,
+    PRIMARY KEY (checkpoint_id, player_id),
+    FOREIGN KEY(checkpoint_id) REFERENCES RatingCheckpoints(id) ON DELETE CASCADE,
+    FOREIGN KEY(player_id) REFERENCES Players(id) ON DELETE CASCADE
+)
+"""
+
+# Each player's rating state after every rated match, keyed by
+# (player_id, date, match_id) so "rating as of a date" is one primary-key
+# seek. Rows are written with the match's audit columns
+# (`repo.bulk_update_match_audits`) and follow deleted matches and players.
+# `score` is the player's result in that match; `games`/`wins`/`draws`
+# count their rated matches up to and including it.
+CREATE_RATING_HISTORY = """
+CREATE TABLE IF NOT EXISTS RatingHistory (
+    player_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    elo REAL,
+    g2_rating REAL,
+    g2_rd REAL,
+    g2_vol REAL,
+    score REAL,
+    games INTEGER,
+    wins INTEGER,
+    draws INTEGER,
+    PRIMARY KEY (player_id, date, match_id),
+    FOREIGN KEY(player_id) REFERENCES Players(id) ON DELETE CASCADE,
+    FOREIGN KEY(match_id) REFERENCES Matches(id) ON DELETE CASCADE
+) WITHOUT ROWID
+"""
+# Created with the table rather than in `INDEXES`, whose migration runs
+# before RatingHistory exists; serves cascades and per-match rewrites.
+CREATE_RATING_HISTORY_MATCH_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_rating_history_match ON RatingHistory(match_id)
+"""
+
+
+# Rows copied per statement when a migration rebuilds a table
+REBUILD_CHUNK_ROWS = 50000
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def _choice(name: str, value, allowed) -> str:
+    text = str(value).upper()
+    if text not in allowed:
+        raise ValueError(f"Unsupported {name} {value!r}; expected one of {sorted(allowed)}")
+    return text
+
+
+def _apply_pragmas(conn, read_only: bool = False):
+    """Apply the tuning pragmas from the operational config.
+
+    `cache_size` is given in KiB (negative pragma value) and `mmap_size` in
+    bytes. The journal mode is persistent in the database file, so read-only
+    connections skip it and are marked `query_only` instead.
+    """
+    cur = conn.cursor()
+    cur.execute("PRAGMA foreign_keys = ON")
+    cur.execute(f"PRAGMA busy_timeout = {int(config.DB_BUSY_TIMEOUT_MS)}")
+    if read_only:
+        cur.execute("PRAGMA query_only = ON")
+    else:
+        cur.execute(f"PRAGMA journal_mode = {_choice('DB_JOURNAL_MODE', config.DB_JOURNAL_MODE, _JOURNAL_MODES)}")
+    cur.execute(f"PRAGMA synchronous = {_choice('DB_SYNCHRONOUS', config.DB_SYNCHRONOUS, _SYNCHRONOUS)}")
+    cur.execute(f"PRAGMA cache_size = {-int(config.DB_CACHE_SIZE_KIB)}")
+    cur.execute(f"PRAGMA mmap_size = {int(config.DB_MMAP_SIZE)}")
+    cur.execute(f"PRAGMA temp_store = {_choice('DB_TEMP_STORE', config.DB_TEMP_STORE, _TEMP_STORES)}")
+
+
+class Connection(sqlite3.Connection):
+    """sqlite3 connection carrying the repo's per-connection player cache.
+
+    `player_cache` holds up to `config.PLAYER_CACHE_SIZE` player rows; see
+    `chess_club.cache`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.player_cache = cache.PlayerCache(config.PLAYER_CACHE_SIZE)
+
+
+def get_connection(path="chessclub.db", check_same_thread: bool = True):
+    """Open the read/write connection with the configured pragmas.
+
+    By default WAL journaling, `synchronous=NORMAL`, a sized page cache,
+    memory-mapped I/O, in-memory temp storage and a busy timeout are set
+    (see `DB_*` in `configs/operational_config.json`), so readers from
+    `ReadPool` can run while this connection writes.
+    """
+    conn = sqlite3.connect(path, timeout=config.DB_BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=check_same_thread, factory=Connection)
+    _apply_pragmas(conn)
     return conn
 
 
+class ReadPool:
+    """Hands out one read-only connection per thread for a database file.
+
+    Connections are opened lazily on first use in each thread and reused
+    afterwards; `close` closes all of them. Combined with WAL on the writer
+    connection, leaderboard and history reads do not block (and are not
+    blocked by) a writer recording results.
+    """
+
+    def __init__(self, path: str):
+        if path == ":memory:" or not str(path):
+            raise ValueError("A read pool needs a database file; in-memory databases are per connection")
+        self.path = str(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def connection(self):
+        """Return the calling thread's read-only connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # only this thread uses it; the flag lets `close` run anywhere
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                   timeout=config.DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                                   factory=Connection)
+            _apply_pragmas(conn, read_only=True)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection handed out by this pool.
+
+        Call once the reader threads are done with their connections.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class UnitOfWork:
+    """Run one business operation as a single transaction.
+
+    Repo functions never commit, so everything written inside the block is
+    made durable by one COMMIT on exit, or rolled back if the block raises
+    (which also empties the connection's player cache).
+    When the connection is already inside a transaction (an outer unit of
+    work), the block becomes a savepoint instead: an error rolls back only
+    the block's writes and the outer transaction decides what is committed.
+
+        with db.UnitOfWork(conn):
+            pid = repo.add_player(conn, "Alice")
+            repo.add_tournament_player(conn, tid, pid)
+    """
+    _counter = itertools.count()
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._savepoint = None
+
+    def __enter__(self):
+        if self.conn.in_transaction:
+            self._savepoint = f"uow_{next(self._counter)}"
+            self.conn.execute(f"SAVEPOINT {self._savepoint}")
+        else:
+            self.conn.execute("BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # cached rows may hold values that are being rolled back
+            player_cache = getattr(self.conn, "player_cache", None)
+            if player_cache is not None:
+                player_cache.clear()
+        if self._savepoint is not None:
+            if exc_type is not None:
+                self.conn.execute(f"ROLLBACK TO {self._savepoint}")
+            self.conn.execute(f"RELEASE {self._savepoint}")
+        elif exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        return False
+
+
+def schema_version(conn) -> int:
+    """Return how many `MIGRATIONS` have been applied (`PRAGMA user_version`)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
 def init_db(conn):
+    """Create the tables and apply pending migrations.
+
+    An up-to-date database costs a single `PRAGMA user_version` read. Older
+    files (including ones created before versioning, which read as 0) run
+    the remaining `MIGRATIONS` in order; each applied step is recorded
+    immediately, and a step that reports failure is retried on the next
+    start.
+    """
+    version = schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return
     cur = conn.cursor()
     cur.execute(CREATE_PLAYERS)
     cur.execute(CREATE_TOURNAMENTS)
     cur.execute(CREATE_TOURNAMENT_PLAYERS)
     cur.execute(CREATE_MATCHES)
     conn.commit()
-    # Run migrations to bring older DBs up-to-date
-    migrate_add_match_elo_columns(conn)
-    migrate_add_player_g2_columns(conn)
-    migrate_add_tournament_completed(conn)
-    migrate_add_player_last_game_columns(conn)
-    migrate_add_match_last_played_columns(conn)
-    migrate_allow_nullable_match_result(conn)
+    applied = version
+    for step, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+        ok = migrate(conn) is not False
+        if ok and applied == step - 1:
+            applied = step
+            cur.execute(f"PRAGMA user_version = {applied}")
+    conn.commit()
 
 
 def _column_exists(conn, table: str, column: str) -> bool:
@@ -188,61 +449,254 @@ def migrate_allow_nullable_match_result(conn):
     table with a nullable `result` column. This is safe to run repeatedly.
     """
     cur = conn.cursor()
+    cur.execute("PRAGMA table_info(Matches)")
+    cols = cur.fetchall()
+    # find result column info: (cid, name, type, notnull, dflt_value, pk)
+    result_col = next((c for c in cols if c[1] == 'result'), None)
+    if result_col and result_col[3] == 1:
+        try:
+            _rebuild_table(conn, "Matches", MATCHES_COLUMNS)
+        except sqlite3.Error as e:
+            # Don't block initialization; the old schema keeps working.
+            print(f"⚠️ Could not rebuild Matches with a nullable result: {e}")
+            return False
+
+
+def _has_cascading_fks(conn, table: str) -> bool:
+    cur = conn.cursor()
+    cur.execute(f"PRAGMA foreign_key_list({table})")
+    # rows: (id, seq, table, from, to, on_update, on_delete, match)
+    fks = cur.fetchall()
+    return all(fk[6] == "CASCADE" for fk in fks)
+
+
+def migrate_cascade_foreign_keys(conn):
+    """Recreate TournamentPlayers and Matches with `ON DELETE CASCADE` keys.
+
+    SQLite cannot alter a foreign key in place, so older tables are rebuilt
+    with the current definition. Deleting a player or tournament then removes
+    their registrations and matches. Safe to run repeatedly.
+    """
+    ok = True
+    for table, columns_sql in (("TournamentPlayers", TOURNAMENT_PLAYERS_COLUMNS), ("Matches", MATCHES_COLUMNS)):
+        if _has_cascading_fks(conn, table):
+            continue
+        try:
+            _rebuild_table(conn, table, columns_sql)
+        except sqlite3.Error as e:
+            # Don't block initialization; deletes will report FK errors instead.
+            print(f"⚠️ Could not add cascading foreign keys to {table}: {e}")
+            ok = False
+    return ok
+
+
+def migrate_add_indexes(conn):
+    """Create the secondary indexes in `INDEXES` if missing.
+
+    Runs after any table rebuild, since dropping a table drops its indexes.
+    """
+    cur = conn.cursor()
+    for name, target in INDEXES.items():
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    conn.commit()
+
+
+def _rebuild_table(conn, table: str, columns_sql: str):
+    """Recreate `table` from `columns_sql`, copying every existing column.
+
+    Follows SQLite's documented rebuild procedure: foreign keys are switched
+    off, the copy runs in one transaction and the result is checked with
+    `PRAGMA foreign_key_check` before committing. Rows are copied in rowid
+    chunks of `REBUILD_CHUNK_ROWS`, printing progress for tables larger
+    than one chunk, and the table's `INDEXES` are recreated afterwards.
+    """
+    cur = conn.cursor()
+    conn.commit()
+    cur.execute("PRAGMA foreign_keys=OFF")
     try:
-        cur.execute("PRAGMA table_info(Matches)")
-        cols = cur.fetchall()
-        # find result column info: (cid, name, type, notnull, dflt_value, pk)
-        result_col = next((c for c in cols if c[1] == 'result'), None)
-        if result_col and result_col[3] == 1:
-            # recreate table with nullable result
-            cur.execute("PRAGMA foreign_keys=OFF")
-            conn.commit()
-            cur.execute("BEGIN TRANSACTION")
-            # create temporary table with same columns but result nullable
-            cur.execute(
-                '''
-                CREATE TABLE IF NOT EXISTS Matches_new (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tournament_id INTEGER NOT NULL,
-                    player1_id INTEGER NOT NULL,
-                    player2_id INTEGER NOT NULL,
-                    result REAL,
-                    date TEXT NOT NULL,
-                    player1_elo_before REAL,
-                    player1_elo_after REAL,
-                    player2_elo_before REAL,
-                    player2_elo_after REAL,
-                    player1_g2_rating_before REAL,
-                    player1_g2_rating_after REAL,
-                    player1_g2_rd_before REAL,
-                    player1_g2_rd_after REAL,
-                    player1_g2_vol_before REAL,
-                    player1_g2_vol_after REAL,
-                    player2_g2_rating_before REAL,
-                    player2_g2_rating_after REAL,
-                    player2_g2_rd_before REAL,
-                    player2_g2_rd_after REAL,
-                    player2_g2_vol_before REAL,
-                    player2_g2_vol_after REAL,
-                    player1_last_played_before TEXT,
-                    player2_last_played_before TEXT,
-                    FOREIGN KEY(tournament_id) REFERENCES Tournaments(id),
-                    FOREIGN KEY(player1_id) REFERENCES Players(id),
-                    FOREIGN KEY(player2_id) REFERENCES Players(id)
-                )
-                '''
-            )
-            # copy data across (result may already be present)
-            cur.execute(
-                "INSERT INTO Matches_new (id, tournament_id, player1_id, player2_id, result, date, player1_elo_before, player1_elo_after, player2_elo_before, player2_elo_after, player1_g2_rating_before, player1_g2_rating_after, player1_g2_rd_before, player1_g2_rd_after, player1_g2_vol_before, player1_g2_vol_after, player2_g2_rating_before, player2_g2_rating_after, player2_g2_rd_before, player2_g2_rd_after, player2_g2_vol_before, player2_g2_vol_after, player1_last_played_before, player2_last_played_before) SELECT id, tournament_id, player1_id, player2_id, result, date, player1_elo_before, player1_elo_after, player2_elo_before, player2_elo_after, player1_g2_rating_before, player1_g2_rating_after, player1_g2_rd_before, player1_g2_rd_after, player1_g2_vol_before, player1_g2_vol_after, player2_g2_rating_before, player2_g2_rating_after, player2_g2_rd_before, player2_g2_rd_after, player2_g2_vol_before, player2_g2_vol_after, player1_last_played_before, player2_last_played_before FROM Matches"
-            )
-            cur.execute("DROP TABLE Matches")
-            cur.execute("ALTER TABLE Matches_new RENAME TO Matches")
-            cur.execute("PRAGMA foreign_keys=ON")
-            conn.commit()
+        cur.execute("BEGIN")
+        cur.execute(f"PRAGMA table_info({table})")
+        old_cols = [c[1] for c in cur.fetchall()]
+        cur.execute(f"DROP TABLE IF EXISTS {table}_new")
+        cur.execute(f"CREATE TABLE {table}_new ({columns_sql})")
+        cur.execute(f"PRAGMA table_info({table}_new)")
+        new_cols = {c[1] for c in cur.fetchall()}
+        cols = ", ".join(c for c in old_cols if c in new_cols)
+        _copy_rows(cur, table, f"{table}_new", cols)
+        cur.execute(f"DROP TABLE {table}")
+        cur.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        for name, target in INDEXES.items():
+            if target.startswith(f"{table}("):
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        cur.execute("PRAGMA foreign_key_check")
+        if cur.fetchall():
+            raise sqlite3.IntegrityError(f"foreign key violations after rebuilding {table}")
+        conn.commit()
     except Exception:
-        # If anything fails, don't block initialization
-        try:
-            conn.rollback()
-        except Exception:
-            pass
+        conn.rollback()
+        raise
+    finally:
+        cur.execute("PRAGMA foreign_keys=ON")
+
+
+def _copy_rows(cur, source: str, target: str, cols: str):
+    """Copy `cols` from `source` to `target` in rowid order, one chunk at a time."""
+    total, first = cur.execute(f"SELECT COUNT(*), MIN(rowid) FROM {source}").fetchone()
+    report = total > REBUILD_CHUNK_ROWS
+    copied = 0
+    last = (first or 0) - 1
+    while copied < total:
+        # rowid range of the next chunk; both statements are rowid range scans
+        cur.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {source} WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+            (last, REBUILD_CHUNK_ROWS),
+        )
+        upper = cur.fetchone()[0]
+        if upper is None:
+            break
+        cur.execute(
+            f"INSERT INTO {target} ({cols}) SELECT {cols} FROM {source} WHERE rowid > ? AND rowid <= ? ORDER BY rowid",
+            (last, upper),
+        )
+        copied += cur.rowcount
+        last = upper
+        if report:
+            print(f"⏳ Rebuilding {source}: {copied:,}/{total:,} rows copied")
+
+
+def _table_exists(conn, table: str) -> bool:
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cur.fetchone() is not None
+
+
+def migrate_add_player_stats(conn):
+    """Create the materialized PlayerStats table and backfill it from Matches.
+
+    Only rated matches (non-NULL result) are counted. This is safe to run
+    repeatedly; the backfill only happens when the table is first created.
+    """
+    if _table_exists(conn, "PlayerStats"):
+        return
+    cur = conn.cursor()
+    cur.execute(CREATE_PLAYER_STATS)
+    cur.execute(
+        """
+        INSERT INTO PlayerStats (player_id, games, wins, draws, losses, last_game)
+        SELECT pid, COUNT(*),
+               SUM(CASE WHEN score = 1.0 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN score = 0.5 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN score IN (0.5, 1.0) THEN 0 ELSE 1 END),
+               MAX(date)
+        FROM (
+            SELECT player1_id AS pid, result AS score, date FROM Matches WHERE result IS NOT NULL
+            UNION ALL
+            SELECT player2_id AS pid, 1.0 - result AS score, date FROM Matches WHERE result IS NOT NULL
+        )
+        GROUP BY pid
+        """
+    )
+    conn.commit()
+
+
+def migrate_add_rating_checkpoints(conn):
+    """Create the RatingCheckpoints tables used to seed targeted recomputes.
+
+    Starts empty; the next full recompute (or completed tournament) writes
+    the first checkpoint.
+    """
+    cur = conn.cursor()
+    cur.execute(CREATE_RATING_CHECKPOINTS)
+    cur.execute(CREATE_RATING_CHECKPOINT_PLAYERS)
+    conn.commit()
+
+
+def migrate_add_rating_history(conn):
+    """Create RatingHistory and backfill it from the match audit columns.
+
+    Matches without stored after-values (never rated) are skipped; the next
+    full recompute fills them in.
+    """
+    cur = conn.cursor()
+    cur.execute(CREATE_RATING_HISTORY)
+    cur.execute(CREATE_RATING_HISTORY_MATCH_INDEX)
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO RatingHistory (player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol)
+        SELECT player1_id, date, id, player1_elo_after, player1_g2_rating_after, player1_g2_rd_after, player1_g2_vol_after
+        FROM Matches WHERE result IS NOT NULL AND player1_elo_after IS NOT NULL
+        UNION ALL
+        SELECT player2_id, date, id, player2_elo_after, player2_g2_rating_after, player2_g2_rd_after, player2_g2_vol_after
+        FROM Matches WHERE result IS NOT NULL AND player2_elo_after IS NOT NULL
+        """
+    )
+    conn.commit()
+
+
+def migrate_add_rating_history_counts(conn):
+    """Add per-row score and running game/win/draw counts to RatingHistory
+    and backfill them, so past standings need no scan of Matches.
+    """
+    cur = conn.cursor()
+    for column, decl in (("score", "REAL"), ("games", "INTEGER"), ("wins", "INTEGER"), ("draws", "INTEGER")):
+        if not _column_exists(conn, "RatingHistory", column):
+            cur.execute(f"ALTER TABLE RatingHistory ADD COLUMN {column} {decl}")
+    cur.execute(
+        """
+        UPDATE RatingHistory SET score = (
+            SELECT CASE WHEN m.player1_id = RatingHistory.player_id THEN m.result ELSE 1.0 - m.result END
+            FROM Matches m WHERE m.id = RatingHistory.match_id
+        )
+        """
+    )
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO RatingHistory
+            (player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol, score, games, wins, draws)
+        SELECT player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol, score,
+               COUNT(*) OVER w,
+               SUM(CASE WHEN score = 1.0 THEN 1 ELSE 0 END) OVER w,
+               SUM(CASE WHEN score = 0.5 THEN 1 ELSE 0 END) OVER w
+        FROM RatingHistory
+        WINDOW w AS (PARTITION BY player_id ORDER BY date, match_id)
+        """
+    )
+    conn.commit()
+
+
+def migrate_cover_tournament_pairings(conn):
+    """Replace the single-column tournament index on Matches with one that
+    also covers the players and result, so pairing history never reads
+    match rows.
+    """
+    conn.cursor().execute("DROP INDEX IF EXISTS idx_matches_tournament")
+    migrate_add_indexes(conn)
+
+
+def migrate_add_tournament_byes(conn):
+    """Add a per-registration bye count so Swiss standings can score byes."""
+    if not _column_exists(conn, "TournamentPlayers", "byes"):
+        conn.cursor().execute("ALTER TABLE TournamentPlayers ADD COLUMN byes INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+
+
+# Schema steps in the order they were introduced. `PRAGMA user_version`
+# records how many have been applied, so only ever append to this list;
+# every step is also safe to re-run on a database that already has it.
+MIGRATIONS = (
+    migrate_add_match_elo_columns,
+    migrate_add_player_g2_columns,
+    migrate_add_tournament_completed,
+    migrate_add_player_last_game_columns,
+    migrate_add_match_last_played_columns,
+    migrate_allow_nullable_match_result,
+    migrate_add_player_stats,
+    migrate_cascade_foreign_keys,
+    migrate_add_rating_checkpoints,
+    migrate_add_indexes,
+    migrate_add_rating_history,
+    migrate_add_rating_history_counts,
+    migrate_cover_tournament_pairings,
+    migrate_add_tournament_byes,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
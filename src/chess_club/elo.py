@@ -1,6 +1,12 @@
+from itertools import repeat
 from math import pow
 from . import config
 
+try:
+    import numpy as np
+except ImportError:  # optional: batch updates fall back to pure Python
+    np = None
+
 
 def expected_score(rating_a, rating_b, base: float = 10.0, divisor: float = 400.0) -> float:
     """Return the expected score for player A vs player B.
@@ -38,3 +44,61 @@ def update_elo(rating_a: float, rating_b: float, score_a: float, k_a: int, k_b:
     decimals = getattr(config, "ELO_DECIMALS", 2)
     return round(new_a, decimals), round(new_b, decimals)
 
+
+def k_factor_batch(games_played):
+    """Apply `k_factor` to a NumPy array of game counts."""
+    thresholds = getattr(config, "ELO_K_THRESHOLDS", [20, 50])
+    values = getattr(config, "ELO_K_VALUES", [40, 20, 10])
+    k = np.full(len(games_played), values[-1], dtype=float)
+    # walk the thresholds backwards so the first matching one wins
+    for idx in range(len(thresholds) - 1, -1, -1):
+        k = np.where(games_played < thresholds[idx], values[idx], k)
+    return k
+
+
+def update_elo_batch(ratings_a, ratings_b, scores_a, k_a, k_b):
+    """Apply `update_elo` to many games at once.
+
+    Arguments are equal-length sequences. Returns `(new_a, new_b)`,
+    bit-identical to calling `update_elo` per game: NumPy arrays when NumPy
+    is installed, lists otherwise. The power and the decimal rounding go
+    through Python's own float operations, since NumPy's differ in the
+    last bit; the rest is vectorized.
+    """
+    if np is None:
+        new_a, new_b = [], []
+        for row in zip(ratings_a, ratings_b, scores_a, k_a, k_b):
+            a, b = update_elo(*row)
+            new_a.append(a)
+            new_b.append(b)
+        return new_a, new_b
+
+    ratings_a = np.asarray(ratings_a, dtype=float)
+    ratings_b = np.asarray(ratings_b, dtype=float)
+    scores_a = np.asarray(scores_a, dtype=float)
+    n = len(ratings_a)
+    ratio = ((ratings_b - ratings_a) / 400.0).tolist()
+    exp_a = 1 / (1 + np.fromiter(map(pow, repeat(10.0), ratio), dtype=float, count=n))
+    new_a = ratings_a + k_a * (scores_a - exp_a)
+    new_b = ratings_b + k_b * ((1 - scores_a) - (1 - exp_a))
+
+    decimals = getattr(config, "ELO_DECIMALS", 2)
+    return _round_batch(new_a, decimals), _round_batch(new_b, decimals)
+
+
+def _round_batch(x, decimals):
+    """`round(value, decimals)` for every element of `x`, bit for bit.
+
+    Scaling by 10**decimals and rounding to an integer gives Python's result
+    unless the scaled value is too close to a half step for the product's
+    rounding error to decide; those few values are redone with `round`.
+    """
+    if not isinstance(decimals, int) or not 0 <= decimals <= 15:
+        return np.fromiter(map(round, x.tolist(), repeat(decimals)), dtype=float, count=len(x))
+    scale = 10.0 ** decimals
+    y = x * scale
+    out = np.rint(y) / scale
+    near = np.abs(y - np.floor(y) - 0.5) < 1e-6 + np.abs(y) * 1e-12
+    if near.any():
+        out[near] = [round(value, decimals) for value in x[near].tolist()]
+    return out
@@ -0,0 +1,527 @@
+"""Pure rating engine: no database access.
+
+A `PlayerState` carries everything needed to rate a player's next game and
+`rate_match` maps two states, a result and a day to the two new states plus
+a `MatchAudit` with the before/after values. Days are date ordinals
+(`date.toordinal()`), so inactivity is a subtraction instead of parsing
+ISO strings on every game; `date_ordinal` / `ordinal_date` convert at the
+I/O boundary. `replay` runs a whole match sequence with no SQL in the loop;
+`replay_waves` gets the same results by rating independent matches together
+as NumPy arrays. `replay_periods` is the Glicko-2 rating-period variant:
+each player's games in a period are rated in one update.
+"""
+from collections import namedtuple
+from datetime import date
+import functools
+
+import chess_club.config as config
+import chess_club.elo as elo
+import chess_club.glicko2 as glicko2
+
+try:
+    import numpy as np
+except ImportError:  # optional: `replay_waves` falls back to `replay`
+    np = None
+
+
+class PlayerState:
+    """Rating state of one player between games.
+
+    `last_played` is a date ordinal (None before the first game) and
+    `last_match_id` the id of that game when known. States are treated as
+    immutable values: `rate_match` returns new ones.
+    """
+    __slots__ = ("elo", "g2_rating", "g2_rd", "g2_vol", "games", "last_played", "last_match_id")
+
+    def __init__(self, elo: float, g2_rating: float, g2_rd: float, g2_vol: float,
+                 games: int = 0, last_played: int = None, last_match_id: int = None):
+        self.elo = elo
+        self.g2_rating = g2_rating
+        self.g2_rd = g2_rd
+        self.g2_vol = g2_vol
+        self.games = games
+        self.last_played = last_played
+        self.last_match_id = last_match_id
+
+    @classmethod
+    def default(cls):
+        """A new player's state from the configured rating defaults."""
+        return cls(config.DEFAULT_ELO, config.G2_DEFAULT_RATING, config.G2_DEFAULT_RD, config.G2_DEFAULT_VOL)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a state from a stored `(elo, g2_rating, g2_rd, g2_vol, games,
+        last_played, last_match_id)` row; `last_played` is an ISO date.
+
+        Missing ratings fall back to the configured defaults.
+        """
+        elo_rating, g2_rating, g2_rd, g2_vol, games, last_played, last_match_id = row
+        if elo_rating is None:
+            elo_rating = config.DEFAULT_ELO
+        if g2_rating is None or g2_rd is None or g2_vol is None:
+            g2_rating, g2_rd, g2_vol = config.G2_DEFAULT_RATING, config.G2_DEFAULT_RD, config.G2_DEFAULT_VOL
+        return cls(elo_rating, g2_rating, g2_rd, g2_vol, games or 0, date_ordinal(last_played), last_match_id)
+
+    def to_row(self):
+        """Inverse of `from_row`."""
+        return (self.elo, self.g2_rating, self.g2_rd, self.g2_vol, self.games,
+                ordinal_date(self.last_played), self.last_match_id)
+
+    def __eq__(self, other):
+        if not isinstance(other, PlayerState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"PlayerState({fields})"
+
+
+# Before/after values of one rated match, in Matches audit column order.
+# `*_last_played_before` are date ordinals; see `audit_row`.
+MatchAudit = namedtuple("MatchAudit", [
+    "p1_elo_before", "p1_elo_after", "p2_elo_before", "p2_elo_after",
+    "p1_g2_before", "p1_g2_after", "p1_g2_rd_before", "p1_g2_rd_after",
+    "p1_g2_vol_before", "p1_g2_vol_after",
+    "p2_g2_before", "p2_g2_after", "p2_g2_rd_before", "p2_g2_rd_after",
+    "p2_g2_vol_before", "p2_g2_vol_after",
+    "p1_last_played_before", "p2_last_played_before",
+])
+
+
+def date_ordinal(value):
+    """Return the ordinal of an ISO date string, or None if missing/invalid."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def ordinal_date(ordinal):
+    """Return the ISO date string for an ordinal (None passes through)."""
+    if ordinal is None:
+        return None
+    return date.fromordinal(ordinal).isoformat()
+
+
+def rate_match(s1: PlayerState, s2: PlayerState, result: float, day: int = None, match_id: int = None):
+    """Rate one game from player 1's score `result` on date ordinal `day`.
+
+    Elo uses each player's game count for the K-factor; Glicko-2 inflates
+    both RDs for the days since each player's last game. Returns
+    `(new_s1, new_s2, audit)`; the input states are not modified.
+    """
+    k1 = elo.k_factor(s1.games)
+    k2 = elo.k_factor(s2.games)
+    new_elo1, new_elo2 = elo.update_elo(s1.elo, s2.elo, result, k1, k2)
+
+    last1 = s1.last_played
+    last2 = s2.last_played
+    days1 = day - last1 if day is not None and last1 is not None and day > last1 else 0
+    days2 = day - last2 if day is not None and last2 is not None and day > last2 else 0
+    rd1_star = glicko2.inflate_rd(s1.g2_rd, days1)
+    rd2_star = glicko2.inflate_rd(s2.g2_rd, days2)
+    r1, rd1, vol1 = glicko2.glicko2_update(s1.g2_rating, s1.g2_rd, s1.g2_vol,
+                                           s2.g2_rating, rd2_star, s2.g2_vol, result, days=days1)
+    r2, rd2, vol2 = glicko2.glicko2_update(s2.g2_rating, s2.g2_rd, s2.g2_vol,
+                                           s1.g2_rating, rd1_star, s1.g2_vol, 1 - result, days=days2)
+
+    new1 = PlayerState(new_elo1, r1, rd1, vol1, s1.games + 1, day if day is not None else last1, match_id)
+    new2 = PlayerState(new_elo2, r2, rd2, vol2, s2.games + 1, day if day is not None else last2, match_id)
+    audit = MatchAudit(
+        s1.elo, new_elo1, s2.elo, new_elo2,
+        s1.g2_rating, r1, s1.g2_rd, rd1, s1.g2_vol, vol1,
+        s2.g2_rating, r2, s2.g2_rd, rd2, s2.g2_vol, vol2,
+        last1, last2,
+    )
+    return new1, new2, audit
+
+
+def rating_period(day: int, length: int) -> int:
+    """Index of the `length`-day rating period holding date ordinal `day`.
+
+    Periods are counted from 0001-01-01 (a Monday), so 7-day periods run
+    Monday to Sunday.
+    """
+    return (day - 1) // length
+
+
+def period_start(date_str: str, length: int) -> str:
+    """ISO date of the first day of the rating period holding `date_str`
+    (returned unchanged when it is not a valid date)."""
+    day = date_ordinal(date_str)
+    if day is None:
+        return date_str
+    return ordinal_date(rating_period(day, length) * length + 1)
+
+
+def audit_row(audit: MatchAudit, match_id: int):
+    """Shape an audit for `repo.bulk_update_match_audits`."""
+    return (*audit[:16], ordinal_date(audit[16]), ordinal_date(audit[17]), match_id)
+
+
+def audit_from_row(row) -> MatchAudit:
+    """Inverse of `audit_row` for stored columns (see `repo.get_match_audits`)."""
+    return MatchAudit(*row[:16], date_ordinal(row[16]), date_ordinal(row[17]))
+
+
+def replay(matches, states, checkpoint_at=()):
+    """Replay rated matches in order against a `{player_id: PlayerState}` map.
+
+    `matches` yields rows starting with `(id, player1_id, player2_id, result,
+    date)` with ISO dates. `states` is updated in place; players without an
+    entry start from `PlayerState.default()`. Scheduled matches (NULL
+    result) are skipped.
+
+    Returns `(audits, checkpoints)`: `audits` is a list of `(match_id,
+    MatchAudit)`. For each `(date, match_id)` position in the sorted
+    `checkpoint_at`, `checkpoints` holds a `(date, match_id, {player_id:
+    PlayerState})` snapshot of every player in `states` who has played,
+    taken once all matches up to and including that position are applied.
+    """
+    audits = []
+    checkpoints = []
+    positions = list(checkpoint_at)
+    next_cp = 0
+    day_cache = {}
+    default = PlayerState.default
+    for row in matches:
+        match_id, p1, p2, result, date_str = row[:5]
+        if result is None:
+            continue
+        while next_cp < len(positions) and (date_str, match_id) > positions[next_cp]:
+            checkpoints.append((*positions[next_cp], _snapshot(states)))
+            next_cp += 1
+        day = day_cache.get(date_str)
+        if day is None:
+            day = day_cache[date_str] = date_ordinal(date_str)
+        s1 = states.get(p1)
+        if s1 is None:
+            s1 = default()
+        s2 = states.get(p2)
+        if s2 is None:
+            s2 = default()
+        states[p1], states[p2], audit = rate_match(s1, s2, result, day, match_id)
+        audits.append((match_id, audit))
+    for position in positions[next_cp:]:
+        checkpoints.append((*position, _snapshot(states)))
+    return audits, checkpoints
+
+
+def _columns(state):
+    return (state.elo, state.g2_rating, state.g2_rd, state.g2_vol, state.games, state.last_played or 0)
+
+
+def _snapshot(states):
+    return {pid: state for pid, state in states.items() if state.games}
+
+
+def partition(matches):
+    """Split rated matches into groups of players never connected by a game.
+
+    Uses union-find over the players of each rated match. Returns a list of
+    match-row lists, one per connected component, each in the input order
+    and largest first. Ratings in one component never affect another, so
+    the groups can be replayed independently.
+    """
+    parent = {}
+
+    def find(pid):
+        root = parent.setdefault(pid, pid)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    for row in matches:
+        if row[3] is None:
+            continue
+        r1 = find(row[1])
+        r2 = find(row[2])
+        if r1 != r2:
+            parent[r2] = r1
+
+    groups = {}
+    for row in matches:
+        if row[3] is not None:
+            groups.setdefault(find(row[1]), []).append(row)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def wavefronts(matches):
+    """Schedule rated matches into waves in which no player appears twice.
+
+    Each rated match goes into the wave after the latest one holding an
+    earlier match of either of its players, so every player's games keep
+    their order and the matches inside a wave do not depend on each other.
+    Returns a list of waves, each a list of indices into `matches` in input
+    order. Scheduled matches (NULL result) are left out.
+    """
+    level = {}
+    waves = []
+    for i, row in enumerate(matches):
+        if row[3] is None:
+            continue
+        p1 = row[1]
+        p2 = row[2]
+        wave = max(level.get(p1, -1), level.get(p2, -1)) + 1
+        level[p1] = level[p2] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(i)
+    return waves
+
+
+def replay_waves(matches, states, checkpoint_at=(), min_width: float = 0):
+    """Same contract and results as `replay`, rating a wave at a time.
+
+    Matches are scheduled with `wavefronts` and each wave is rated with
+    `elo.update_elo_batch` and `glicko2.glicko2_update_batch` over player
+    state arrays. Both kernels are bit-identical to their scalar versions
+    and every player's games are applied in order, so the audits, final
+    states and checkpoints equal those of `replay`.
+
+    Array calls have a fixed cost per wave, and waves are only as wide as
+    the busiest players allow, so this falls back to `replay` when the
+    waves average fewer than `min_width` matches. It also falls back
+    without NumPy, or when a match has an invalid date or the same player
+    on both sides.
+    """
+    if np is None:
+        return replay(matches, states, checkpoint_at)
+    rated = [row[:5] for row in matches if row[3] is not None]
+    day_cache = {}
+    days = []
+    for _, p1, p2, _, date_str in rated:
+        day = day_cache.get(date_str)
+        if day is None:
+            day = day_cache[date_str] = date_ordinal(date_str)
+        if day is None or p1 == p2:
+            return replay(matches, states, checkpoint_at)
+        days.append(day)
+    if not rated:
+        return replay(matches, states, checkpoint_at)
+    waves = wavefronts(rated)
+    if len(rated) < min_width * len(waves):
+        return replay(matches, states, checkpoint_at)
+
+    # one (elo, g2_rating, g2_rd, g2_vol, games, last_played) row per player;
+    # last_played 0 stands for "never" (date ordinals start at 1)
+    index = {}
+    for _, p1, p2, _, _ in rated:
+        index.setdefault(p1, len(index))
+        index.setdefault(p2, len(index))
+    pids = list(index)
+    table = np.array([_columns(states.get(pid) or PlayerState.default()) for pid in pids], dtype=float)
+    side1 = [index[row[1]] for row in rated]
+    side2 = [index[row[2]] for row in rated]
+    result = np.array([row[3] for row in rated], dtype=float)
+    day = np.array(days, dtype=float)
+
+    # each wave rates player 1 of every match, then player 2, as one batch;
+    # the player rows before and after are kept to build the audits
+    befores = []
+    afters = []
+    swaps = {}
+    for wave in waves:
+        k = len(wave)
+        m = np.array(wave, dtype=np.intp)
+        j = np.array([side1[i] for i in wave] + [side2[i] for i in wave], dtype=np.intp)
+        opp = swaps.get(k)
+        if opp is None:
+            opp = swaps[k] = np.concatenate((np.arange(k, 2 * k), np.arange(k)))
+        before = table[j]
+        e, r, rd, vol, g, lp = before.T
+        res = result[m]
+        d = day[m]
+        d = np.concatenate((d, d))
+
+        kf = elo.k_factor_batch(g)
+        new_e1, new_e2 = elo.update_elo_batch(e[:k], e[k:], res, kf[:k], kf[k:])
+        idle = np.where((lp != 0) & (d > lp), d - lp, 0.0)
+        rd_star = glicko2.inflate_rd_batch(rd, idle)
+        new_r, new_rd, new_vol = glicko2.glicko2_update_batch(
+            r, rd, vol, r[opp], rd_star[opp], np.concatenate((res, 1 - res)), idle)
+
+        after = np.column_stack((np.concatenate((new_e1, new_e2)), new_r, new_rd, new_vol, g + 1, d))
+        table[j] = after
+        befores.append(before)
+        afters.append(after)
+
+    # rows of match i's players in the stacked wave results
+    n = len(rated)
+    matches_order = []
+    rows1 = []
+    rows2 = []
+    offset = 0
+    for wave in waves:
+        k = len(wave)
+        matches_order.extend(wave)
+        rows1.extend(range(offset, offset + k))
+        rows2.extend(range(offset + k, offset + 2 * k))
+        offset += 2 * k
+    row1 = np.empty(n, dtype=np.intp)
+    row2 = np.empty(n, dtype=np.intp)
+    row1[matches_order] = rows1
+    row2[matches_order] = rows2
+    before = np.concatenate(befores)
+    after = np.concatenate(afters)
+    b1, a1, b2, a2 = before[row1].T, after[row1].T, before[row2].T, after[row2].T
+
+    columns = [col.tolist() for col in (
+        b1[0], a1[0], b2[0], a2[0],
+        b1[1], a1[1], b1[2], a1[2], b1[3], a1[3],
+        b2[1], a2[1], b2[2], a2[2], b2[3], a2[3],
+    )]
+    last_before = [[lp or None for lp in side[5].astype(np.int64).tolist()] for side in (b1, b2)]
+    counts = [side[4].astype(np.int64).tolist() for side in (a1, a2)]
+    ids = [row[0] for row in rated]
+    audits = list(zip(ids, map(MatchAudit._make, zip(*columns, *last_before))))
+    players = [(pids[j1], pids[j2]) for j1, j2 in zip(side1, side2)]
+
+    def state_after(i, side):
+        # player state right after match i, on side 0 (player 1) or 1 (player 2)
+        return PlayerState(columns[2 * side + 1][i], columns[5 + 6 * side][i], columns[7 + 6 * side][i],
+                           columns[9 + 6 * side][i], counts[side][i], days[i], ids[i])
+
+    # each player's latest state, or the (match index, side) it is built from
+    latest = {pid: state for pid, state in states.items() if state.games}
+
+    def snapshot():
+        for pid, at in latest.items():
+            if type(at) is tuple:
+                latest[pid] = state_after(*at)
+        return dict(latest)
+
+    checkpoints = []
+    positions = list(checkpoint_at)
+    next_cp = 0
+    for i, (p1, p2) in enumerate(players):
+        if next_cp < len(positions):
+            position = (rated[i][4], ids[i])
+            while next_cp < len(positions) and position > positions[next_cp]:
+                checkpoints.append((*positions[next_cp], snapshot()))
+                next_cp += 1
+        latest[p1] = (i, 0)
+        latest[p2] = (i, 1)
+    for position in positions[next_cp:]:
+        checkpoints.append((*position, snapshot()))
+
+    for pid, at in latest.items():
+        states[pid] = state_after(*at) if type(at) is tuple else at
+    return audits, checkpoints
+
+
+def replay_periods(matches, states, period_days: int, checkpoint_at=()):
+    """`replay` with Glicko-2 rated once per `period_days`-day rating period.
+
+    Matches are grouped by `rating_period`. Within a period Elo is still
+    updated game by game, while each player's Glicko-2 rating, RD and
+    volatility get one `glicko2.glicko2_period_update_batch` update from all
+    of their games in the period, scored against the opponents' ratings at
+    the start of the period (RDs inflated for the days idle before each
+    player's first game in it). Every audit of a period therefore carries
+    the period-start Glicko-2 values as before-values and the period-end
+    values as after-values.
+
+    Same contract as `replay`, except that checkpoints are taken between
+    periods: a snapshot for a position in the middle of a period includes
+    the rest of that period, so callers place positions on the last match
+    of a period.
+    """
+    audits = []
+    checkpoints = []
+    positions = list(checkpoint_at)
+    next_cp = 0
+    day_cache = {}
+    default = PlayerState.default
+
+    # (period, [(match_id, p1, p2, result, date, day)]) in input order
+    periods = []
+    for row in matches:
+        match_id, p1, p2, result, date_str = row[:5]
+        if result is None:
+            continue
+        day = day_cache.get(date_str)
+        if day is None:
+            day = day_cache[date_str] = date_ordinal(date_str)
+        # an invalid date stays in the period in progress
+        period = rating_period(day, period_days) if day is not None else (periods[-1][0] if periods else None)
+        if not periods or periods[-1][0] != period:
+            periods.append((period, []))
+        periods[-1][1].append((match_id, p1, p2, result, date_str, day))
+
+    for _, rows in periods:
+        while next_cp < len(positions) and (rows[0][4], rows[0][0]) > positions[next_cp]:
+            checkpoints.append((*positions[next_cp], _snapshot(states)))
+            next_cp += 1
+
+        # period-start states and the running Elo/games/last-played per player
+        start = {}
+        running = {}
+        idle = {}
+        for _, p1, p2, _, _, day in rows:
+            for pid in (p1, p2):
+                if pid not in start:
+                    state = states.get(pid)
+                    if state is None:
+                        state = default()
+                    start[pid] = state
+                    running[pid] = [state.elo, state.games, state.last_played, state.last_match_id]
+                    last = state.last_played
+                    idle[pid] = day - last if day is not None and last is not None and day > last else 0
+        index = {pid: j for j, pid in enumerate(start)}
+        rd_star = {pid: glicko2.inflate_rd(state.g2_rd, idle[pid]) for pid, state in start.items()}
+
+        period_audits = []
+        player = []
+        opp_r = []
+        opp_rd = []
+        score = []
+        for match_id, p1, p2, result, _, day in rows:
+            run1 = running[p1]
+            run2 = running[p2]
+            elo1, elo2 = run1[0], run2[0]
+            new_elo1, new_elo2 = elo.update_elo(elo1, elo2, result, elo.k_factor(run1[1]), elo.k_factor(run2[1]))
+            period_audits.append((match_id, p1, p2, elo1, new_elo1, elo2, new_elo2, run1[2], run2[2]))
+            for run, new_elo in ((run1, new_elo1), (run2, new_elo2)):
+                run[0] = new_elo
+                run[1] += 1
+                if day is not None:
+                    run[2] = day
+                run[3] = match_id
+            player += (index[p1], index[p2])
+            opp_r += (start[p2].g2_rating, start[p1].g2_rating)
+            opp_rd += (rd_star[p2], rd_star[p1])
+            score += (result, 1 - result)
+
+        pids = list(start)
+        new_r, new_rd, new_vol = glicko2.glicko2_period_update_batch(
+            [start[pid].g2_rating for pid in pids], [start[pid].g2_rd for pid in pids],
+            [start[pid].g2_vol for pid in pids], [idle[pid] for pid in pids],
+            player, opp_r, opp_rd, score)
+        if np is not None:
+            new_r, new_rd, new_vol = new_r.tolist(), new_rd.tolist(), new_vol.tolist()
+        after = dict(zip(pids, zip(new_r, new_rd, new_vol)))
+
+        for match_id, p1, p2, elo1, new_elo1, elo2, new_elo2, last1, last2 in period_audits:
+            s1 = start[p1]
+            s2 = start[p2]
+            r1, rd1, vol1 = after[p1]
+            r2, rd2, vol2 = after[p2]
+            audits.append((match_id, MatchAudit(
+                elo1, new_elo1, elo2, new_elo2,
+                s1.g2_rating, r1, s1.g2_rd, rd1, s1.g2_vol, vol1,
+                s2.g2_rating, r2, s2.g2_rd, rd2, s2.g2_vol, vol2,
+                last1, last2,
+            )))
+        for pid in pids:
+            elo_rating, games, last_played, last_match_id = running[pid]
+            states[pid] = PlayerState(elo_rating, *after[pid], games, last_played, last_match_id)
+
+    for position in positions[next_cp:]:
+        checkpoints.append((*position, _snapshot(states)))
+    return audits, checkpoints
@@ -0,0 +1,63 @@
+"""Streaming CSV / JSON Lines exports for external analytics.
+
+Rows come from the `repo.iter_*` readers, which fetch them in chunks of
+`config.EXPORT_CHUNK_ROWS`, and are written as they arrive, so memory use
+stays flat however long the match history grows.
+"""
+import csv
+import json
+import sys
+
+import chess_club.repo as repo
+
+FORMATS = ("csv", "jsonl")
+
+
+def detect_format(path: str) -> str:
+    """`jsonl` for `.jsonl`/`.ndjson` paths, `csv` otherwise."""
+    return "jsonl" if str(path).lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _write(out, fmt: str, fields, rows) -> int:
+    """Write `rows` (tuples in `fields` order) to an open text file; return the count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}; expected one of {FORMATS}")
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(dict(zip(fields, row))) + "\n")
+            count += 1
+    return count
+
+
+def _export(path, fmt, fields, rows) -> int:
+    if fmt is None:
+        fmt = detect_format(path)
+    if path == "-":
+        return _write(sys.stdout, fmt, fields, rows)
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        return _write(out, fmt, fields, rows)
+
+
+def export_matches(conn, path, fmt: str = None, chunk_size: int = None) -> int:
+    """Stream the full match history with audit columns to `path` ("-" for
+    stdout) in (date, id) order. Columns follow `repo.MATCH_HISTORY_FIELDS`.
+    Returns the number of matches written.
+    """
+    return _export(path, fmt, repo.MATCH_HISTORY_FIELDS, repo.iter_match_history(conn, chunk_size))
+
+
+def export_leaderboard(conn, path, fmt: str = None, official: bool = None, chunk_size: int = None) -> int:
+    """Stream the leaderboard (every player, ranked) to `path` ("-" for stdout).
+
+    Columns are `rank` followed by `repo.LEADERBOARD_FIELDS`; `official`
+    filters like `repo.get_leaderboard`. Returns the number of rows written.
+    """
+    rows = ((rank, *row) for rank, row in enumerate(repo.iter_leaderboard(conn, official, chunk_size), start=1))
+    return _export(path, fmt, ("rank", *repo.LEADERBOARD_FIELDS), rows)
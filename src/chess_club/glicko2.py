@@ -1,6 +1,11 @@
 import math
 import chess_club.config as config
 
+try:
+    import numpy as np
+except ImportError:  # optional: batch updates fall back to pure Python
+    np = None
+
 # Compact Glicko-2 implementation for two-player updates.
 # Constants
 TAU = 0.5
@@ -8,7 +13,7 @@ EPSILON = 1e-6
 Q = math.log(10) / 400
 
 def _g(phi):
-    return 1 / math.sqrt(1 + (3 * (phi ** 2)) / (math.pi ** 2))
+    return 1 / math.sqrt(1 + (3 * (phi * phi)) / (math.pi ** 2))
 
 def _E(mu, mu_j, phi_j):
     return 1 / (1 + math.exp(-_g(phi_j) * (mu - mu_j)))
@@ -46,33 +51,24 @@ def inflate_rd(rd: float, days: float) -> float:
         return rd
 
 
+def inflate_rd_batch(rd, days):
+    """Apply `inflate_rd` to NumPy arrays of RDs and inactivity days."""
+    c = config.G2_RD_INCREASE_PER_DAY
+    if not c:
+        return rd
+    return np.where(days > 0, np.minimum(np.sqrt(rd * rd + (c * c) * days), config.G2_DEFAULT_RD), rd)
+
+
 def _f(x, delta, phi, v, a, tau):
     ex = math.exp(x)
     num = ex * (delta * delta - phi * phi - v - ex)
-    den = 2 * (phi * phi + v + ex) ** 2
+    w = phi * phi + v + ex
+    den = 2 * (w * w)
     return (num / den) - ((x - a) / (tau * tau))
 
-def glicko2_update(r, rd, vol, opp_r, opp_rd, opp_vol, score, tau=TAU, days: float = 0.0):
-    # Convert to Glicko-2 scale
-    mu = _to_mu(r)
-    # increase RD according to inactivity/time using config.G2_RD_INCREASE_PER_DAY
-    # rd is in rating points; variance should grow linearly with time so
-    # rd_star = sqrt(rd^2 + c^2 * days)
-    if days and config.G2_RD_INCREASE_PER_DAY:
-        c = config.G2_RD_INCREASE_PER_DAY
-        rd_star = math.sqrt(rd * rd + (c * c) * days)
-    else:
-        rd_star = rd
-
-    phi = _to_phi(rd_star)
-    mu_j = _to_mu(opp_r)
-    phi_j = _to_phi(opp_rd)
-
-    g = _g(phi_j)
-    E = _E(mu, mu_j, phi_j)
-    v = 1 / (g * g * E * (1 - E))
-    delta = v * g * (score - E)
 
+def _solve_volatility(delta, phi, v, vol, tau=TAU):
+    """Illinois solve for the new volatility (step 5 of the Glicko-2 paper)."""
     a = math.log(vol * vol)
     A = a
     B = None
@@ -110,9 +106,32 @@ def glicko2_update(r, rd, vol, opp_r, opp_rd, opp_vol, score, tau=TAU, days: flo
             print("⚠️ glicko2 volatility solver did not converge; keeping vol unchanged.")
         except Exception:
             pass
-        new_sigma = vol
+        return vol
+    return math.exp(A / 2.0)
+
+
+def glicko2_update(r, rd, vol, opp_r, opp_rd, opp_vol, score, tau=TAU, days: float = 0.0):
+    # Convert to Glicko-2 scale
+    mu = _to_mu(r)
+    # increase RD according to inactivity/time using config.G2_RD_INCREASE_PER_DAY
+    # rd is in rating points; variance should grow linearly with time so
+    # rd_star = sqrt(rd^2 + c^2 * days)
+    if days and config.G2_RD_INCREASE_PER_DAY:
+        c = config.G2_RD_INCREASE_PER_DAY
+        rd_star = math.sqrt(rd * rd + (c * c) * days)
     else:
-        new_sigma = math.exp(A / 2.0)
+        rd_star = rd
+
+    phi = _to_phi(rd_star)
+    mu_j = _to_mu(opp_r)
+    phi_j = _to_phi(opp_rd)
+
+    g = _g(phi_j)
+    E = _E(mu, mu_j, phi_j)
+    v = 1 / (g * g * E * (1 - E))
+    delta = v * g * (score - E)
+
+    new_sigma = _solve_volatility(delta, phi, v, vol, tau)
 
     phi_star = math.sqrt(phi * phi + new_sigma * new_sigma)
     phi_prime = 1 / math.sqrt((1 / (phi_star * phi_star)) + (1 / v))
@@ -122,3 +141,221 @@ def glicko2_update(r, rd, vol, opp_r, opp_rd, opp_vol, score, tau=TAU, days: flo
     rd_prime = _to_rd(phi_prime)
 
     return r_prime, rd_prime, new_sigma
+
+
+def glicko2_period_update(r, rd, vol, games, tau=TAU, days: float = 0.0):
+    """Rate all of a player's games in one rating period with one update.
+
+    `games` holds `(opp_r, opp_rd, score)` per game, taken at the start of
+    the period, so the volatility is solved once however many games were
+    played. `days` inflates the player's own RD as in `glicko2_update`.
+    Players without games in the period are not updated here; RD growth
+    from inactivity comes from `G2_RD_INCREASE_PER_DAY`.
+    """
+    mu = _to_mu(r)
+    if days and config.G2_RD_INCREASE_PER_DAY:
+        c = config.G2_RD_INCREASE_PER_DAY
+        rd_star = math.sqrt(rd * rd + (c * c) * days)
+    else:
+        rd_star = rd
+    phi = _to_phi(rd_star)
+
+    # sum the information (1/v) and the score surplus over the period's games
+    info = 0.0
+    surplus = 0.0
+    for opp_r, opp_rd, score in games:
+        phi_j = _to_phi(opp_rd)
+        g = _g(phi_j)
+        E = 1 / (1 + math.exp(-g * (mu - _to_mu(opp_r))))
+        info += g * g * E * (1 - E)
+        surplus += g * (score - E)
+    v = 1 / info
+    delta = v * surplus
+
+    new_sigma = _solve_volatility(delta, phi, v, vol, tau)
+
+    phi_star = math.sqrt(phi * phi + new_sigma * new_sigma)
+    phi_prime = 1 / math.sqrt((1 / (phi_star * phi_star)) + (1 / v))
+    mu_prime = mu + (phi_prime * phi_prime) * surplus
+    return _to_rating(mu_prime), _to_rd(phi_prime), new_sigma
+
+
+def _libm(fn, x):
+    """Apply a `math` function element-wise.
+
+    NumPy's SIMD exp/log can differ from the C library in the last bit, so
+    the batch kernel evaluates them through `math` to stay bit-identical to
+    `glicko2_update`; the surrounding arithmetic is vectorized.
+    """
+    return np.fromiter(map(fn, x.tolist()), dtype=float, count=x.size)
+
+
+def _f_batch(x, gap, spread, a, tau2):
+    # `_f` with its loop-invariant terms precomputed by the caller:
+    # gap = delta^2 - phi^2 - v, spread = phi^2 + v, tau2 = tau^2
+    ex = _libm(math.exp, x)
+    w = spread + ex
+    return (ex * (gap - ex)) / (2 * (w * w)) - (x - a) / tau2
+
+
+def _solve_volatility_batch(delta, phi, v, vol, tau=TAU):
+    """Vectorized Illinois solve for the new volatility of every row.
+
+    Mirrors `_solve_volatility` element by element, including the
+    60-iteration cap and keeping `vol` where it does not converge. Only
+    rows still iterating are evaluated in each step.
+    """
+    gap = delta * delta - phi * phi - v
+    spread = phi * phi + v
+    tau2 = tau * tau
+    a = _libm(math.log, vol * vol)
+    A = a.copy()
+    big = delta * delta > spread
+
+    # Bracket: B = ln(delta^2 - phi^2 - v) or the first a - k*tau with f >= 0
+    k = np.ones_like(a)
+    idx = np.nonzero(~big)[0]
+    while idx.size:
+        ai = a[idx]
+        idx = idx[_f_batch(ai - k[idx] * tau, gap[idx], spread[idx], ai, tau2) < 0]
+        k[idx] += 1
+    B = a - k * tau
+    if big.any():
+        B[big] = _libm(math.log, gap[big])
+
+    fA = _f_batch(A, gap, spread, a, tau2)
+    fB = _f_batch(B, gap, spread, a, tau2)
+
+    max_iters = 60
+    for _ in range(max_iters):
+        idx = np.nonzero(np.abs(B - A) > EPSILON)[0]
+        if idx.size == 0:
+            break
+        Ai, Bi, fAi, fBi = A[idx], B[idx], fA[idx], fB[idx]
+        C = Ai + (Ai - Bi) * fAi / (fBi - fAi)
+        fC = _f_batch(C, gap[idx], spread[idx], a[idx], tau2)
+        swap = fC * fBi < 0
+        A[idx] = np.where(swap, Bi, Ai)
+        fA[idx] = np.where(swap, fBi, fAi / 2.0)
+        B[idx] = C
+        fB[idx] = fC
+
+    converged = np.abs(B - A) <= EPSILON
+    if not converged.all():
+        print("⚠️ glicko2 volatility solver did not converge; keeping vol unchanged.")
+    return np.where(converged, _libm(math.exp, A / 2.0), vol)
+
+
+def glicko2_update_batch(r, rd, vol, opp_r, opp_rd, score, days=None, tau=TAU):
+    """Apply `glicko2_update` to many (player, opponent, score) rows at once.
+
+    Each argument is a sequence of equal length; `days` defaults to zero
+    inactivity for every row. Returns `(ratings, rds, vols)`, bit-identical
+    to calling `glicko2_update` row by row. With NumPy installed the whole
+    batch, including the volatility solve, runs as array operations and
+    NumPy arrays are returned; otherwise each row goes through the scalar
+    `glicko2_update` and lists are returned.
+    """
+    if days is None:
+        days = [0.0] * len(r)
+
+    if np is None:
+        new_r, new_rd, new_vol = [], [], []
+        for row in zip(r, rd, vol, opp_r, opp_rd, score, days):
+            r_i, rd_i, vol_i, opp_r_i, opp_rd_i, score_i, days_i = row
+            out = glicko2_update(r_i, rd_i, vol_i, opp_r_i, opp_rd_i, None, score_i, tau=tau, days=days_i)
+            new_r.append(out[0])
+            new_rd.append(out[1])
+            new_vol.append(out[2])
+        return new_r, new_rd, new_vol
+
+    r = np.asarray(r, dtype=float)
+    rd = np.asarray(rd, dtype=float)
+    vol = np.asarray(vol, dtype=float)
+    opp_r = np.asarray(opp_r, dtype=float)
+    opp_rd = np.asarray(opp_rd, dtype=float)
+    score = np.asarray(score, dtype=float)
+    days = np.asarray(days, dtype=float)
+
+    mu = _to_mu(r)
+    c = config.G2_RD_INCREASE_PER_DAY
+    if c:
+        rd_star = np.where(days != 0, np.sqrt(rd * rd + (c * c) * days), rd)
+    else:
+        rd_star = rd
+    phi = _to_phi(rd_star)
+    mu_j = _to_mu(opp_r)
+    phi_j = _to_phi(opp_rd)
+
+    g = 1 / np.sqrt(1 + (3 * (phi_j * phi_j)) / (math.pi ** 2))
+    E = 1 / (1 + _libm(math.exp, -g * (mu - mu_j)))
+    v = 1 / (g * g * E * (1 - E))
+    delta = v * g * (score - E)
+
+    new_sigma = _solve_volatility_batch(delta, phi, v, vol, tau)
+
+    phi_star = np.sqrt(phi * phi + new_sigma * new_sigma)
+    phi_prime = 1 / np.sqrt((1 / (phi_star * phi_star)) + (1 / v))
+    mu_prime = mu + (phi_prime * phi_prime) * g * (score - E)
+
+    return _to_rating(mu_prime), _to_rd(phi_prime), new_sigma
+
+
+def glicko2_period_update_batch(r, rd, vol, days, player, opp_r, opp_rd, score, tau=TAU):
+    """Apply `glicko2_period_update` to every player of a rating period.
+
+    `r`, `rd`, `vol` and `days` hold one entry per player; `player` (an
+    index into them), `opp_r`, `opp_rd` and `score` hold one entry per
+    game, in the order the games are summed. Every player needs at least
+    one game. Players do not depend on each other within a period, so with
+    NumPy the sums and the volatility solve run as array operations,
+    bit-identical to the scalar function; otherwise each player goes
+    through `glicko2_period_update`. Returns `(ratings, rds, vols)`.
+    """
+    if np is None:
+        games = [[] for _ in r]
+        for j, row in zip(player, zip(opp_r, opp_rd, score)):
+            games[j].append(row)
+        new_r, new_rd, new_vol = [], [], []
+        for r_i, rd_i, vol_i, days_i, games_i in zip(r, rd, vol, days, games):
+            out = glicko2_period_update(r_i, rd_i, vol_i, games_i, tau=tau, days=days_i)
+            new_r.append(out[0])
+            new_rd.append(out[1])
+            new_vol.append(out[2])
+        return new_r, new_rd, new_vol
+
+    r = np.asarray(r, dtype=float)
+    rd = np.asarray(rd, dtype=float)
+    vol = np.asarray(vol, dtype=float)
+    days = np.asarray(days, dtype=float)
+    player = np.asarray(player, dtype=np.intp)
+    opp_r = np.asarray(opp_r, dtype=float)
+    opp_rd = np.asarray(opp_rd, dtype=float)
+    score = np.asarray(score, dtype=float)
+
+    mu = _to_mu(r)
+    c = config.G2_RD_INCREASE_PER_DAY
+    if c:
+        rd_star = np.where(days != 0, np.sqrt(rd * rd + (c * c) * days), rd)
+    else:
+        rd_star = rd
+    phi = _to_phi(rd_star)
+    phi_j = _to_phi(opp_rd)
+
+    g = 1 / np.sqrt(1 + (3 * (phi_j * phi_j)) / (math.pi ** 2))
+    E = 1 / (1 + _libm(math.exp, -g * (mu[player] - _to_mu(opp_r))))
+    # np.add.at accumulates in game order, like the scalar loop
+    info = np.zeros_like(mu)
+    surplus = np.zeros_like(mu)
+    np.add.at(info, player, g * g * E * (1 - E))
+    np.add.at(surplus, player, g * (score - E))
+    v = 1 / info
+    delta = v * surplus
+
+    new_sigma = _solve_volatility_batch(delta, phi, v, vol, tau)
+
+    phi_star = np.sqrt(phi * phi + new_sigma * new_sigma)
+    phi_prime = 1 / np.sqrt((1 / (phi_star * phi_star)) + (1 / v))
+    mu_prime = mu + (phi_prime * phi_prime) * surplus
+
+    return _to_rating(mu_prime), _to_rd(phi_prime), new_sigma
@@ -0,0 +1,219 @@
+"""Bulk match import from CSV or JSON Lines files.
+
+Each row names a tournament, both players, the result and the date. The
+file is streamed in chunks: names are resolved with one lookup per chunk,
+matches are inserted with `executemany` and each chunk is committed as its
+own unit of work. Ratings are replayed once at the end, starting from the
+earliest imported date. Rows that cannot be imported are collected in the
+report instead of aborting the run.
+"""
+import csv
+import json
+from datetime import date as _date
+
+import chess_club.db as db
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+
+FIELDS = ("tournament", "player1", "player2", "result", "date")
+
+# Score notations accepted besides plain 1 / 0 / 0.5 (player 1's score)
+RESULT_NOTATIONS = {
+    "1-0": 1.0,
+    "0-1": 0.0,
+    "1/2-1/2": 0.5,
+    "½-½": 0.5,
+    "0.5-0.5": 0.5,
+}
+
+
+def _detect_format(path: str) -> str:
+    lower = str(path).lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the import format of {path}; pass fmt='csv' or fmt='jsonl'")
+
+
+def _read_rows(path: str, fmt: str):
+    """Yield `(line_no, row, error)`; `row` is a dict when `error` is None."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        if fmt == "csv":
+            reader = csv.DictReader(fh)
+            for row in reader:
+                yield reader.line_num, row, None
+        else:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"Invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_no, None, "Expected a JSON object"
+                    continue
+                yield line_no, row, None
+
+
+def parse_result(value):
+    """Return player 1's score (1.0, 0.5 or 0.0), or None for a scheduled
+    match with an empty result. Raises ValueError on anything else.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text in RESULT_NOTATIONS:
+        return RESULT_NOTATIONS[text]
+    try:
+        result = float(text)
+    except ValueError:
+        raise ValueError(f"Invalid result {text!r}") from None
+    if result not in (0.0, 0.5, 1.0):
+        raise ValueError(f"Invalid result {text!r}")
+    return result
+
+
+def _parse_row(row):
+    """Validate one raw row into `(tournament, player1, player2, result, date)`."""
+    values = {}
+    for field in FIELDS:
+        value = row.get(field)
+        values[field] = str(value).strip() if value is not None else ""
+    missing = [field for field in FIELDS if field != "result" and not values[field]]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    if values["player1"] == values["player2"]:
+        raise ValueError("Cannot play against self")
+    try:
+        match_date = _date.fromisoformat(values["date"]).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date {values['date']!r}") from None
+    result = parse_result(row.get("result"))
+    return values["tournament"], values["player1"], values["player2"], result, match_date
+
+
+def _resolve_names(conn, parsed, players, tournaments, create_missing: bool):
+    """Fill the name caches for a chunk, creating unknown names if asked."""
+    new_players = {name for row in parsed for name in row[2:4] if name not in players}
+    new_tournaments = {row[1] for row in parsed if row[1] not in tournaments}
+    if new_players:
+        players.update(repo.get_player_ids_by_name(conn, new_players))
+    if new_tournaments:
+        tournaments.update(repo.get_tournaments_by_name(conn, new_tournaments))
+    if not create_missing:
+        return
+
+    missing_players = [name for name in new_players if name not in players]
+    if missing_players:
+        repo.add_players(conn, missing_players)
+        players.update(repo.get_player_ids_by_name(conn, missing_players))
+    # a new tournament is dated by its earliest row in the chunk
+    missing_tournaments = {}
+    for _, tname, _, _, _, match_date in parsed:
+        if tname not in tournaments:
+            known = missing_tournaments.get(tname)
+            missing_tournaments[tname] = match_date if known is None else min(known, match_date)
+    if missing_tournaments:
+        repo.add_tournaments(conn, sorted(missing_tournaments.items()))
+        tournaments.update(repo.get_tournaments_by_name(conn, missing_tournaments))
+
+
+def _import_chunk(conn, chunk, players, tournaments, create_missing: bool, report):
+    """Validate, resolve and insert one chunk of rows as one unit of work."""
+    parsed = []
+    errors = []
+    for line_no, row, error in chunk:
+        if error is None:
+            try:
+                parsed.append((line_no, *_parse_row(row)))
+                continue
+            except ValueError as e:
+                error = str(e)
+        errors.append((line_no, error))
+
+    with db.UnitOfWork(conn):
+        _resolve_names(conn, parsed, players, tournaments, create_missing)
+        match_rows = []
+        rated = []
+        for line_no, tname, name1, name2, result, match_date in parsed:
+            tournament_row = tournaments.get(tname)
+            if tournament_row is None:
+                errors.append((line_no, f"Unknown tournament {tname!r}"))
+                continue
+            tid, completed = tournament_row
+            if completed:
+                errors.append((line_no, f"Tournament {tname!r} is completed"))
+                continue
+            unknown = [name for name in (name1, name2) if name not in players]
+            if unknown:
+                errors.append((line_no, f"Unknown player {unknown[0]!r}"))
+                continue
+            p1 = players[name1]
+            p2 = players[name2]
+            match_rows.append((tid, p1, p2, result, match_date))
+            if result is not None:
+                rated.append((p1, p2, result, match_date))
+
+        repo.bulk_insert_matches(conn, match_rows)
+        repo.add_matches_to_player_stats(conn, rated)
+        if rated:
+            earliest = min(row[3] for row in rated)
+            repo.invalidate_checkpoints_from(conn, earliest, 0)
+
+    report["imported"] += len(match_rows)
+    report["errors"].extend(sorted(errors))
+    if rated and (report["earliest_date"] is None or earliest < report["earliest_date"]):
+        report["earliest_date"] = earliest
+
+
+def import_matches(conn, path: str, fmt: str = None, create_missing: bool = False, chunk_size: int = 1000):
+    """Import matches from a CSV (with a header row) or JSON Lines file.
+
+    Rows carry `tournament`, `player1`, `player2`, `result` and `date`
+    (ISO format). Results are player 1's score (`1`, `0`, `0.5` or `1-0`,
+    `0-1`, `1/2-1/2`); an empty result imports a scheduled match. Names are
+    resolved against existing players and tournaments; with
+    `create_missing=True` unknown players are created with default ratings
+    and unknown tournaments are created dated by their earliest row.
+
+    Every `chunk_size` rows are committed as one unit of work. After the last
+    chunk ratings are replayed once from the earliest imported rated match,
+    falling back to a full recompute when no trustworthy seed exists.
+
+    Returns a report dict: `imported` (match count), `errors` (list of
+    `(line_no, message)` for skipped rows), `earliest_date` and
+    `full_recompute`.
+    """
+    if fmt is None:
+        fmt = _detect_format(path)
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported import format {fmt!r}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    report = {"imported": 0, "errors": [], "earliest_date": None, "full_recompute": False}
+    players = {}
+    tournaments = {}
+    try:
+        chunk = []
+        for item in _read_rows(path, fmt):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                _import_chunk(conn, chunk, players, tournaments, create_missing, report)
+                chunk = []
+        if chunk:
+            _import_chunk(conn, chunk, players, tournaments, create_missing, report)
+    finally:
+        # committed chunks are rated even if a later chunk failed
+        if report["earliest_date"] is not None:
+            try:
+                ranking.recompute_from_position(conn, report["earliest_date"], 0)
+            except ValueError:
+                ranking.recompute(conn)
+                report["full_recompute"] = True
+    return report
@@ -0,0 +1,160 @@
+"""Asyncio ingestion of live match results through a single writer.
+
+Arbiters submitting at the same time `await queue.submit_result(...)` on a
+shared `ResultQueue` instead of calling `tournament.create_match` on the
+connection themselves. One writer task drains whatever is queued (up to
+`config.INGEST_MAX_BATCH` results) and records it with `record_batch` as a
+single transaction, then resolves each submitter's future with its match id
+and computed ratings.
+
+The writer runs the database work in a worker thread so the event loop keeps
+accepting submissions meanwhile; open the connection with
+`db.get_connection(path, check_same_thread=False)` and leave it to the queue
+while it runs.
+"""
+import asyncio
+import functools
+import sqlite3
+
+import chess_club.config as config
+import chess_club.db as db
+import chess_club.engine as engine
+import chess_club.ranking as ranking
+import chess_club.ratings as ratings
+import chess_club.repo as repo
+import chess_club.service as service
+
+
+def record_batch(conn, submissions):
+    """Record `(tournament_id, pid1, pid2, result, date)` submissions in one
+    unit of work.
+
+    Submissions are applied in date order (ties keep submission order), so
+    match ids and rating updates follow the (date, id) order of a replay.
+    Results dated before the latest rated match (every result, when
+    Glicko-2 is rated per period) are stored first and then rated by one
+    targeted recompute from the earliest of them (full recompute
+    fallback). A submission that fails validation (completed tournament,
+    unknown player or tournament) rolls back to its own savepoint without
+    affecting the others. Returns, in the given order, `(match_id,
+    engine.MatchAudit)` or the exception for each submission.
+    """
+    order = sorted(range(len(submissions)), key=lambda i: submissions[i][4])
+    outcomes = [None] * len(submissions)
+    with db.UnitOfWork(conn):
+        last = repo.get_last_rated_position(conn)
+        backdated = []
+        for i in order:
+            tournament_id, pid1, pid2, result, match_date = submissions[i]
+            try:
+                with db.UnitOfWork(conn):
+                    if len(repo.get_player_rating_states(conn, [pid1, pid2])) < len({pid1, pid2}):
+                        raise ValueError("Player not found")
+                    match_id = repo.create_match(conn, tournament_id, pid1, pid2, match_date)
+                    if backdated or config.G2_RATING_PERIOD_DAYS or (last is not None and match_date < last[0]):
+                        # rated below, once every earlier-dated result is stored
+                        repo.set_match_result(conn, match_id, result, match_date)
+                        backdated.append((match_date, match_id, i))
+                    else:
+                        audit = ratings.compute_match(conn, pid1, pid2, result, match_date)
+                        service.record_match_result(conn, match_id, pid1, pid2, audit, match_date, result)
+                        outcomes[i] = (match_id, audit)
+            except (ValueError, sqlite3.IntegrityError) as e:
+                outcomes[i] = e
+        if backdated:
+            first_date, first_id, _ = backdated[0]
+            try:
+                ranking.recompute_from_position(conn, first_date, first_id)
+            except ValueError:
+                ranking.recompute(conn)
+            audits = repo.get_match_audits(conn, [match_id for _, match_id, _ in backdated])
+            for _, match_id, i in backdated:
+                outcomes[i] = (match_id, engine.audit_from_row(audits[match_id]))
+    return outcomes
+
+
+class ResultQueue:
+    """Single-writer queue for results submitted from many coroutines.
+
+        async with ingest.ResultQueue(conn) as queue:
+            match_id, audit = await queue.submit_result(tid, p1, p2, 1.0, "2025-03-01")
+
+    `max_batch` caps how many queued results share one transaction
+    (default `config.INGEST_MAX_BATCH`).
+    """
+
+    def __init__(self, conn, max_batch: int = None):
+        self.conn = conn
+        self.max_batch = max_batch or config.INGEST_MAX_BATCH
+        self._queue = asyncio.Queue()
+        self._writer = None
+        self._closing = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    def start(self):
+        """Start the writer task on the running event loop."""
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Record everything already queued, then stop the writer.
+
+        Submissions made once closing has begun are refused.
+        """
+        if self._writer is not None:
+            self._closing = True
+            await self._queue.put(None)
+            await self._writer
+            self._writer = None
+            self._closing = False
+
+    async def submit_result(self, tournament_id: int, pid1: int, pid2: int, result: float, match_date: str):
+        """Queue a result and wait until its transaction commits.
+
+        Returns `(match_id, engine.MatchAudit)`. Raises ValueError for a
+        completed tournament or unknown player, and re-raises database errors
+        that rolled back the whole batch. Raises RuntimeError when the
+        queue is not running or is closing.
+        """
+        if self._writer is None:
+            raise RuntimeError("ResultQueue is not running; use start() or `async with`")
+        if self._closing:
+            raise RuntimeError("ResultQueue is closing")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((tournament_id, pid1, pid2, result, match_date), future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stop = None in batch
+            pending = [item for item in batch if item is not None]
+            if pending:
+                await self._record(pending)
+            if stop and self._queue.empty():
+                return
+
+    async def _record(self, pending):
+        try:
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(record_batch, self.conn, [sub for sub, _ in pending]))
+        except Exception as e:
+            # the unit of work rolled back: nothing in this batch was recorded
+            outcomes = [e] * len(pending)
+        for (_, future), outcome in zip(pending, outcomes):
+            if future.done():
+                # submitter stopped waiting; the result is recorded regardless
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
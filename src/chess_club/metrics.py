@@ -0,0 +1,216 @@
+"""Opt-in timing and SQL instrumentation.
+
+`enable(conn)` wraps the public functions of `repo`, `ratings`, `service`
+and `ranking` with timers and counts the SQL statements each call issues
+(through `sqlite3.Connection.set_trace_callback` on the watched
+connections). Times and statement counts are inclusive: a `ranking.recompute`
+call also counts the repo calls it makes. Statements slower than
+`config.METRICS_SLOW_QUERY_MS` are kept with their `EXPLAIN QUERY PLAN`. A
+statement's time runs from its start to the next statement on the same
+thread or the end of the innermost instrumented call, so it includes
+fetching the rows.
+
+    metrics.enable(conn)
+    ranking.recompute(conn)
+    print(metrics.snapshot()["operations"]["ranking.recompute"])
+
+Nothing is patched until `enable` is called; `disable` restores the
+original functions.
+"""
+import functools
+import inspect
+import sqlite3
+import threading
+import time
+
+import chess_club.config as config
+
+# Most slow statements kept; older ones are dropped first
+MAX_SLOW_QUERIES = 100
+
+_MODULES = ("repo", "ratings", "service", "ranking")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_lock = threading.Lock()
+_local = threading.local()
+_originals = {}
+_connections = []
+_operations = {}
+_slow = []
+_statements = 0
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _close_statement(now: float):
+    """Finish the thread's running statement; queue it if it was slow."""
+    running = getattr(_local, "running", None)
+    if running is None:
+        return
+    _local.running = None
+    conn, sql, operation, start = running
+    ms = (now - start) * 1000
+    if ms >= config.METRICS_SLOW_QUERY_MS:
+        _local.pending = getattr(_local, "pending", []) + [(conn, sql, operation, ms)]
+
+
+def _explain_pending():
+    """Record queued slow statements with their plans (outside any SQL call)."""
+    pending = getattr(_local, "pending", None)
+    if not pending:
+        return
+    _local.pending = []
+    _local.explaining = True
+    try:
+        for conn, sql, operation, ms in pending:
+            plan = None
+            if sql.lstrip().upper().startswith(_EXPLAINABLE):
+                try:
+                    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                except sqlite3.Error:
+                    plan = None
+            with _lock:
+                _slow.append({"operation": operation, "ms": round(ms, 3), "sql": sql.strip(), "plan": plan})
+                del _slow[:-MAX_SLOW_QUERIES]
+    finally:
+        _local.explaining = False
+
+
+def _tracer(conn):
+    def on_statement(sql):
+        global _statements
+        if getattr(_local, "explaining", False):
+            return
+        now = time.perf_counter()
+        _close_statement(now)
+        stack = _stack()
+        for frame in stack:
+            frame[2] += 1
+        with _lock:
+            _statements += 1
+        _local.running = (conn, sql, stack[-1][0] if stack else None, now)
+    return on_statement
+
+
+def _instrument(name: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stack = _stack()
+        frame = [name, time.perf_counter(), 0]
+        stack.append(frame)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            now = time.perf_counter()
+            _close_statement(now)
+            stack.pop()
+            with _lock:
+                entry = _operations.setdefault(name, {"calls": 0, "seconds": 0.0, "statements": 0})
+                entry["calls"] += 1
+                entry["seconds"] += now - frame[1]
+                entry["statements"] += frame[2]
+            _explain_pending()
+    return wrapper
+
+
+def enable(*connections):
+    """Instrument the entry-point modules and trace SQL on `connections`.
+
+    Safe to call again to watch more connections. Replaces any trace
+    callback already set on them.
+    """
+    import chess_club.ranking as ranking
+    import chess_club.ratings as ratings
+    import chess_club.repo as repo
+    import chess_club.service as service
+
+    modules = {"repo": repo, "ratings": ratings, "service": service, "ranking": ranking}
+    for label in _MODULES:
+        module = modules[label]
+        for attr, fn in list(vars(module).items()):
+            if attr.startswith("_") or not inspect.isfunction(fn) or fn.__module__ != module.__name__:
+                continue
+            if (module, attr) in _originals:
+                continue
+            _originals[(module, attr)] = fn
+            setattr(module, attr, _instrument(f"{label}.{attr}", fn))
+    for conn in connections:
+        if conn not in _connections:
+            _connections.append(conn)
+            conn.set_trace_callback(_tracer(conn))
+
+
+def disable():
+    """Restore the original functions and stop watching connections.
+
+    Operation counters and slow statements are kept until `reset`.
+    """
+    for (module, attr), fn in _originals.items():
+        setattr(module, attr, fn)
+    _originals.clear()
+    for conn in _connections:
+        try:
+            conn.set_trace_callback(None)
+        except sqlite3.ProgrammingError:
+            # already closed
+            pass
+    _connections.clear()
+
+
+def reset():
+    """Zero every counter and forget slow statements."""
+    global _statements
+    with _lock:
+        _operations.clear()
+        _slow.clear()
+        _statements = 0
+
+
+def snapshot() -> dict:
+    """Return a copy of the counters collected so far.
+
+    `operations` maps `module.function` to `calls`, `seconds` and
+    `statements`; `statements` is the total traced; `slow_queries` lists
+    `{operation, ms, sql, plan}`; `player_cache` sums the watched
+    connections' cache counters.
+    """
+    cache = {}
+    for conn in _connections:
+        player_cache = getattr(conn, "player_cache", None)
+        if player_cache is not None:
+            for key, value in player_cache.stats().items():
+                cache[key] = cache.get(key, 0) + value
+    with _lock:
+        return {
+            "operations": {name: dict(entry) for name, entry in _operations.items()},
+            "statements": _statements,
+            "slow_queries": [dict(entry) for entry in _slow],
+            "player_cache": cache,
+        }
+
+
+def report(file=None, top: int = 25):
+    """Print the `top` operations by total time, cache counters and slow statements."""
+    snap = snapshot()
+    ops = sorted(snap["operations"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    print(f"\n⏱️ Profile: {snap['statements']} SQL statements", file=file)
+    print(f"  {'operation':40} {'calls':>7} {'total s':>9} {'mean ms':>9} {'sql':>8}", file=file)
+    for name, entry in ops[:top]:
+        mean_ms = entry["seconds"] * 1000 / entry["calls"]
+        print(f"  {name:40} {entry['calls']:7d} {entry['seconds']:9.3f} {mean_ms:9.3f} {entry['statements']:8d}", file=file)
+    cache = snap["player_cache"]
+    if cache:
+        print(f"  player cache: {cache['hits']} hits, {cache['misses']} misses, "
+              f"{cache['invalidations']} invalidations, {cache['resets']} resets", file=file)
+    if snap["slow_queries"]:
+        print(f"\n🐢 Statements over {config.METRICS_SLOW_QUERY_MS} ms:", file=file)
+        for entry in snap["slow_queries"]:
+            print(f"  {entry['ms']:.1f} ms in {entry['operation'] or '(outside instrumented calls)'}: "
+                  f"{' '.join(entry['sql'].split())[:200]}", file=file)
+            for step in entry["plan"] or []:
+                print(f"      {step}", file=file)
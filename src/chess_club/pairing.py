@@ -0,0 +1,240 @@
+"""Swiss-system pairing: no database access.
+
+`pair_round` takes the registered players with their ratings and the
+tournament's games so far, and returns the next round. Players are ranked
+by score, then rating; each score group is paired top half against bottom
+half (S1[i] against S2[i]), with the nearest alternative partners tried
+when that would repeat an earlier game or leave both players owed the
+same color. Players left unpaired in a group float down to the next one.
+Colors go to whoever is owed them: the player with more blacks gets white,
+then the one whose last game was black, then the higher-ranked player on
+odd rounds. A bye scores `BYE_SCORE` and goes to the lowest-ranked player
+who has not had one.
+
+`round_robin` builds the complete schedule of an all-play-all section
+from Berger tables.
+
+`player1` of a stored match is the player with white.
+"""
+from collections import namedtuple
+
+# Search steps allowed per score group before that attempt is given up and
+# more players are floated down (keeps pathological rounds bounded)
+SEARCH_BUDGET = 20000
+
+# Points for a bye (a full-point bye, as in FIDE Swiss rules)
+BYE_SCORE = 1.0
+
+Round = namedtuple("Round", "number pairs bye")
+Round.__doc__ = """Pairings for one round: `pairs` are `(white_id, black_id)`
+in board order and `bye` is the unpaired player id (or None)."""
+
+
+class _Exhausted(Exception):
+    pass
+
+
+def standings(players, history, byes=None):
+    """Score, color and opponent bookkeeping from a tournament's games.
+
+    `players` are `(player_id, rating)`; `history` holds `(player1_id,
+    player2_id, result)` in the order the games were paired (result None
+    for a game without a result yet, which counts for colors and opponents
+    but scores nothing); `byes` maps player ids to the byes they had, each
+    worth `BYE_SCORE`. Returns `{player_id: dict(score, rating, games, byes,
+    balance, last, opponents)}` for the given players, where `balance` is
+    whites minus blacks and `last` is 1 (white), -1 (black) or 0.
+    """
+    byes = byes or {}
+    table = {
+        pid: {"score": BYE_SCORE * byes.get(pid, 0), "rating": rating, "games": 0, "byes": byes.get(pid, 0),
+              "balance": 0, "last": 0, "opponents": set()}
+        for pid, rating in players
+    }
+    for p1, p2, result in history:
+        for pid, opponent, color, score in ((p1, p2, 1, result), (p2, p1, -1, None if result is None else 1.0 - result)):
+            entry = table.get(pid)
+            if entry is None:
+                # withdrawn players keep their games in their opponents' records
+                continue
+            entry["games"] += 1
+            entry["balance"] += color
+            entry["last"] = color
+            entry["opponents"].add(opponent)
+            if score is not None:
+                entry["score"] += score
+    return table
+
+
+def pair_round(players, history, byes=None) -> Round:
+    """Pair the next round of a Swiss tournament.
+
+    See `standings` for the arguments. The bye goes to the lowest-ranked
+    player with the fewest byes who has played or had a bye in every round
+    so far (a late entrant only when nobody else qualifies). Two players
+    are only paired again when no merge of the lowest score groups can
+    avoid it; the players left over are then paired in ranking order.
+    """
+    table = standings(players, history, byes)
+    number = max((entry["games"] + entry["byes"] for entry in table.values()), default=0) + 1
+    order = sorted(table, key=lambda pid: (-table[pid]["score"], -_rating(table[pid]), pid))
+
+    bye = None
+    if len(order) % 2:
+        fewest = min(table[pid]["byes"] for pid in order)
+        eligible = [pid for pid in reversed(order) if table[pid]["byes"] == fewest]
+        bye = next((pid for pid in eligible if table[pid]["games"] + table[pid]["byes"] == number - 1), eligible[0])
+        order.remove(bye)
+
+    groups = []
+    for pid in order:
+        if groups and table[groups[-1][0]]["score"] == table[pid]["score"]:
+            groups[-1].append(pid)
+        else:
+            groups.append([pid])
+
+    # when the last group cannot be paired, merge it with the groups above
+    # it one at a time before accepting a rematch
+    for merged in range(1, len(groups) + 1):
+        cut = len(groups) - merged
+        pairs, leftover = _pair_groups(groups[:cut] + [[pid for group in groups[cut:] for pid in group]], table)
+        if not leftover:
+            break
+    for top, bottom in zip(leftover[::2], leftover[1::2]):
+        pairs.append((top, bottom))
+
+    rank = {pid: i for i, pid in enumerate(order)}
+    boards = sorted(pairs, key=lambda pair: min(rank[pair[0]], rank[pair[1]]))
+    return Round(number, [_colors(a, b, table, rank, number) for a, b in boards], bye)
+
+
+def round_robin(player_ids, double: bool = False):
+    """Berger-table schedule for an all-play-all section.
+
+    `player_ids` are taken as pairing numbers 1..n in the order given; with
+    an odd count the partner of the missing number n+1 has the bye. Returns
+    one `Round` per round (n-1 rounds, or n with an odd count); `double`
+    appends a second cycle with colors reversed.
+    """
+    numbers = list(player_ids)
+    if len(numbers) % 2:
+        numbers.append(None)
+    n = len(numbers)
+    m = n - 1
+    rounds = []
+    for r in range(1, m + 1):
+        # the fixed player n meets p with 2p = r + 1 (mod m); the other
+        # boards pair p + k with p - k
+        p = (r + 1) * (m + 1) // 2 % m or m
+        boards = [(numbers[-1], numbers[p - 1]) if r % 2 == 0 else (numbers[p - 1], numbers[-1])]
+        for k in range(1, n // 2):
+            a = (p + k) % m or m
+            b = (p - k) % m or m
+            # lower number has white when the numbers add up to an odd sum
+            low, high = min(a, b), max(a, b)
+            white, black = (low, high) if (a + b) % 2 else (high, low)
+            boards.append((numbers[white - 1], numbers[black - 1]))
+        bye = None
+        pairs = []
+        for white, black in boards:
+            if white is None or black is None:
+                bye = black if white is None else white
+            else:
+                pairs.append((white, black))
+        rounds.append(Round(r, pairs, bye))
+    if double:
+        rounds += [Round(rnd.number + m, [(black, white) for white, black in rnd.pairs], rnd.bye) for rnd in rounds]
+    return rounds
+
+
+def _rating(entry):
+    return entry["rating"] if entry["rating"] is not None else float("-inf")
+
+
+def _pair_groups(groups, table):
+    """Pair score groups top-down, floating unpaired players to the next
+    group. Returns `(pairs, unpaired)`; `unpaired` is empty on success."""
+    pairs = []
+    floaters = []
+    for i, group in enumerate(groups):
+        paired, floaters = _pair_bracket(floaters + group, table, last=i == len(groups) - 1)
+        pairs.extend(paired)
+    return pairs, floaters
+
+
+def _pair_bracket(bracket, table, last: bool):
+    """Pair a score group (with players floated in from above, first).
+
+    Tries to leave as few players unpaired as the group's parity allows,
+    then two more at a time. The last group must pair everyone; whoever it
+    cannot pair is returned for the rematch fallback.
+    """
+    for spare in range(len(bracket) % 2, len(bracket) + 1, 2):
+        if last and spare > len(bracket) % 2:
+            break
+        try:
+            found = _search(bracket, table, spare, [0])
+        except _Exhausted:
+            found = None
+        if found is not None:
+            return found
+    return [], list(bracket)
+
+
+def _search(remaining, table, spare: int, steps):
+    """Depth-first pairing of `remaining` leaving `spare` players unpaired.
+
+    The first player's preferred partner sits half-way down the list
+    (Dutch S1[i] against S2[i]); partners owed the same color are tried
+    last, and otherwise nearer alternatives first. Returns `(pairs,
+    unpaired)` or None.
+    """
+    steps[0] += 1
+    if steps[0] > SEARCH_BUDGET:
+        raise _Exhausted
+    if len(remaining) <= spare:
+        return [], list(remaining)
+    top = remaining[0]
+    half = len(remaining) // 2
+    opponents = table[top]["opponents"]
+    wants = _preference(table[top])
+    candidates = sorted(
+        range(1, len(remaining)),
+        key=lambda j: (wants != 0 and _preference(table[remaining[j]]) == wants, abs(j - half), j < half),
+    )
+    for j in candidates:
+        partner = remaining[j]
+        if partner in opponents:
+            continue
+        found = _search(remaining[1:j] + remaining[j + 1:], table, spare, steps)
+        if found is not None:
+            pairs, unpaired = found
+            return [(top, partner)] + pairs, unpaired
+    if spare:
+        # float this player rather than fail the whole group
+        found = _search(remaining[1:], table, spare - 1, steps)
+        if found is not None:
+            pairs, unpaired = found
+            return pairs, [top] + unpaired
+    return None
+
+
+def _preference(entry) -> int:
+    """1 if the player is owed white, -1 if owed black, 0 if indifferent."""
+    if entry["balance"]:
+        return -1 if entry["balance"] > 0 else 1
+    return -entry["last"]
+
+
+def _colors(a, b, table, rank, number: int):
+    """Order a pair as `(white, black)`."""
+    balance_a = table[a]["balance"]
+    balance_b = table[b]["balance"]
+    if balance_a != balance_b:
+        return (a, b) if balance_a < balance_b else (b, a)
+    last_a = table[a]["last"]
+    last_b = table[b]["last"]
+    if last_a != last_b:
+        return (a, b) if last_a < last_b else (b, a)
+    higher, lower = (a, b) if rank[a] < rank[b] else (b, a)
+    return (higher, lower) if number % 2 else (lower, higher)
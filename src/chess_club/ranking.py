@@ -1,333 +1,430 @@
 import chess_club.repo as repo
-import chess_club.elo as elo
 import chess_club.config as config
-import chess_club.glicko2 as glicko2
-import chess_club.ratings as ratings
-import chess_club.service as service
+import chess_club.db as db
+import chess_club.engine as engine
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+import heapq
 import math
+import os
+
+# Rating settings copied into recompute worker processes, so workers rate
+# with the parent's configuration even when they are not forked from it.
+_ENGINE_SETTINGS = (
+    "DEFAULT_ELO", "ELO_K_THRESHOLDS", "ELO_K_VALUES", "ELO_DECIMALS",
+    "G2_DEFAULT_RATING", "G2_DEFAULT_RD", "G2_DEFAULT_VOL", "G2_RD_INCREASE_PER_DAY",
+    "G2_RATING_PERIOD_DAYS", "RECOMPUTE_WAVE_MIN_WIDTH",
+)
+
+
+def _rating_display(elo_rating, g2_rating) -> str:
+    # Show ratings per the configured rating system; do not fall back to the
+    # other system when one is missing, show an explicit placeholder instead.
+    if config.RATING_SYSTEM == 'glicko2':
+        return f"G2: {g2_rating:6.1f}" if g2_rating is not None else "G2:(none)"
+    if config.RATING_SYSTEM == 'both':
+        elo_part = f'Elo:{elo_rating:6.1f}' if elo_rating is not None else 'Elo:(none)'
+        g2_part = f'G2:{g2_rating:6.1f}' if g2_rating is not None else 'G2:(none)'
+        return f"{elo_part} / {g2_part}"
+    return f'Elo: {elo_rating:6.1f}' if elo_rating is not None else 'Elo:(none)'
+
+
+def _print_leaderboard_rows(rows, first_rank: int, suffix: str = ""):
+    for rank, row in enumerate(rows, first_rank):
+        _, name, elo_rating, g2_rating, _, _, games_played, wins, draws, losses, last_game = row[:11]
+        last_game_str = last_game if last_game else "No games"
+        print(f"{rank:4d}. {name:15} {_rating_display(elo_rating, g2_rating)} | Games: {games_played:3d} "
+              f"| W/D/L: {wins}/{draws}/{losses} | Last game: {last_game_str}{suffix}")
+
 
+def show_leaderboard(conn, show_provisional: bool = True, page_size: int = None, page: int = 1) -> int:
+    """Print one page of the official and provisional leaderboards.
 
-def show_leaderboard(conn, show_provisional: bool = True):
+    Each section is fetched with a single `repo.get_leaderboard` query
+    holding only the requested page. `page_size` defaults to
+    `config.LEADERBOARD_PAGE_SIZE` (0 shows every row); `page` starts at 1.
+    Returns the number of pages in the longest section shown.
+    """
+    if page_size is None:
+        page_size = config.LEADERBOARD_PAGE_SIZE
+    if page < 1:
+        raise ValueError("page must be 1 or more")
+    limit = page_size or None
+    offset = (page - 1) * page_size
     print("\n🏆 Global Leaderboard:")
-    players = repo.list_players(conn)
-
-    official = []
-    provisional = []
-
-    for pid, name, elo_rating, g2_rating, g2_rd, g2_vol in players:
-        # Determine display based on configured rating system
-        if config.RATING_SYSTEM == 'glicko2':
-            # Do not fall back to Elo when G2 is missing — show explicit placeholder.
-            display_str = f"G2: {g2_rating:6.1f}" if g2_rating is not None else "G2:(none)"
-        elif config.RATING_SYSTEM == 'both':
-            # Show both values; use explicit placeholders when missing.
-            elo_part = f'Elo:{elo_rating:6.1f}' if elo_rating is not None else 'Elo:(none)'
-            g2_part = f'G2:{g2_rating:6.1f}' if g2_rating is not None else 'G2:(none)'
-
-            display_str = f"{elo_part} / {g2_part}"
-        else:
-            display_str = f'Elo: {elo_rating:6.1f}' if elo_rating is not None else 'Elo:(none)'
 
-        games_played, wins, draws, losses, last_game = repo.get_player_summary(conn, pid)
-        last_game_str = last_game if last_game else "No games"
-        player_row = (name, display_str, games_played, wins, draws, losses, last_game_str)
-        if games_played >= config.MIN_GAMES_FOR_OFFICIAL:
-            official.append(player_row)
+    official = repo.get_leaderboard(conn, official=True, limit=limit, offset=offset)
+    official_total = official[0][-1] if official else 0
+    pages = _page_count(official_total, page_size)
+    print(f"\n📊 Official Leaderboard (≥ {config.MIN_GAMES_FOR_OFFICIAL} games){_page_label(page, pages)}:")
+    if not official:
+        print("  (No players with enough games yet.)" if page == 1 else "  (No players on this page.)")
+    else:
+        _print_leaderboard_rows(official, offset + 1)
+
+    if show_provisional:
+        provisional = repo.get_leaderboard(conn, official=False, limit=limit, offset=offset)
+        provisional_total = provisional[0][-1] if provisional else 0
+        provisional_pages = _page_count(provisional_total, page_size)
+        pages = max(pages, provisional_pages)
+        print(f"\n🧪 Provisional Players (< {config.MIN_GAMES_FOR_OFFICIAL} games)"
+              f"{_page_label(page, provisional_pages)}:")
+        if not provisional:
+            print("  (No provisional players.)" if page == 1 else "  (No players on this page.)")
         else:
-            provisional.append(player_row)
+            _print_leaderboard_rows(provisional, offset + 1, " (P)")
+    else:
+        hidden = repo.get_leaderboard(conn, official=False, limit=1)
+        if hidden:
+            print(f"\n(ℹ️ {hidden[0][-1]} provisional players hidden. Toggle them ON in the main menu to see them.)")
+    return pages
+
+
+def _page_count(total: int, page_size: int) -> int:
+    if not page_size:
+        return 1
+    return max(1, math.ceil(total / page_size))
+
 
-    heading = f"\n📊 Official Leaderboard (≥ {config.MIN_GAMES_FOR_OFFICIAL} games):"
-    print(heading)
+def _page_label(page: int, pages: int) -> str:
+    return f" — page {page}/{pages}" if pages > 1 else ""
+
+
+def leaderboard_as_of(conn, date, official: bool = None, limit: int = None):
+    """Return the leaderboard at the end of `date` (ISO string or `date`)
+    without replaying anything.
+
+    One `repo.get_leaderboard_as_of` query reads each player's ratings from
+    RatingHistory, so past standings (e.g. the end of a season) cost about as
+    much as the live leaderboard. Rows follow `repo.LEADERBOARD_FIELDS`;
+    raises ValueError for a malformed date.
+    """
+    date = datetime.date.fromisoformat(str(date)).isoformat()
+    return repo.get_leaderboard_as_of(conn, date, official, limit)
+
+
+def show_leaderboard_as_of(conn, date, show_provisional: bool = True, limit: int = None):
+    """Print the official and provisional sections of `leaderboard_as_of`.
+
+    `limit` caps the rows shown per section; each section is its own
+    query so the cap is applied in SQL.
+    """
+    date = datetime.date.fromisoformat(str(date)).isoformat()
+    official = leaderboard_as_of(conn, date, True, limit)
+    print(f"\n🏆 Leaderboard as of {date}:")
+    print(f"\n📊 Official Leaderboard (≥ {config.MIN_GAMES_FOR_OFFICIAL} games):")
     if not official:
         print("  (No players with enough games yet.)")
     else:
-        for name, display_str, games_played, wins, draws, losses, last_game_str in official:
-            print(f"{name:15} {display_str} | Games: {games_played:3d} "
-                  f"| W/D/L: {wins}/{draws}/{losses} | Last game: {last_game_str}")
-
+        _print_leaderboard_rows(official, 1)
     if show_provisional:
         print(f"\n🧪 Provisional Players (< {config.MIN_GAMES_FOR_OFFICIAL} games):")
+        provisional = leaderboard_as_of(conn, date, False, limit)
         if not provisional:
             print("  (No provisional players.)")
         else:
-            for name, display_str, games_played, wins, draws, losses, last_game_str in provisional:
-                print(f"{name:15} {display_str} | Games: {games_played:3d} "
-                      f"| W/D/L: {wins}/{draws}/{losses} | Last game: {last_game_str} (P)")
-    else:
-        if provisional:
-            print(f"\n(ℹ️ {len(provisional)} provisional players hidden. Toggle them ON in the main menu to see them.)")
+            _print_leaderboard_rows(provisional, 1, " (P)")
 
 
-def recompute(conn):
-    """Recompute both Elo and Glicko-2 by replaying matches using
-    the canonical `ratings.compute_match` helper to avoid duplicate logic.
+def _player_rows(states, pids):
+    """Shape in-memory states for `repo.bulk_update_player_ratings`."""
+    rows = []
+    for pid in pids:
+        state = states[pid]
+        rows.append((state.elo, state.g2_rating, state.g2_rd, state.g2_vol,
+                     engine.ordinal_date(state.last_played), state.last_match_id, pid))
+    return rows
+
 
-    This resets player state to defaults and replays matches in date,id order,
-    persisting per-player profile changes and per-match audit columns.
+def _audit_rows(audits):
+    """Shape `engine.replay` audits for `repo.bulk_update_match_audits`."""
+    return [engine.audit_row(audit, match_id) for match_id, audit in audits]
+
+
+def _replay(matches, states, positions=()):
+    """`engine.replay_waves` unless disabled by `config.RECOMPUTE_WAVE_MIN_WIDTH`.
+
+    Both give identical results; waves narrower than the configured width
+    replay match by match. With `config.G2_RATING_PERIOD_DAYS` set, Glicko-2
+    is rated per rating period by `engine.replay_periods` instead.
     """
-    cur = conn.cursor()
-    # reset Elo to default
-    cur.execute("UPDATE Players SET elo = ?", (config.DEFAULT_ELO,))
-    # reset Glicko columns to defaults
-    cur.execute("SELECT id FROM Players")
-    pids = [pid for (pid,) in cur.fetchall()]
-    for pid in pids:
-        cur.execute("UPDATE Players SET g2_rating = ?, g2_rd = ?, g2_vol = ?, last_game_date = NULL, last_game_match_id = NULL WHERE id = ?",
-                    (config.G2_DEFAULT_RATING, config.G2_DEFAULT_RD, config.G2_DEFAULT_VOL, pid))
-    conn.commit()
+    if config.G2_RATING_PERIOD_DAYS:
+        return engine.replay_periods(matches, states, config.G2_RATING_PERIOD_DAYS, positions)
+    min_width = config.RECOMPUTE_WAVE_MIN_WIDTH
+    if min_width:
+        return engine.replay_waves(matches, states, positions, min_width)
+    return engine.replay(matches, states, positions)
 
-    # in-memory counters used for variable-K Elo and last-played dates
-    games_played = {pid: 0 for pid in pids}
-    last_played = {pid: None for pid in pids}
 
-    matches = repo.get_all_matches_ordered(conn)
-    for match_id, p1, p2, result, date_str in matches:
-        # compute using overrides so compute_match doesn't run aggregates
-        out = ratings.compute_match(conn, p1, p2, result, date_str,
-                                    games_played_override_p1=games_played.get(p1, 0),
-                                    games_played_override_p2=games_played.get(p2, 0),
-                                    last_played_override_p1=last_played.get(p1),
-                                    last_played_override_p2=last_played.get(p2))
+def _init_worker(settings):
+    for name, value in settings.items():
+        setattr(config, name, value)
+
+
+def _replay_group(matches, positions):
+    """Replay one group of rated matches from default states.
 
-        # persist via service layer (include result so DB row stores it)
-        service.record_match_result(conn, match_id, p1, p2, out, date_str, result)
+    Returns `(states, audit_rows, checkpoint_rows)` where `checkpoint_rows`
+    holds, per position in `positions`, the group's rows shaped for
+    `repo.add_rating_checkpoint`. Runs in recompute worker processes.
+    """
+    states = {}
+    audits, checkpoints = _replay(matches, states, positions)
+    checkpoint_rows = [[(pid, *state.to_row()) for pid, state in snapshot.items()]
+                       for _, _, snapshot in checkpoints]
+    return states, _audit_rows(audits), checkpoint_rows
 
-        # advance counters
-        games_played[p1] = games_played.get(p1, 0) + 1
-        games_played[p2] = games_played.get(p2, 0) + 1
-        last_played[p1] = date_str
-        last_played[p2] = date_str
 
-    conn.commit()
-    print("✅ Ratings successfully recomputed from all matches using compute_match.")
+def _pack_components(groups, bins: int):
+    """Spread connected components over `bins` lists of similar match counts.
 
+    Largest components are placed first on the lightest bin. Each bin's
+    matches are merged back into (date, id) order.
+    """
+    packed = [[] for _ in range(min(bins, len(groups)))]
+    sizes = [0] * len(packed)
+    for group in groups:
+        lightest = sizes.index(min(sizes))
+        packed[lightest].append(group)
+        sizes[lightest] += len(group)
+    return [list(heapq.merge(*members, key=lambda row: (row[4], row[0]))) for members in packed]
+
+
+def _replay_all(rated, positions):
+    """Replay every rated match, across processes when that pays off.
+
+    Players never connected through a chain of games cannot affect each
+    other's ratings, so with `config.RECOMPUTE_WORKERS` above one (0 means
+    one per CPU) and at least `config.RECOMPUTE_PARALLEL_MIN_MATCHES` rated
+    matches, the match graph is split into connected components that are
+    replayed in a process pool. A single dominant component keeps the
+    replay in-process, where it avoids the cost of shipping rows to workers.
+    Returns the merged `_replay_group` result.
+    """
+    workers = config.RECOMPUTE_WORKERS or os.cpu_count() or 1
+    if workers > 1 and len(rated) >= config.RECOMPUTE_PARALLEL_MIN_MATCHES:
+        bins = _pack_components(engine.partition(rated), workers)
+        if len(bins) > 1 and max(len(b) for b in bins) * 4 <= len(rated) * 3:
+            settings = {name: getattr(config, name) for name in _ENGINE_SETTINGS}
+            with ProcessPoolExecutor(max_workers=len(bins), initializer=_init_worker,
+                                     initargs=(settings,)) as pool:
+                results = list(pool.map(_replay_group, bins, [positions] * len(bins)))
+            states = {}
+            audit_rows = []
+            checkpoint_rows = [[] for _ in positions]
+            for part_states, part_audits, part_checkpoints in results:
+                states.update(part_states)
+                audit_rows.extend(part_audits)
+                for rows, part_rows in zip(checkpoint_rows, part_checkpoints):
+                    rows.extend(part_rows)
+            return states, audit_rows, checkpoint_rows
+    return _replay_group(rated, positions)
+
+
+def _checkpoint_positions(rated):
+    """(date, id) positions to checkpoint every `config.CHECKPOINT_INTERVAL`
+    rated matches, moved to the last match of their rating period when
+    Glicko-2 is rated per period (see `engine.replay_periods`)."""
+    interval = config.CHECKPOINT_INTERVAL
+    if not interval:
+        return []
+    length = config.G2_RATING_PERIOD_DAYS
+    if not length:
+        return [(row[4], row[0]) for row in rated[interval - 1::interval]]
+    positions = []
+    i = interval - 1
+    while i < len(rated):
+        end = engine.period_start(rated[i][4], length)
+        while i + 1 < len(rated) and engine.period_start(rated[i + 1][4], length) == end:
+            i += 1
+        positions.append((rated[i][4], rated[i][0]))
+        i += interval
+    return positions
+
+
+def recompute(conn):
+    """Recompute both Elo and Glicko-2 by replaying every match in memory.
+
+    All players are reset to configured defaults and every rated match is
+    replayed in date,id order (see `_replay`), split across worker
+    processes by connected component on large multi-section databases (see
+    `_replay_all`). Player state lives in memory during the replay, so the
+    match history is read once and no SQL runs inside the loop. Player
+    profiles and per-match audit columns are then written back with
+    `executemany`, RatingHistory and PlayerStats are rebuilt and rating
+    checkpoints are rewritten every `config.CHECKPOINT_INTERVAL` matches
+    (see `_checkpoint_positions`), all in a single unit of work. Scheduled
+    matches (NULL result) are skipped. Returns the number of rated matches
+    replayed.
+    """
+    pids = repo.list_player_ids(conn)
+    matches = repo.get_all_matches_ordered(conn)
+    rated = [row for row in matches if row[3] is not None]
+    positions = _checkpoint_positions(rated)
+    replayed, audit_rows, checkpoint_rows = _replay_all(rated, positions)
+    states = {pid: replayed[pid] if pid in replayed else engine.PlayerState.default() for pid in pids}
+
+    # wins/draws per player for the PlayerStats rebuild (losses are the rest)
+    wins = {}
+    draws = {}
+    for _, p1, p2, result, _ in rated:
+        if result == 0.5:
+            draws[p1] = draws.get(p1, 0) + 1
+            draws[p2] = draws.get(p2, 0) + 1
+        elif result == 1.0:
+            wins[p1] = wins.get(p1, 0) + 1
+        elif result == 0.0:
+            wins[p2] = wins.get(p2, 0) + 1
+    stats_rows = []
+    for pid in pids:
+        state = states[pid]
+        if state.games:
+            w = wins.get(pid, 0)
+            d = draws.get(pid, 0)
+            stats_rows.append((pid, state.games, w, d, state.games - w - d, engine.ordinal_date(state.last_played)))
+
+    with db.UnitOfWork(conn):
+        repo.bulk_update_player_ratings(conn, _player_rows(states, pids))
+        repo.bulk_update_match_audits(conn, audit_rows, history=False)
+        repo.rebuild_rating_history(conn)
+        repo.replace_all_player_stats(conn, stats_rows)
+        repo.delete_all_rating_checkpoints(conn)
+        for (date_str, match_id), rows in zip(positions, checkpoint_rows):
+            repo.add_rating_checkpoint(conn, date_str, match_id, rows)
+    print("✅ Ratings successfully recomputed from all matches.")
+    return len(rated)
+
+
+def _seed_from_history(conn, tail, date: str, match_id: int):
+    """Seed player states for a targeted replay from the stored match history.
+
+    Each player in `tail` starts from the after-values of their last rated
+    match before the (date, id) position (see `repo.get_player_states_before`),
+    which the change being replayed cannot have affected; players without
+    earlier games start from defaults. Raises ValueError when audit data is
+    missing.
+    """
+    pids = {pid for row in tail if row[3] is not None for pid in (row[1], row[2])}
+    return _seed_states(conn, pids, date, match_id)
+
+
+def _seed_states(conn, pids, date: str, match_id: int):
+    """`_seed_from_history` for the given players."""
+    states = {}
+    for pid, state in repo.get_player_states_before(conn, pids, date, match_id).items():
+        if state[0] is None:
+            raise ValueError(f"Missing per-match Elo for player {pid}; full recompute required")
+        if state[1] is None or state[2] is None or state[3] is None:
+            raise ValueError(f"Missing per-match G2 data for player {pid}; full recompute required")
+        states[pid] = engine.PlayerState.from_row(state)
+    return states
+
+
+def recompute_from_position(conn, date: str, match_id: int):
+    """Recompute ratings for every match at or after the (date, id) position.
+
+    Player state is seeded from the nearest rating checkpoint before the
+    position, and only the matches after that checkpoint are read and
+    replayed. Without a checkpoint, state is seeded from the stored results
+    of each player's last match before the position (see
+    `_seed_from_history`). Raises ValueError when no trustworthy seed exists
+    so callers can fall back to a full `recompute`. The writes form one unit
+    of work, joining the caller's when there is one. Returns the number of
+    rated matches replayed.
+
+    When Glicko-2 is rated per period (`config.G2_RATING_PERIOD_DAYS`), a
+    change anywhere in a period affects all of its games, so the replay
+    starts at the first day of the period and checkpoints from there on are
+    dropped.
+    """
+    length = config.G2_RATING_PERIOD_DAYS
+    if length:
+        date = engine.period_start(date, length)
+        match_id = 0
+    checkpoint = repo.get_checkpoint_before(conn, date, match_id)
+    if checkpoint is not None:
+        checkpoint_id, cp_date, cp_match_id = checkpoint
+        states = {row[0]: engine.PlayerState.from_row(row[1:]) for row in repo.get_checkpoint_players(conn, checkpoint_id)}
+        tail = repo.get_matches_from(conn, cp_date, cp_match_id + 1)
+    else:
+        tail = repo.get_matches_from(conn, date, match_id)
+        states = _seed_from_history(conn, tail, date, match_id)
+
+    audits, _ = _replay(tail, states)
+    touched = {pid for row in tail if row[3] is not None for pid in (row[1], row[2])}
+    with db.UnitOfWork(conn):
+        if length:
+            repo.invalidate_checkpoints_from(conn, date, match_id)
+        repo.bulk_update_player_ratings(conn, _player_rows(states, sorted(touched)))
+        repo.bulk_update_match_audits(conn, _audit_rows(audits))
+    return len(audits)
 
 
 def recompute_from_match(conn, match_id: int):
     """Recompute ratings starting from a given match id.
 
-    This function seeds player ratings and games-played counts using any
-    available per-match audit columns (elo_after / g2_after) for matches
-    that occurred before the provided match. If audit data is missing it
-    falls back to defaults and will still compute correctly by replaying
-    forward from the beginning where necessary.
+    See `recompute_from_position`; raises ValueError if the match does not
+    exist or no trustworthy seed state is available. Returns the number of
+    rated matches replayed.
     """
-    cur = conn.cursor()
-
-    # Fetch matches with audit columns in a known order
-    cur.execute(
-        """
-        SELECT id, player1_id, player2_id, result, date,
-               player1_elo_before, player1_elo_after, player2_elo_before, player2_elo_after,
-               player1_g2_rating_before, player1_g2_rating_after,
-               player1_g2_rd_before, player1_g2_rd_after,
-               player1_g2_vol_before, player1_g2_vol_after,
-               player2_g2_rating_before, player2_g2_rating_after,
-               player2_g2_rd_before, player2_g2_rd_after,
-               player2_g2_vol_before, player2_g2_vol_after
-             , player1_last_played_before, player2_last_played_before
-        FROM Matches
-        ORDER BY date, id
-        """
-    )
-    rows = cur.fetchall()
-    if not rows:
-        return
-
-    matches = list(rows)
-    start_idx = None
-    for idx, r in enumerate(matches):
-        if r[0] == match_id:
-            start_idx = idx
-            break
-
-    if start_idx is None:
+    m = repo.get_match(conn, match_id)
+    if not m:
         raise ValueError("Match not found")
-
-    # Compute games_played counts before the changed match
-    games_played = {}
-    # Track last played date per player before the changed match
-    last_played = {}
-    for r in matches[:start_idx]:
-        _, p1, p2 = r[0], r[1], r[2]
-        games_played[p1] = games_played.get(p1, 0) + 1
-        games_played[p2] = games_played.get(p2, 0) + 1
-        # record last played date
-        try:
-            d = r[4]
-            last_played[p1] = d
-            last_played[p2] = d
-        except Exception:
-            pass
-
-    # Temporary in-memory current ratings; prefer recalculated values if present
-    current_elo = {}
-    current_g2 = {}
-    # Temporary in-memory last played dates as we replay matches
-    current_last_played = {}
-
-    # Process matches from the changed one forward, using per-match before values
-    for r in matches[start_idx:]:
-        mid = r[0]
-        p1 = r[1]
-        p2 = r[2]
-        result = r[3]
-
-        p1_elo_before = r[5]
-        p1_elo_after = r[6]
-        p2_elo_before = r[7]
-        p2_elo_after = r[8]
-
-        p1_g_before = r[9]
-        p1_g_after = r[10]
-        p1_g_rd_before = r[11]
-        p1_g_rd_after = r[12]
-        p1_g_vol_before = r[13]
-        p1_g_vol_after = r[14]
-
-        p2_g_before = r[15]
-        p2_g_after = r[16]
-        p2_g_rd_before = r[17]
-        p2_g_rd_after = r[18]
-        p2_g_vol_before = r[19]
-        p2_g_vol_after = r[20]
-        # per-match last-played-before fields (optional)
-        try:
-            p1_last_played_before = r[21]
-        except Exception:
-            p1_last_played_before = None
-        try:
-            p2_last_played_before = r[22]
-        except Exception:
-            p2_last_played_before = None
-
-        # Determine current elo for each player: prefer temp value, otherwise use per-match before if available, else DB
-        if p1 in current_elo:
-            elo1 = current_elo[p1]
-        elif p1_elo_before is not None:
-            elo1 = p1_elo_before
-        else:
-            raise ValueError(f"Missing per-match before Elo for player {p1}; full recompute required")
-
-        if p2 in current_elo:
-            elo2 = current_elo[p2]
-        elif p2_elo_before is not None:
-            elo2 = p2_elo_before
-        else:
-            raise ValueError(f"Missing per-match before Elo for player {p2}; full recompute required")
-
-        g1 = games_played.get(p1, 0)
-        g2 = games_played.get(p2, 0)
-
-        k1 = elo.k_factor(g1)
-        k2 = elo.k_factor(g2)
-
-        new_elo1, new_elo2 = ratings.compute_elo_change(elo1, elo2, g1, g2, result)
-
-        # persist and update temp map (single update per player)
-        repo.update_player_profile(conn, p1, elo=new_elo1)
-        repo.update_player_profile(conn, p2, elo=new_elo2)
-        current_elo[p1] = new_elo1
-        current_elo[p2] = new_elo2
-
-        try:
-            repo.update_match_elos(conn, mid, elo1, new_elo1, elo2, new_elo2)
-        except Exception:
-            pass
-
-        # Glicko: require full per-match before-values (rating, rd, vol)
-        if p1 in current_g2:
-            r1, rd1, vol1 = current_g2[p1]
-        elif (p1_g_before is not None) and (p1_g_rd_before is not None) and (p1_g_vol_before is not None):
-            r1 = p1_g_before
-            rd1 = p1_g_rd_before
-            vol1 = p1_g_vol_before
-        else:
-            raise ValueError(f"Missing per-match before G2 data for player {p1}; full recompute required")
-
-        if p2 in current_g2:
-            r2, rd2, vol2 = current_g2[p2]
-        elif (p2_g_before is not None) and (p2_g_rd_before is not None) and (p2_g_vol_before is not None):
-            r2 = p2_g_before
-            rd2 = p2_g_rd_before
-            vol2 = p2_g_vol_before
-        else:
-            raise ValueError(f"Missing per-match before G2 data for player {p2}; full recompute required")
-
-        # compute days since last played for each player
-        days1 = 0
-        days2 = 0
-        try:
-            from datetime import date as _date
-            md = _date.fromisoformat(r[4])
-            # Determine last-played candidate for each player in order of preference:
-            # 1) current_last_played (replayed matches in this session)
-            # 2) per-match last_played_before (stored on audit)
-            # 3) last_played map built from matches before start_idx
-            last1 = None
-            last2 = None
-            if current_last_played.get(p1):
-                last1 = current_last_played.get(p1)
-            elif p1_last_played_before:
-                last1 = p1_last_played_before
-            else:
-                last1 = last_played.get(p1)
-
-            if current_last_played.get(p2):
-                last2 = current_last_played.get(p2)
-            elif p2_last_played_before:
-                last2 = p2_last_played_before
-            else:
-                last2 = last_played.get(p2)
-
-            if last1:
-                days1 = (md - _date.fromisoformat(last1)).days
-                if days1 < 0:
-                    days1 = 0
-            if last2:
-                days2 = (md - _date.fromisoformat(last2)).days
-                if days2 < 0:
-                    days2 = 0
-        except Exception:
-            days1 = 0
-            days2 = 0
-
-        new_r1, new_rd1, new_vol1 = glicko2.glicko2_update(r1, rd1, vol1, r2, rd2, vol2, result, days=days1)
-        new_r2, new_rd2, new_vol2 = glicko2.glicko2_update(r2, rd2, vol2, r1, rd1, vol1, 1 - result, days=days2)
-
-        # persist Glicko + last-game together
-        d = r[4]
-        repo.update_player_profile(conn, p1,
-                                   g2_rating=new_r1, g2_rd=new_rd1, g2_vol=new_vol1,
-                                   last_game_date=d, last_game_match_id=mid)
-        repo.update_player_profile(conn, p2,
-                                   g2_rating=new_r2, g2_rd=new_rd2, g2_vol=new_vol2,
-                                   last_game_date=d, last_game_match_id=mid)
-        current_g2[p1] = (new_r1, new_rd1, new_vol1)
-        current_g2[p2] = (new_r2, new_rd2, new_vol2)
-        # update current_last_played for replayed matches
-        try:
-            d = r[4]
-            current_last_played[p1] = d
-            current_last_played[p2] = d
-        except Exception:
-            pass
-
-        try:
-            repo.update_match_glicko(conn, mid, r1, new_r1, p1_g_rd_before, new_rd1, p1_g_vol_before, new_vol1,
-                                     r2, new_r2, p2_g_rd_before, new_rd2, p2_g_vol_before, new_vol2)
-        except Exception:
-            pass
-
-        games_played[p1] = games_played.get(p1, 0) + 1
-        games_played[p2] = games_played.get(p2, 0) + 1
-        # update last_played
-        try:
-            d = r[4]
-            last_played[p1] = d
-            last_played[p2] = d
-        except Exception:
-            pass
-
-    conn.commit()
+    replayed = recompute_from_position(conn, m[5], match_id)
     print(f"✅ Ratings recomputed from match {match_id} onwards.")
+    return replayed
+
+
+def recompute_after_removal(conn, removed):
+    """Replay only the games affected by removing a player's games.
+
+    `removed` maps each remaining opponent to the (date, id) position of
+    their first removed rated game, as returned by `repo.delete_player`.
+    A player joins the replay at that position, or at their first later
+    game against a player already in it; every game from then on is
+    replayed, and games between players who have not joined keep their
+    stored ratings. Each player is seeded from the after-values of their
+    last game before joining (see `_seed_from_history`). With Glicko-2
+    rating periods this is `recompute_from_position` from the first
+    removed game. Raises ValueError when audit data is missing so callers
+    can fall back to a full `recompute`. Returns the number of rated
+    matches replayed.
+    """
+    if not removed:
+        return 0
+    start = min(removed.values())
+    if config.G2_RATING_PERIOD_DAYS:
+        return recompute_from_position(conn, *start)
+
+    pending = sorted((position, pid) for pid, position in removed.items())
+    joined = {}
+    replay = []
+    k = 0
+    for row in repo.get_matches_from(conn, *start):
+        if row[3] is None:
+            continue
+        position = (row[4], row[0])
+        while k < len(pending) and pending[k][0] < position:
+            joined.setdefault(pending[k][1], pending[k][0])
+            k += 1
+        if row[1] in joined or row[2] in joined:
+            joined.setdefault(row[1], position)
+            joined.setdefault(row[2], position)
+            replay.append(row)
+    for position, pid in pending[k:]:
+        joined.setdefault(pid, position)
+
+    by_position = {}
+    for pid, position in joined.items():
+        by_position.setdefault(position, []).append(pid)
+    states = {}
+    for position, pids in by_position.items():
+        states.update(_seed_states(conn, pids, *position))
+    for pid in joined:
+        states.setdefault(pid, engine.PlayerState.default())
+
+    audits, _ = _replay(replay, states)
+    with db.UnitOfWork(conn):
+        repo.bulk_update_player_ratings(conn, _player_rows(states, sorted(joined)))
+        repo.bulk_update_match_audits(conn, _audit_rows(audits))
+    return len(audits)
@@ -1,14 +1,64 @@
+"""Database query wrappers.
 
+Repo functions never commit: they take part in the caller's transaction,
+which business operations open with `db.UnitOfWork` so each operation ends
+in exactly one commit (or a rollback).
+
+Single-player reads (`get_player`, `get_player_glicko`,
+`get_player_rating_states`) go through the connection's `player_cache` when
+it has one (see `chess_club.cache`); every function here that writes a
+Players or PlayerStats row drops the affected entries.
+"""
 from typing import List, Dict, Optional
 import chess_club.config as config
 
+# Per-match audit columns, in `bulk_update_match_audits` order
+MATCH_AUDIT_COLUMNS = (
+    "player1_elo_before", "player1_elo_after",
+    "player2_elo_before", "player2_elo_after",
+    "player1_g2_rating_before", "player1_g2_rating_after",
+    "player1_g2_rd_before", "player1_g2_rd_after",
+    "player1_g2_vol_before", "player1_g2_vol_after",
+    "player2_g2_rating_before", "player2_g2_rating_after",
+    "player2_g2_rd_before", "player2_g2_rd_after",
+    "player2_g2_vol_before", "player2_g2_vol_after",
+    "player1_last_played_before", "player2_last_played_before",
+)
+
+# Row layout of `iter_match_history`
+MATCH_HISTORY_FIELDS = (
+    "id", "tournament", "date", "player1_id", "player1", "player2_id", "player2", "result",
+    *MATCH_AUDIT_COLUMNS,
+)
+
+# Row layout of `get_leaderboard` (before `total`) and `iter_leaderboard`
+LEADERBOARD_FIELDS = (
+    "id", "name", "elo", "g2_rating", "g2_rd", "g2_vol", "games", "wins", "draws", "losses",
+    "last_game", "official",
+)
+
+# Row layout of `list_rating_history` (and the keys of `rating_as_of`)
+RATING_HISTORY_FIELDS = (
+    "date", "match_id", "elo", "g2_rating", "g2_rd", "g2_vol", "score", "games", "wins", "draws",
+)
+
+
+def _iter_rows(cur, chunk_size: int = None):
+    """Yield an executed cursor's rows, fetched `chunk_size` at a time
+    (default `config.EXPORT_CHUNK_ROWS`)."""
+    size = chunk_size or config.EXPORT_CHUNK_ROWS
+    while True:
+        rows = cur.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
 
 def add_player(conn, name: str, elo: float = None) -> int:
     if elo is None:
         elo = config.DEFAULT_ELO
     cur = conn.cursor()
     cur.execute("INSERT INTO Players (name, elo) VALUES (?, ?)", (name, elo))
-    conn.commit()
     return cur.lastrowid
 
 
@@ -25,13 +75,157 @@ def list_players(conn) -> List[Dict]:
     return cur.fetchall()
 
 
-def get_player(conn, player_id: int) -> Optional[Dict]:
+def get_leaderboard(conn, official: bool = None, limit: int = None, offset: int = 0):
+    """Return one page of leaderboard rows in a single statement.
+
+    Rows are `(id, name, elo, g2_rating, g2_rd, g2_vol, games, wins, draws,
+    losses, last_game, official, total)`, ordered by the configured
+    `RATING_SYSTEM` (Glicko-2 rating for 'glicko2', Elo otherwise) with
+    unrated players last. `official` is true for players with at least
+    `config.MIN_GAMES_FOR_OFFICIAL` games; pass True/False to keep only
+    that section. `total` counts every row matching the filter, so callers
+    can page without a separate count query. `limit=None` returns all rows.
+    """
+    sql, params = _leaderboard_query(official, total=True)
+    cur = conn.cursor()
+    cur.execute(sql + " LIMIT ? OFFSET ?", params + [-1 if limit is None else limit, offset])
+    return [(*row[:11], bool(row[11]), row[12]) for row in cur.fetchall()]
+
+
+def iter_leaderboard(conn, official: bool = None, chunk_size: int = None):
+    """Yield every leaderboard row in `get_leaderboard` order, without `total`.
+
+    Rows are fetched in chunks (see `_iter_rows`), so memory use does not
+    depend on the number of players.
+    """
+    sql, params = _leaderboard_query(official, total=False)
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    for row in _iter_rows(cur, chunk_size):
+        yield (*row[:11], bool(row[11]))
+
+
+def _leaderboard_query(official, total: bool):
+    """SQL and parameters shared by `get_leaderboard` and `iter_leaderboard`."""
+    order_by = "p.g2_rating" if config.RATING_SYSTEM == 'glicko2' else "p.elo"
+    where = ""
+    params = [config.MIN_GAMES_FOR_OFFICIAL]
+    if official is not None:
+        where = "WHERE (COALESCE(s.games, 0) >= ?) = ?"
+        params += [config.MIN_GAMES_FOR_OFFICIAL, bool(official)]
+    sql = f"""
+        SELECT p.id, p.name, p.elo, p.g2_rating, p.g2_rd, p.g2_vol,
+               COALESCE(s.games, 0), COALESCE(s.wins, 0), COALESCE(s.draws, 0),
+               COALESCE(s.losses, 0), s.last_game,
+               COALESCE(s.games, 0) >= ?{", COUNT(*) OVER ()" if total else ""}
+        FROM Players p LEFT JOIN PlayerStats s ON s.player_id = p.id
+        {where}
+        ORDER BY {order_by} IS NULL, {order_by} DESC, p.id
+        """
+    return sql, params
+
+
+def get_leaderboard_as_of(conn, date: str, official: bool = None, limit: int = None):
+    """Return the leaderboard as it stood at the end of `date`, in one query.
+
+    Rows follow `LEADERBOARD_FIELDS` and `get_leaderboard` ordering. Each
+    player's ratings and running W/D/L come from their last RatingHistory
+    row on or before the date, one primary-key seek per player, so the cost
+    does not grow with the match history. Players with no rated game by
+    then get the configured defaults, as a replay would give them.
+    `official` filters like `get_leaderboard`; `limit=None` returns all rows.
+    """
+    order_by = "g2_rating" if config.RATING_SYSTEM == 'glicko2' else "elo"
+    params = [config.DEFAULT_ELO, config.G2_DEFAULT_RATING, config.G2_DEFAULT_RD, config.G2_DEFAULT_VOL,
+              config.MIN_GAMES_FOR_OFFICIAL, date]
+    where = ""
+    if official is not None:
+        where = "WHERE official = ?"
+        params.append(bool(official))
+    params.append(-1 if limit is None else limit)
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        WITH board AS (
+            SELECT p.id, p.name,
+                   COALESCE(h.elo, ?) AS elo, COALESCE(h.g2_rating, ?) AS g2_rating,
+                   COALESCE(h.g2_rd, ?) AS g2_rd, COALESCE(h.g2_vol, ?) AS g2_vol,
+                   COALESCE(h.games, 0) AS games, COALESCE(h.wins, 0) AS wins,
+                   COALESCE(h.draws, 0) AS draws,
+                   COALESCE(h.games - h.wins - h.draws, 0) AS losses,
+                   h.date AS last_game,
+                   COALESCE(h.games, 0) >= ? AS official
+            FROM Players p
+            LEFT JOIN RatingHistory h ON h.player_id = p.id AND (h.date, h.match_id) = (
+                SELECT date, match_id FROM RatingHistory
+                WHERE player_id = p.id AND date <= ?
+                ORDER BY date DESC, match_id DESC
+                LIMIT 1
+            )
+        )
+        SELECT * FROM board
+        {where}
+        ORDER BY {order_by} IS NULL, {order_by} DESC, id
+        LIMIT ?
+        """,
+        params,
+    )
+    return [(*row[:11], bool(row[11])) for row in cur.fetchall()]
+
+
+def _load_player_rows(conn, player_ids):
+    """Fetch `{player_id: (id, name, elo, g2_rating, g2_rd, g2_vol,
+    last_game_date, last_game_match_id, games)}` for existing players.
+    """
+    ids = sorted(set(player_ids))
+    out = {}
     cur = conn.cursor()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(
+            f"""
+            SELECT p.id, p.name, p.elo, p.g2_rating, p.g2_rd, p.g2_vol,
+                   p.last_game_date, p.last_game_match_id, COALESCE(s.games, 0)
+            FROM Players p LEFT JOIN PlayerStats s ON s.player_id = p.id
+            WHERE p.id IN ({marks})
+            """,
+            chunk,
+        )
+        for row in cur.fetchall():
+            out[row[0]] = row
+    return out
+
+
+def _player_rows(conn, player_ids):
+    """`_load_player_rows` served from the connection's player cache."""
+    player_cache = getattr(conn, "player_cache", None)
+    if player_cache is None:
+        return _load_player_rows(conn, player_ids)
+    return player_cache.lookup(conn, player_ids, _load_player_rows)
+
+
+def _invalidate_players(conn, player_ids):
+    """Drop cached rows for players this connection just wrote."""
+    player_cache = getattr(conn, "player_cache", None)
+    if player_cache is not None:
+        player_cache.invalidate(player_ids)
+
+
+def _clear_player_cache(conn):
+    player_cache = getattr(conn, "player_cache", None)
+    if player_cache is not None:
+        player_cache.clear()
+
+
+def get_player(conn, player_id: int) -> Optional[Dict]:
     # Include last_game_date to avoid expensive aggregate queries when callers
     # need the last-played timestamp. Keep `elo` at index 2 for backward
     # compatibility with existing call sites.
-    cur.execute("SELECT id, name, elo, last_game_date FROM Players WHERE id = ?", (player_id,))
-    return cur.fetchone()
+    row = _player_rows(conn, [player_id]).get(player_id)
+    if row:
+        return (*row[:3], row[6])
+    return None
 
 
 def update_player_profile(conn, player_id: int, elo: float = None,
@@ -56,16 +250,15 @@ def update_player_profile(conn, player_id: int, elo: float = None,
             """,
             (elo, g2_rating, g2_rd, g2_vol, last_game_date, last_game_match_id, player_id)
         )
-        conn.commit()
     except Exception:
         # Best-effort: ignore if columns don't exist or other DB issues
         pass
+    _invalidate_players(conn, [player_id])
 
 
 def add_tournament(conn, name: str, date: str) -> int:
     cur = conn.cursor()
     cur.execute("INSERT INTO Tournaments (name, date) VALUES (?, ?)", (name, date))
-    conn.commit()
     return cur.lastrowid
 
 
@@ -85,7 +278,6 @@ def is_tournament_completed(conn, tournament_id: int) -> bool:
 def update_tournament(conn, tournament_id: int, name: str, date: str):
     cur = conn.cursor()
     cur.execute("UPDATE Tournaments SET name = ?, date = ? WHERE id = ?", (name, date, tournament_id))
-    conn.commit()
 
 
 def count_matches_for_tournament(conn, tournament_id: int) -> int:
@@ -96,25 +288,32 @@ def count_matches_for_tournament(conn, tournament_id: int) -> int:
 
 def delete_tournament(conn, tournament_id: int):
     cur = conn.cursor()
-    # remove tournament players registrations
-    cur.execute("DELETE FROM TournamentPlayers WHERE tournament_id = ?", (tournament_id,))
-    # remove matches belonging to tournament
-    cur.execute("DELETE FROM Matches WHERE tournament_id = ?", (tournament_id,))
-    # remove the tournament row
+    # players whose stats change once the tournament's games are gone
+    cur.execute(
+        "SELECT player1_id FROM Matches WHERE tournament_id = ? UNION SELECT player2_id FROM Matches WHERE tournament_id = ?",
+        (tournament_id, tournament_id)
+    )
+    affected = [pid for (pid,) in cur.fetchall()]
+    cur.execute(
+        "SELECT date, id FROM Matches WHERE tournament_id = ? AND result IS NOT NULL ORDER BY date, id LIMIT 1",
+        (tournament_id,)
+    )
+    first_rated = cur.fetchone()
+    # registrations and matches go with the tournament row (ON DELETE CASCADE)
     cur.execute("DELETE FROM Tournaments WHERE id = ?", (tournament_id,))
-    conn.commit()
+    refresh_player_stats(conn, affected)
+    if first_rated:
+        invalidate_checkpoints_from(conn, *first_rated)
 
 
 def complete_tournament(conn, tournament_id: int):
     cur = conn.cursor()
     cur.execute("UPDATE Tournaments SET completed = 1 WHERE id = ?", (tournament_id,))
-    conn.commit()
 
 
 def reopen_tournament(conn, tournament_id: int):
     cur = conn.cursor()
     cur.execute("UPDATE Tournaments SET completed = 0 WHERE id = ?", (tournament_id,))
-    conn.commit()
 
 
 def list_tournaments(conn):
@@ -129,7 +328,37 @@ def add_tournament_player(conn, tournament_id: int, player_id: int):
     if is_tournament_completed(conn, tournament_id):
         raise ValueError("Tournament is completed")
     cur.execute("INSERT INTO TournamentPlayers (tournament_id, player_id) VALUES (?, ?)", (tournament_id, player_id))
-    conn.commit()
+
+
+def get_tournament_pairings(conn, tournament_id: int):
+    """Return `(player1_id, player2_id, result)` for every match of a
+    tournament in the order they were created, read from the covering
+    `idx_matches_tournament_pairs` index.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT player1_id, player2_id, result FROM Matches WHERE tournament_id = ? ORDER BY id",
+        (tournament_id,)
+    )
+    return cur.fetchall()
+
+
+def add_tournament_bye(conn, tournament_id: int, player_id: int):
+    """Count a bye for a registered player (scored as a win in Swiss standings)."""
+    conn.cursor().execute(
+        "UPDATE TournamentPlayers SET byes = byes + 1 WHERE tournament_id = ? AND player_id = ?",
+        (tournament_id, player_id)
+    )
+
+
+def get_tournament_byes(conn, tournament_id: int):
+    """Return `{player_id: byes}` for the players of a tournament who had a bye."""
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT player_id, byes FROM TournamentPlayers WHERE tournament_id = ? AND byes > 0",
+        (tournament_id,)
+    )
+    return dict(cur.fetchall())
 
 
 def get_tournament_players(conn, tournament_id: int):
@@ -142,28 +371,54 @@ def get_tournament_players(conn, tournament_id: int):
 
 
 def games_played_for_player(conn, player_id: int) -> int:
+    """Return the number of rated games (non-NULL result) for a player."""
     cur = conn.cursor()
-    cur.execute(
-        "SELECT COUNT(*) FROM Matches WHERE player1_id = ? OR player2_id = ?",
-        (player_id, player_id)
-    )
-    return cur.fetchone()[0]
+    cur.execute("SELECT games FROM PlayerStats WHERE player_id = ?", (player_id,))
+    row = cur.fetchone()
+    return row[0] if row else 0
 
 
 def delete_player(conn, player_id: int):
     """Remove a player and all their associations from the database.
 
-    This deletes tournament registrations for the player, any matches where
-    they participated, and finally the player row itself.
+    Deleting the player row cascades to their tournament registrations,
+    any matches where they participated and their PlayerStats row.
+    Opponents' PlayerStats rows are rebuilt without the removed games.
+    Returns `{opponent_id: (date, match_id)}`, the position of each
+    opponent's first removed rated game, for a targeted recompute (see
+    `ranking.recompute_after_removal`).
     """
     cur = conn.cursor()
-    # remove tournament registrations
-    cur.execute("DELETE FROM TournamentPlayers WHERE player_id = ?", (player_id,))
-    # remove matches involving the player
-    cur.execute("DELETE FROM Matches WHERE player1_id = ? OR player2_id = ?", (player_id, player_id))
-    # remove the player row
+    # opponents whose stats change once the shared games are gone
+    cur.execute(
+        "SELECT player2_id FROM Matches WHERE player1_id = ? UNION SELECT player1_id FROM Matches WHERE player2_id = ?",
+        (player_id, player_id)
+    )
+    opponents = [pid for (pid,) in cur.fetchall() if pid != player_id]
+    cur.execute(
+        """
+        SELECT opponent, date, id FROM (
+            SELECT player2_id AS opponent, date, id FROM Matches WHERE player1_id = ? AND result IS NOT NULL
+            UNION ALL
+            SELECT player1_id, date, id FROM Matches WHERE player2_id = ? AND result IS NOT NULL
+        )
+        ORDER BY date, id
+        """,
+        (player_id, player_id)
+    )
+    rated = cur.fetchall()
+    first_removed = {}
+    for opponent, date, match_id in rated:
+        if opponent != player_id:
+            first_removed.setdefault(opponent, (date, match_id))
+    # registrations, matches and stats go with the player row (ON DELETE CASCADE)
     cur.execute("DELETE FROM Players WHERE id = ?", (player_id,))
-    conn.commit()
+    _invalidate_players(conn, [player_id])
+    refresh_player_stats(conn, opponents)
+    if rated:
+        invalidate_checkpoints_from(conn, *rated[0][1:])
+        _refresh_rating_history(conn, dict.fromkeys(opponents, rated[0][1]))
+    return first_removed
 
 
 def insert_match(conn, tournament_id: int, p1: int, p2: int, result: float, date: str) -> int:
@@ -175,8 +430,9 @@ def insert_match(conn, tournament_id: int, p1: int, p2: int, result: float, date
         "INSERT INTO Matches (tournament_id, player1_id, player2_id, result, date) VALUES (?, ?, ?, ?, ?)",
         (tournament_id, p1, p2, result, date)
     )
-    conn.commit()
-    return cur.lastrowid
+    match_id = cur.lastrowid
+    _sync_derived_tables(conn, match_id, p1, p2, None, None, result, date)
+    return match_id
 
 
 def create_match(conn, tournament_id: int, p1: int, p2: int, date: str, result: float = None) -> int:
@@ -193,8 +449,9 @@ def create_match(conn, tournament_id: int, p1: int, p2: int, date: str, result:
         "INSERT INTO Matches (tournament_id, player1_id, player2_id, result, date) VALUES (?, ?, ?, ?, ?)",
         (tournament_id, p1, p2, result, date)
     )
-    conn.commit()
-    return cur.lastrowid
+    match_id = cur.lastrowid
+    _sync_derived_tables(conn, match_id, p1, p2, None, None, result, date)
+    return match_id
 
 
 def update_match_result(conn, match_id: int, result: float, date: str = None):
@@ -208,15 +465,6 @@ def update_match_result(conn, match_id: int, result: float, date: str = None):
     update_match_row(conn, match_id, result, date)
     return get_match(conn, match_id)
 
-    # ensure players reference this match as last_game_match_id
-    try:
-        update_player_profile(conn, p1, last_game_match_id=match_id)
-        update_player_profile(conn, p2, last_game_match_id=match_id)
-    except Exception:
-        pass
-
-    return out
-
 
 def insert_match_with_elos(conn, tournament_id: int, p1: int, p2: int, result: float, date: str,
                  p1_elo_before: float = None, p1_elo_after: float = None,
@@ -250,8 +498,9 @@ def insert_match_with_elos(conn, tournament_id: int, p1: int, p2: int, result: f
             p1_last_played_before, p2_last_played_before
         )
     )
-    conn.commit()
-    return cur.lastrowid
+    match_id = cur.lastrowid
+    _sync_derived_tables(conn, match_id, p1, p2, None, None, result, date)
+    return match_id
 
 
 def update_match_elos(conn, match_id: int, p1_elo_before: float, p1_elo_after: float,
@@ -266,47 +515,555 @@ def update_match_elos(conn, match_id: int, p1_elo_before: float, p1_elo_after: f
         """,
         (p1_elo_before, p1_elo_after, p2_elo_before, p2_elo_after, match_id)
     )
-    conn.commit()
+
+
+_TOURNAMENT_MATCHES_SQL = """
+    SELECT m.id, p1.name, p2.name, m.result, m.date,
+           m.player1_elo_before, m.player1_elo_after,
+           m.player2_elo_before, m.player2_elo_after,
+           m.player1_g2_rating_before, m.player1_g2_rating_after,
+           m.player2_g2_rating_before, m.player2_g2_rating_after
+    FROM Matches m
+    JOIN Players p1 ON m.player1_id = p1.id
+    JOIN Players p2 ON m.player2_id = p2.id
+    WHERE m.tournament_id = ?
+    ORDER BY m.id
+"""
 
 
 def list_matches_for_tournament(conn, tournament_id: int):
+    cur = conn.cursor()
+    cur.execute(_TOURNAMENT_MATCHES_SQL, (tournament_id,))
+    return cur.fetchall()
+
+
+def iter_matches_for_tournament(conn, tournament_id: int, chunk_size: int = None):
+    """Yield `list_matches_for_tournament` rows, fetched in chunks."""
+    cur = conn.cursor()
+    cur.execute(_TOURNAMENT_MATCHES_SQL, (tournament_id,))
+    yield from _iter_rows(cur, chunk_size)
+
+
+def delete_match(conn, match_id: int):
+    cur = conn.cursor()
+    cur.execute("SELECT player1_id, player2_id, result, date FROM Matches WHERE id = ?", (match_id,))
+    row = cur.fetchone()
+    cur.execute("DELETE FROM Matches WHERE id = ?", (match_id,))
+    if row and row[2] is not None:
+        refresh_player_stats(conn, [row[0], row[1]])
+        invalidate_checkpoints_from(conn, row[3], match_id)
+        _refresh_rating_history(conn, {row[0]: row[3], row[1]: row[3]})
+
+
+def get_all_matches_ordered(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT id, player1_id, player2_id, result, date FROM Matches ORDER BY date, id")
+    return cur.fetchall()
+
+
+def iter_matches_ordered(conn, chunk_size: int = None):
+    """Yield `get_all_matches_ordered` rows, fetched in chunks."""
+    cur = conn.cursor()
+    cur.execute("SELECT id, player1_id, player2_id, result, date FROM Matches ORDER BY date, id")
+    yield from _iter_rows(cur, chunk_size)
+
+
+def iter_match_history(conn, chunk_size: int = None):
+    """Yield every match in (date, id) order with names and audit columns.
+
+    Rows follow `MATCH_HISTORY_FIELDS` and are fetched in chunks, so an
+    export of the full history runs in constant memory.
+    """
+    audits = ", ".join(f"m.{name}" for name in MATCH_AUDIT_COLUMNS)
     cur = conn.cursor()
     cur.execute(
-        """
-        SELECT m.id, p1.name, p2.name, m.result, m.date,
-               m.player1_elo_before, m.player1_elo_after,
-               m.player2_elo_before, m.player2_elo_after,
-               m.player1_g2_rating_before, m.player1_g2_rating_after,
-               m.player2_g2_rating_before, m.player2_g2_rating_after
+        f"""
+        SELECT m.id, t.name, m.date, m.player1_id, p1.name, m.player2_id, p2.name, m.result, {audits}
         FROM Matches m
         JOIN Players p1 ON m.player1_id = p1.id
         JOIN Players p2 ON m.player2_id = p2.id
-        WHERE m.tournament_id = ?
-        ORDER BY m.id
+        LEFT JOIN Tournaments t ON m.tournament_id = t.id
+        ORDER BY m.date, m.id
+        """
+    )
+    yield from _iter_rows(cur, chunk_size)
+
+
+def list_player_ids(conn) -> List[int]:
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM Players ORDER BY id")
+    return [pid for (pid,) in cur.fetchall()]
+
+
+def bulk_update_player_ratings(conn, rows):
+    """Overwrite rating and last-game fields for many players at once.
+
+    `rows` are `(elo, g2_rating, g2_rd, g2_vol, last_game_date,
+    last_game_match_id, player_id)` tuples. Unlike `update_player_profile`
+    every value is written as given (None clears the column).
+    """
+    rows = list(rows)
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        UPDATE Players SET
+            elo = ?, g2_rating = ?, g2_rd = ?, g2_vol = ?,
+            last_game_date = ?, last_game_match_id = ?
+        WHERE id = ?
         """,
-        (tournament_id,)
+        rows,
+    )
+    _invalidate_players(conn, [row[-1] for row in rows])
+
+
+def bulk_update_match_audits(conn, rows, history: bool = True):
+    """Write per-match Elo/Glicko-2 audit columns for many matches at once.
+
+    `rows` follow the column order of the UPDATE below, ending with the
+    match id. The matches' RatingHistory rows are rewritten from the new
+    after-values in the same transaction; pass `history=False` when the
+    caller rebuilds the whole table with `rebuild_rating_history` instead.
+    """
+    rows = list(rows)
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        UPDATE Matches SET
+            player1_elo_before = ?, player1_elo_after = ?,
+            player2_elo_before = ?, player2_elo_after = ?,
+            player1_g2_rating_before = ?, player1_g2_rating_after = ?,
+            player1_g2_rd_before = ?, player1_g2_rd_after = ?,
+            player1_g2_vol_before = ?, player1_g2_vol_after = ?,
+            player2_g2_rating_before = ?, player2_g2_rating_after = ?,
+            player2_g2_rd_before = ?, player2_g2_rd_after = ?,
+            player2_g2_vol_before = ?, player2_g2_vol_after = ?,
+            player1_last_played_before = ?, player2_last_played_before = ?
+        WHERE id = ?
+        """,
+        rows,
+    )
+    if history:
+        _write_rating_history(conn, [row[-1] for row in rows])
+
+
+def _write_rating_history(conn, match_ids):
+    """Bring the RatingHistory rows of `match_ids` in line with their audit
+    columns. Each player involved has their history refreshed from the
+    earlier of the match's old and new dates (see `_refresh_rating_history`).
+    """
+    ids = sorted(set(match_ids))
+    starts = {}
+    cur = conn.cursor()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(
+            f"""
+            SELECT player_id, MIN(date) FROM (
+                SELECT player_id, date FROM RatingHistory WHERE match_id IN ({marks})
+                UNION ALL
+                SELECT player1_id, date FROM Matches WHERE id IN ({marks})
+                UNION ALL
+                SELECT player2_id, date FROM Matches WHERE id IN ({marks})
+            )
+            GROUP BY player_id
+            """,
+            chunk * 3,
+        )
+        for pid, date in cur.fetchall():
+            if pid not in starts or date < starts[pid]:
+                starts[pid] = date
+    _refresh_rating_history(conn, starts)
+
+
+def _refresh_rating_history(conn, starts):
+    """Rewrite RatingHistory from the match audit columns.
+
+    `starts` maps player ids to the first date whose rows may be stale; each
+    player's rows from that date on are replaced, with `games`/`wins`/
+    `draws` continuing from their last row before it.
+    """
+    items = sorted(starts.items())
+    cur = conn.cursor()
+    for start in range(0, len(items), 500):
+        chunk = items[start:start + 500]
+        cur.executemany("DELETE FROM RatingHistory WHERE player_id = ? AND date >= ?", chunk)
+        values = ", ".join("(?, ?)" for _ in chunk)
+        cur.execute(
+            f"""
+            WITH starts(player_id, date) AS (VALUES {values}),
+            base AS (
+                SELECT s.player_id, COALESCE(b.games, 0) AS games,
+                       COALESCE(b.wins, 0) AS wins, COALESCE(b.draws, 0) AS draws
+                FROM starts s
+                LEFT JOIN RatingHistory b ON b.player_id = s.player_id AND (b.date, b.match_id) = (
+                    SELECT date, match_id FROM RatingHistory
+                    WHERE player_id = s.player_id AND date < s.date
+                    ORDER BY date DESC, match_id DESC
+                    LIMIT 1
+                )
+            ),
+            sides AS (
+                SELECT s.player_id, m.date, m.id AS match_id, m.player1_elo_after AS elo,
+                       m.player1_g2_rating_after AS g2_rating, m.player1_g2_rd_after AS g2_rd,
+                       m.player1_g2_vol_after AS g2_vol, m.result AS score
+                FROM starts s JOIN Matches m ON m.player1_id = s.player_id AND m.date >= s.date
+                WHERE m.result IS NOT NULL AND m.player1_elo_after IS NOT NULL
+                UNION ALL
+                SELECT s.player_id, m.date, m.id, m.player2_elo_after, m.player2_g2_rating_after,
+                       m.player2_g2_rd_after, m.player2_g2_vol_after, 1.0 - m.result
+                FROM starts s JOIN Matches m ON m.player2_id = s.player_id AND m.date >= s.date
+                WHERE m.result IS NOT NULL AND m.player2_elo_after IS NOT NULL
+            )
+            INSERT OR REPLACE INTO RatingHistory
+                (player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol, score, games, wins, draws)
+            SELECT r.player_id, r.date, r.match_id, r.elo, r.g2_rating, r.g2_rd, r.g2_vol, r.score,
+                   b.games + COUNT(*) OVER w,
+                   b.wins + SUM(CASE WHEN r.score = 1.0 THEN 1 ELSE 0 END) OVER w,
+                   b.draws + SUM(CASE WHEN r.score = 0.5 THEN 1 ELSE 0 END) OVER w
+            FROM sides r JOIN base b ON b.player_id = r.player_id
+            WINDOW w AS (PARTITION BY r.player_id ORDER BY r.date, r.match_id)
+            ORDER BY r.player_id, r.date, r.match_id
+            """,
+            [value for item in chunk for value in item],
+        )
+
+
+def rebuild_rating_history(conn):
+    """Rebuild RatingHistory from every match's audit columns (full recompute).
+
+    One statement numbers each player's rows with a window over the match
+    history and inserts them in primary-key order.
+    """
+    cur = conn.cursor()
+    cur.execute("DELETE FROM RatingHistory")
+    cur.execute(
+        """
+        INSERT OR REPLACE INTO RatingHistory
+            (player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol, score, games, wins, draws)
+        SELECT player_id, date, match_id, elo, g2_rating, g2_rd, g2_vol, score,
+               COUNT(*) OVER w,
+               SUM(CASE WHEN score = 1.0 THEN 1 ELSE 0 END) OVER w,
+               SUM(CASE WHEN score = 0.5 THEN 1 ELSE 0 END) OVER w
+        FROM (
+            SELECT player1_id AS player_id, date, id AS match_id, player1_elo_after AS elo,
+                   player1_g2_rating_after AS g2_rating, player1_g2_rd_after AS g2_rd,
+                   player1_g2_vol_after AS g2_vol, result AS score
+            FROM Matches WHERE result IS NOT NULL AND player1_elo_after IS NOT NULL
+            UNION ALL
+            SELECT player2_id, date, id, player2_elo_after, player2_g2_rating_after, player2_g2_rd_after,
+                   player2_g2_vol_after, 1.0 - result
+            FROM Matches WHERE result IS NOT NULL AND player2_elo_after IS NOT NULL
+        )
+        WINDOW w AS (PARTITION BY player_id ORDER BY date, match_id)
+        ORDER BY player_id, date, match_id
+        """
+    )
+
+
+def rating_as_of(conn, player_id: int, date: str) -> Optional[Dict]:
+    """Return a player's ratings after their last rated match on or before
+    `date`, as a dict keyed by `RATING_HISTORY_FIELDS`, or None when they had
+    not played by then. One primary-key seek on RatingHistory.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT date, match_id, elo, g2_rating, g2_rd, g2_vol, score, games, wins, draws FROM RatingHistory
+        WHERE player_id = ? AND date <= ?
+        ORDER BY date DESC, match_id DESC
+        LIMIT 1
+        """,
+        (player_id, date),
     )
+    row = cur.fetchone()
+    return dict(zip(RATING_HISTORY_FIELDS, row)) if row else None
+
+
+def list_rating_history(conn, player_id: int, start: str = None, end: str = None):
+    """Return a player's rating curve: one row per rated match in replay
+    order, shaped like `RATING_HISTORY_FIELDS`. `start`/`end` bound the
+    match dates inclusively when given.
+    """
+    sql = ("SELECT date, match_id, elo, g2_rating, g2_rd, g2_vol, score, games, wins, draws "
+           "FROM RatingHistory WHERE player_id = ?")
+    params = [player_id]
+    if start is not None:
+        sql += " AND date >= ?"
+        params.append(start)
+    if end is not None:
+        sql += " AND date <= ?"
+        params.append(end)
+    cur = conn.cursor()
+    cur.execute(sql + " ORDER BY date, match_id", params)
     return cur.fetchall()
 
 
-def delete_match(conn, match_id: int):
+def get_player_ids_by_name(conn, names):
+    """Return `{name: player_id}` for the given names that exist."""
+    names = sorted(set(names))
+    out = {}
     cur = conn.cursor()
-    cur.execute("DELETE FROM Matches WHERE id = ?", (match_id,))
-    conn.commit()
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(f"SELECT name, id FROM Players WHERE name IN ({marks})", chunk)
+        out.update(cur.fetchall())
+    return out
 
 
-def get_all_matches_ordered(conn):
+def add_players(conn, names):
+    """Create players with the default Elo, skipping names already taken."""
+    conn.cursor().executemany(
+        "INSERT OR IGNORE INTO Players (name, elo) VALUES (?, ?)",
+        [(name, config.DEFAULT_ELO) for name in sorted(set(names))],
+    )
+
+
+def get_tournaments_by_name(conn, names):
+    """Return `{name: (tournament_id, completed)}` for the given names that exist."""
+    names = sorted(set(names))
+    out = {}
     cur = conn.cursor()
-    cur.execute("SELECT id, player1_id, player2_id, result, date FROM Matches ORDER BY date, id")
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(f"SELECT name, id, completed FROM Tournaments WHERE name IN ({marks})", chunk)
+        for name, tid, completed in cur.fetchall():
+            out[name] = (tid, bool(completed))
+    return out
+
+
+def add_tournaments(conn, rows):
+    """Create `(name, date)` tournaments, skipping names already taken."""
+    conn.cursor().executemany("INSERT OR IGNORE INTO Tournaments (name, date) VALUES (?, ?)", rows)
+
+
+def bulk_insert_matches(conn, rows):
+    """Insert `(tournament_id, player1_id, player2_id, result, date)` match
+    rows without rating audits.
+
+    Callers keep PlayerStats and checkpoints in step (see
+    `add_matches_to_player_stats` and `invalidate_checkpoints_from`) and
+    replay ratings afterwards.
+    """
+    conn.cursor().executemany(
+        "INSERT INTO Matches (tournament_id, player1_id, player2_id, result, date) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def get_matches_from(conn, date: str, match_id: int):
+    """Return matches at or after the (date, id) position in replay order.
+
+    Rows carry the per-match before-values needed to seed a targeted replay:
+    `(id, player1_id, player2_id, result, date, p1_elo_before, p2_elo_before,
+    p1_g2_rating_before, p1_g2_rd_before, p1_g2_vol_before,
+    p2_g2_rating_before, p2_g2_rd_before, p2_g2_vol_before,
+    p1_last_played_before, p2_last_played_before)`.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, player1_id, player2_id, result, date,
+               player1_elo_before, player2_elo_before,
+               player1_g2_rating_before, player1_g2_rd_before, player1_g2_vol_before,
+               player2_g2_rating_before, player2_g2_rd_before, player2_g2_vol_before,
+               player1_last_played_before, player2_last_played_before
+        FROM Matches
+        WHERE date >= ? AND (date > ? OR id >= ?)
+        ORDER BY date, id
+        """,
+        (date, date, match_id),
+    )
+    return cur.fetchall()
+
+
+def get_player_counts_before(conn, player_ids, date: str, match_id: int):
+    """Return `{player_id: (games, last_game_date)}` for rated matches strictly
+    before the (date, id) position. Players without games are omitted.
+    """
+    ids = sorted(set(player_ids))
+    out = {}
+    cur = conn.cursor()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(
+            f"""
+            SELECT pid, COUNT(*), MAX(date) FROM (
+                SELECT player1_id AS pid, date FROM Matches
+                WHERE player1_id IN ({marks}) AND result IS NOT NULL
+                  AND date <= ? AND (date < ? OR id < ?)
+                UNION ALL
+                SELECT player2_id AS pid, date FROM Matches
+                WHERE player2_id IN ({marks}) AND result IS NOT NULL
+                  AND date <= ? AND (date < ? OR id < ?)
+            )
+            GROUP BY pid
+            """,
+            chunk + [date, date, match_id] + chunk + [date, date, match_id],
+        )
+        for pid, games, last_game in cur.fetchall():
+            out[pid] = (games, last_game)
+    return out
+
+
+def get_player_states_before(conn, player_ids, date: str, match_id: int):
+    """Return each player's rating state as of the (date, id) position.
+
+    State comes from the after-values of the player's last rated match
+    strictly before the position, shaped like `get_checkpoint_players` rows
+    minus the player id: `{player_id: (elo, g2_rating, g2_rd, g2_vol, games,
+    last_played, last_match_id)}`. Players without earlier games are
+    omitted; audit columns may be NULL when the match was never rated.
+    """
+    counts = get_player_counts_before(conn, player_ids, date, match_id)
+    out = {}
+    cur = conn.cursor()
+    for pid, (games, last_game) in counts.items():
+        # both sides are searched on the last played date only
+        cur.execute(
+            """
+            SELECT id, player1_id,
+                   player1_elo_after, player1_g2_rating_after, player1_g2_rd_after, player1_g2_vol_after,
+                   player2_elo_after, player2_g2_rating_after, player2_g2_rd_after, player2_g2_vol_after
+            FROM Matches
+            WHERE id = (
+                SELECT MAX(id) FROM Matches
+                WHERE date = ? AND result IS NOT NULL AND (player1_id = ? OR player2_id = ?)
+                  AND (date < ? OR id < ?)
+            )
+            """,
+            (last_game, pid, pid, date, match_id),
+        )
+        row = cur.fetchone()
+        after = row[2:6] if row[1] == pid else row[6:10]
+        out[pid] = (*after, games, last_game, row[0])
+    return out
+
+
+def get_checkpoint_before(conn, date: str, match_id: int):
+    """Return the latest rating checkpoint strictly before the (date, id)
+    position as `(id, match_date, match_id)`, or None.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, match_date, match_id FROM RatingCheckpoints
+        WHERE match_date <= ? AND (match_date < ? OR match_id < ?)
+        ORDER BY match_date DESC, match_id DESC
+        LIMIT 1
+        """,
+        (date, date, match_id),
+    )
+    return cur.fetchone()
+
+
+def get_checkpoint_players(conn, checkpoint_id: int):
+    """Return `(player_id, elo, g2_rating, g2_rd, g2_vol, games, last_played,
+    last_match_id)` rows stored for a checkpoint.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT player_id, elo, g2_rating, g2_rd, g2_vol, games, last_played, last_match_id
+        FROM RatingCheckpointPlayers WHERE checkpoint_id = ?
+        """,
+        (checkpoint_id,),
+    )
     return cur.fetchall()
 
 
+def add_rating_checkpoint(conn, match_date: str, match_id: int, rows) -> int:
+    """Store a checkpoint at (match_date, match_id) with per-player state rows
+    shaped like `get_checkpoint_players`.
+    """
+    cur = conn.cursor()
+    cur.execute("INSERT INTO RatingCheckpoints (match_date, match_id) VALUES (?, ?)", (match_date, match_id))
+    checkpoint_id = cur.lastrowid
+    cur.executemany(
+        """
+        INSERT INTO RatingCheckpointPlayers
+            (checkpoint_id, player_id, elo, g2_rating, g2_rd, g2_vol, games, last_played, last_match_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        ((checkpoint_id, *row) for row in rows),
+    )
+    return checkpoint_id
+
+
+def checkpoint_current_ratings(conn):
+    """Snapshot the current player profiles as a checkpoint at the latest
+    rated match. Returns the checkpoint id, or None when nothing is rated.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT date, id FROM Matches WHERE result IS NOT NULL ORDER BY date DESC, id DESC LIMIT 1")
+    last = cur.fetchone()
+    if not last:
+        return None
+    cur.execute("INSERT INTO RatingCheckpoints (match_date, match_id) VALUES (?, ?)", last)
+    checkpoint_id = cur.lastrowid
+    cur.execute(
+        """
+        INSERT INTO RatingCheckpointPlayers
+            (checkpoint_id, player_id, elo, g2_rating, g2_rd, g2_vol, games, last_played, last_match_id)
+        SELECT ?, p.id, p.elo, p.g2_rating, p.g2_rd, p.g2_vol, s.games, p.last_game_date, p.last_game_match_id
+        FROM Players p JOIN PlayerStats s ON s.player_id = p.id
+        WHERE s.games > 0
+        """,
+        (checkpoint_id,),
+    )
+    return checkpoint_id
+
+
+def delete_all_rating_checkpoints(conn):
+    """Remove every checkpoint (full recompute)."""
+    conn.cursor().execute("DELETE FROM RatingCheckpoints")
+
+
+def invalidate_checkpoints_from(conn, date: str, match_id: int):
+    """Drop checkpoints at or after the (date, id) position, whose stored
+    state no longer reflects the match history.
+    """
+    if date is None:
+        return
+    conn.cursor().execute(
+        "DELETE FROM RatingCheckpoints WHERE match_date >= ? AND (match_date > ? OR match_id >= ?)",
+        (date, date, match_id),
+    )
+
+
 def get_match(conn, match_id: int):
     cur = conn.cursor()
     cur.execute("SELECT id, tournament_id, player1_id, player2_id, result, date FROM Matches WHERE id = ?", (match_id,))
     return cur.fetchone()
 
 
+def get_last_rated_position(conn):
+    """Return `(date, id)` of the latest rated match in replay order, or None."""
+    cur = conn.cursor()
+    cur.execute("SELECT date, id FROM Matches WHERE result IS NOT NULL ORDER BY date DESC, id DESC LIMIT 1")
+    return cur.fetchone()
+
+
+def get_match_audits(conn, match_ids):
+    """Return `{match_id: audit columns}` in `bulk_update_match_audits` order
+    (without the trailing id) for the given matches.
+    """
+    ids = sorted(set(match_ids))
+    out = {}
+    columns = ", ".join(MATCH_AUDIT_COLUMNS)
+    cur = conn.cursor()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(f"SELECT id, {columns} FROM Matches WHERE id IN ({marks})", chunk)
+        for row in cur.fetchall():
+            out[row[0]] = row[1:]
+    return out
+
+
 
 def update_match_row(conn, match_id: int, result: float, date: str = None):
     """Low-level: update the match row in the DB. Kept for callers that only
@@ -314,63 +1071,191 @@ def update_match_row(conn, match_id: int, result: float, date: str = None):
     """
     # Implementation identical to previous `update_match_result`
     cur = conn.cursor()
-    cur.execute("SELECT id FROM Matches WHERE id = ?", (match_id,))
+    cur.execute("SELECT player1_id, player2_id, result, date FROM Matches WHERE id = ?", (match_id,))
     row = cur.fetchone()
     if not row:
         raise ValueError("Match not found")
+    p1, p2, old_result, old_date = row
 
     if date is None:
         cur.execute("UPDATE Matches SET result = ? WHERE id = ?", (result, match_id))
     else:
         cur.execute("UPDATE Matches SET result = ?, date = ? WHERE id = ?", (result, date, match_id))
-    conn.commit()
+    _sync_derived_tables(conn, match_id, p1, p2, old_result, old_date, result, date if date is not None else old_date)
+
+
+_PLAYER_MATCHES_SQL = """
+    SELECT
+        m.id,
+        COALESCE(t.name, '') AS tournament,
+        m.date,
+        p1.id AS p1_id, p1.name AS p1_name, m.player1_elo_before, m.player1_elo_after,
+        p2.id AS p2_id, p2.name AS p2_name, m.player2_elo_before, m.player2_elo_after,
+        m.player1_g2_rating_before, m.player1_g2_rating_after, m.player1_g2_rd_before, m.player1_g2_rd_after, m.player1_g2_vol_before, m.player1_g2_vol_after,
+        m.player2_g2_rating_before, m.player2_g2_rating_after, m.player2_g2_rd_before, m.player2_g2_rd_after, m.player2_g2_vol_before, m.player2_g2_vol_after,
+        m.result
+    FROM Matches m
+    JOIN Players p1 ON m.player1_id = p1.id
+    JOIN Players p2 ON m.player2_id = p2.id
+    LEFT JOIN Tournaments t ON m.tournament_id = t.id
+    WHERE m.id IN (
+        SELECT id FROM Matches WHERE player1_id = ?
+        UNION
+        SELECT id FROM Matches WHERE player2_id = ?
+    )
+    ORDER BY m.date, m.id
+"""
 
 
 def list_matches_for_player(conn, player_id: int):
     cur = conn.cursor()
-    cur.execute(
+    cur.execute(_PLAYER_MATCHES_SQL, (player_id, player_id))
+    return cur.fetchall()
+
+
+def iter_matches_for_player(conn, player_id: int, chunk_size: int = None):
+    """Yield `list_matches_for_player` rows, fetched in chunks."""
+    cur = conn.cursor()
+    cur.execute(_PLAYER_MATCHES_SQL, (player_id, player_id))
+    yield from _iter_rows(cur, chunk_size)
+
+
+def get_player_rating_states(conn, player_ids):
+    """Return `{player_id: (elo, g2_rating, g2_rd, g2_vol, games, last_game_date,
+    last_game_match_id)}` for existing players, with games from PlayerStats.
+    """
+    return {
+        pid: (*row[2:6], row[8], row[6], row[7])
+        for pid, row in _player_rows(conn, set(player_ids)).items()
+    }
+
+
+def get_player_summary(conn, player_id: int):
+    """Return `(games, wins, draws, losses, last_game)` from PlayerStats."""
+    cur = conn.cursor()
+    cur.execute("SELECT games, wins, draws, losses, last_game FROM PlayerStats WHERE player_id = ?", (player_id,))
+    row = cur.fetchone()
+    return tuple(row) if row else (0, 0, 0, 0, None)
+
+
+def _player_scores(result: float):
+    """Split a match result into (wins, draws, losses) deltas for each side."""
+    if result == 1.0:
+        return (1, 0, 0), (0, 0, 1)
+    if result == 0.5:
+        return (0, 1, 0), (0, 1, 0)
+    if result == 0.0:
+        return (0, 0, 1), (1, 0, 0)
+    return (0, 0, 1), (0, 0, 1)
+
+
+def add_matches_to_player_stats(conn, matches):
+    """Count newly rated matches in both players' PlayerStats rows.
+
+    `matches` are `(player1_id, player2_id, result, date)` tuples.
+    """
+    rows = []
+    for p1, p2, result, date in matches:
+        side1, side2 = _player_scores(result)
+        rows.append((p1, *side1, date))
+        rows.append((p2, *side2, date))
+    _invalidate_players(conn, [row[0] for row in rows])
+    cur = conn.cursor()
+    cur.executemany(
         """
-        SELECT
-            m.id,
-            COALESCE(t.name, '') AS tournament,
-            m.date,
-            p1.id AS p1_id, p1.name AS p1_name, m.player1_elo_before, m.player1_elo_after,
-            p2.id AS p2_id, p2.name AS p2_name, m.player2_elo_before, m.player2_elo_after,
-            m.player1_g2_rating_before, m.player1_g2_rating_after, m.player1_g2_rd_before, m.player1_g2_rd_after, m.player1_g2_vol_before, m.player1_g2_vol_after,
-            m.player2_g2_rating_before, m.player2_g2_rating_after, m.player2_g2_rd_before, m.player2_g2_rd_after, m.player2_g2_vol_before, m.player2_g2_vol_after,
-            m.result
-        FROM Matches m
-        JOIN Players p1 ON m.player1_id = p1.id
-        JOIN Players p2 ON m.player2_id = p2.id
-        LEFT JOIN Tournaments t ON m.tournament_id = t.id
-        WHERE m.player1_id = ? OR m.player2_id = ?
-        ORDER BY m.date, m.id
+        INSERT INTO PlayerStats (player_id, games, wins, draws, losses, last_game)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT(player_id) DO UPDATE SET
+            games = games + 1,
+            wins = wins + excluded.wins,
+            draws = draws + excluded.draws,
+            losses = losses + excluded.losses,
+            last_game = MAX(COALESCE(last_game, excluded.last_game), excluded.last_game)
         """,
-        (player_id, player_id),
+        rows,
     )
-    return cur.fetchall()
 
 
-def get_player_summary(conn, player_id: int):
+def refresh_player_stats(conn, player_ids):
+    """Rebuild PlayerStats rows for the given players from Matches.
+
+    Used when a rated match is edited or removed and counters cannot simply
+    be incremented.
+    """
+    ids = sorted(set(player_ids))
+    _invalidate_players(conn, ids)
     cur = conn.cursor()
-    cur.execute("SELECT COUNT(*), MAX(date) FROM Matches WHERE player1_id = ? OR player2_id = ?", (player_id, player_id))
-    games_played, last_game = cur.fetchone()
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        cur.execute(f"DELETE FROM PlayerStats WHERE player_id IN ({marks})", chunk)
+        cur.execute(
+            f"""
+            INSERT INTO PlayerStats (player_id, games, wins, draws, losses, last_game)
+            SELECT pid, COUNT(*),
+                   SUM(CASE WHEN score = 1.0 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN score = 0.5 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN score IN (0.5, 1.0) THEN 0 ELSE 1 END),
+                   MAX(date)
+            FROM (
+                SELECT player1_id AS pid, result AS score, date FROM Matches
+                WHERE result IS NOT NULL AND player1_id IN ({marks})
+                UNION ALL
+                SELECT player2_id AS pid, 1.0 - result AS score, date FROM Matches
+                WHERE result IS NOT NULL AND player2_id IN ({marks})
+            )
+            GROUP BY pid
+            """,
+            chunk + chunk,
+        )
 
-    cur.execute(
-        "SELECT COUNT(*) FROM Matches WHERE (player1_id = ? AND result = 1.0) OR (player2_id = ? AND result = 0.0)",
-        (player_id, player_id)
+
+def replace_all_player_stats(conn, rows):
+    """Replace the whole PlayerStats table with precomputed rows.
+
+    `rows` are `(player_id, games, wins, draws, losses, last_game)`. Used by
+    full recomputes.
+    """
+    _clear_player_cache(conn)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM PlayerStats")
+    cur.executemany(
+        "INSERT INTO PlayerStats (player_id, games, wins, draws, losses, last_game) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
     )
-    wins = cur.fetchone()[0]
 
+
+def set_match_result(conn, match_id: int, result: float = None, date: str = None):
+    """Store a match's result and/or date and keep PlayerStats in step.
+
+    None leaves the stored value unchanged. A match gaining its first result
+    is counted incrementally; changing an already rated match rebuilds both
+    players' stats.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT player1_id, player2_id, result, date FROM Matches WHERE id = ?", (match_id,))
+    row = cur.fetchone()
+    if not row:
+        return
+    p1, p2, old_result, old_date = row
     cur.execute(
-        "SELECT COUNT(*) FROM Matches WHERE (player1_id = ? OR player2_id = ?) AND result = 0.5",
-        (player_id, player_id)
+        "UPDATE Matches SET result = COALESCE(?, result), date = COALESCE(?, date) WHERE id = ?",
+        (result, date, match_id),
     )
-    draws = cur.fetchone()[0]
+    new_result = result if result is not None else old_result
+    new_date = date if date is not None else old_date
+    _sync_derived_tables(conn, match_id, p1, p2, old_result, old_date, new_result, new_date)
 
-    losses = games_played - wins - draws
 
-    return games_played, wins, draws, losses, last_game
+def _sync_derived_tables(conn, match_id: int, p1: int, p2: int, old_result, old_date, new_result, new_date):
+    """Keep PlayerStats and rating checkpoints consistent with a match write."""
+    if old_result is not None:
+        if new_result != old_result or new_date != old_date:
+            refresh_player_stats(conn, [p1, p2])
+            invalidate_checkpoints_from(conn, min(old_date, new_date), match_id)
+    elif new_result is not None:
+        add_matches_to_player_stats(conn, [(p1, p2, new_result, new_date)])
+        invalidate_checkpoints_from(conn, new_date, match_id)
 
 
 # NOTE: prefer using the canonical names defined above (add_player, add_tournament,
@@ -381,11 +1266,9 @@ def get_player_summary(conn, player_id: int):
 
 
 def get_player_glicko(conn, player_id: int):
-    cur = conn.cursor()
-    cur.execute("SELECT g2_rating, g2_rd, g2_vol FROM Players WHERE id = ?", (player_id,))
-    row = cur.fetchone()
+    row = _player_rows(conn, [player_id]).get(player_id)
     if row:
-        return row[0], row[1], row[2]
+        return row[3], row[4], row[5]
     return None
 
 
@@ -413,7 +1296,6 @@ def update_match_glicko(conn, match_id: int,
             (p1_g_before, p1_g_after, p1_g_rd_before, p1_g_rd_after, p1_g_vol_before, p1_g_vol_after,
              p2_g_before, p2_g_after, p2_g_rd_before, p2_g_rd_after, p2_g_vol_before, p2_g_vol_after, match_id)
         )
-        conn.commit()
     except Exception:
         # If columns don't exist, ignore.
         pass
@@ -424,7 +1306,7 @@ def update_player_last_game(conn, player_id: int, last_game_date: str, last_game
     try:
         cur.execute("UPDATE Players SET last_game_date = ?, last_game_match_id = ? WHERE id = ?",
                     (last_game_date, last_game_match_id, player_id))
-        conn.commit()
     except Exception:
         # If columns don't exist, ignore.
         pass
+    _invalidate_players(conn, [player_id])
@@ -1,11 +1,16 @@
 from . import repo, elo
+import chess_club.config as config
+import chess_club.db as db
+import chess_club.engine as engine
+import chess_club.pairing as pairing
 import chess_club.ranking as ranking
 import chess_club.ratings as ratings
 import chess_club.service as service
 
 
 def add_player_to_tournament(conn, tournament_id: int, player_id: int):
-    return repo.add_tournament_player(conn, tournament_id, player_id)
+    with db.UnitOfWork(conn):
+        return repo.add_tournament_player(conn, tournament_id, player_id)
 
 
 def create_match(conn, tournament_id: int, pid1: int, pid2: int, result: float, match_date: str):
@@ -23,21 +28,31 @@ def create_match(conn, tournament_id: int, pid1: int, pid2: int, result: float,
     if not p1 or not p2:
         raise ValueError("Player not found")
 
-    try:
-        conn.execute('BEGIN')
+    with db.UnitOfWork(conn):
         match_id = repo.create_match(conn, tournament_id, pid1, pid2, match_date)
+        out = _rate_new_match(conn, match_id, pid1, pid2, result, match_date)
+
+    return (p1[1], out.p1_elo_after, p2[1], out.p2_elo_after)
+
+
+def _rate_new_match(conn, match_id: int, pid1: int, pid2: int, result: float, match_date: str):
+    """Rate a newly inserted match and persist the result; returns its `MatchAudit`.
+
+    Games are rated on their own via the service layer. With Glicko-2
+    rating periods (`config.G2_RATING_PERIOD_DAYS`) a new game changes every
+    game of its period, so the result is stored and the period is replayed
+    by a targeted recompute (full recompute fallback).
+    """
+    if not config.G2_RATING_PERIOD_DAYS:
         # compute ratings (pure) and persist via service layer
         out = ratings.compute_match(conn, pid1, pid2, result, match_date)
-        service.record_match_result(conn, match_id, pid1, pid2, out, match_date, result)
-        conn.commit()
-    except Exception:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        raise
-
-    return (p1[1], out.get('p1_elo_after') or out.get('p1_g2_after'), p2[1], out.get('p2_elo_after') or out.get('p2_g2_after'))
+        return service.record_match_result(conn, match_id, pid1, pid2, out, match_date, result)
+    repo.set_match_result(conn, match_id, result, match_date)
+    try:
+        ranking.recompute_from_position(conn, match_date, match_id)
+    except ValueError:
+        ranking.recompute(conn)
+    return engine.audit_from_row(repo.get_match_audits(conn, [match_id])[match_id])
 
 
 def create_match_with_result(conn, tournament_id: int, pid1: int, pid2: int, result: float, match_date: str):
@@ -48,80 +63,163 @@ def create_match_with_result(conn, tournament_id: int, pid1: int, pid2: int, res
     if repo.is_tournament_completed(conn, tournament_id):
         raise ValueError("Tournament is completed")
 
-    match_id = repo.create_match(conn, tournament_id, pid1, pid2, match_date)
-    out = ratings.compute_match(conn, pid1, pid2, result, match_date)
-    service.record_match_result(conn, match_id, pid1, pid2, out, match_date, result)
+    with db.UnitOfWork(conn):
+        match_id = repo.create_match(conn, tournament_id, pid1, pid2, match_date)
+        out = _rate_new_match(conn, match_id, pid1, pid2, result, match_date)
     p1 = repo.get_player(conn, pid1)
     p2 = repo.get_player(conn, pid2)
-    return (p1[1], out.get('p1_elo_after') or out.get('p1_g2_after'), p2[1], out.get('p2_elo_after') or out.get('p2_g2_after'))
+    return (p1[1], out.p1_elo_after, p2[1], out.p2_elo_after)
+
+
+def pair_swiss_round(conn, tournament_id: int, match_date: str = None) -> pairing.Round:
+    """Pair the next Swiss round and schedule it, in one unit of work.
+
+    Registered players are ranked by tournament score and rating (G2 when
+    `RATING_SYSTEM` is 'glicko2', Elo otherwise) and paired by
+    `pairing.pair_round`, which avoids rematches and balances colors using
+    the tournament's history (`repo.get_tournament_pairings`). Each board
+    is inserted with `repo.create_match` (player1 has white, no result) on
+    `match_date`, defaulting to the tournament date, and the bye is
+    counted on the player's registration (`repo.add_tournament_bye`) so it
+    scores in later rounds. Returns the `pairing.Round` with `pairs` as
+    `(match_id, white, black)`. Raises ValueError for a missing or completed
+    tournament, fewer than two players, or a previous round that still has
+    unplayed games.
+    """
+    t = repo.get_tournament(conn, tournament_id)
+    if not t:
+        raise ValueError("Tournament not found")
+    if repo.is_tournament_completed(conn, tournament_id):
+        raise ValueError("Tournament is completed")
+    pids = [pid for pid, _ in repo.get_tournament_players(conn, tournament_id)]
+    if len(pids) < 2:
+        raise ValueError("Not enough players registered")
+    history = repo.get_tournament_pairings(conn, tournament_id)
+    if any(result is None for _, _, result in history):
+        raise ValueError("The previous round still has games without a result")
+
+    states = repo.get_player_rating_states(conn, pids)
+    use_g2 = config.RATING_SYSTEM == 'glicko2'
+    players = []
+    for pid in pids:
+        elo_rating, g2_rating = states[pid][:2]
+        if use_g2:
+            players.append((pid, g2_rating if g2_rating is not None else config.G2_DEFAULT_RATING))
+        else:
+            players.append((pid, elo_rating if elo_rating is not None else config.DEFAULT_ELO))
+    pairs = pairing.pair_round(players, history, repo.get_tournament_byes(conn, tournament_id))
+
+    if match_date is None:
+        match_date = t[2]
+    with db.UnitOfWork(conn):
+        scheduled = [(repo.create_match(conn, tournament_id, white, black, match_date), white, black)
+                     for white, black in pairs.pairs]
+        if pairs.bye is not None:
+            repo.add_tournament_bye(conn, tournament_id, pairs.bye)
+    return pairs._replace(pairs=scheduled)
+
+
+def generate_round_robin(conn, tournament_id: int, double: bool = False, match_date: str = None):
+    """Schedule every game of an all-play-all tournament in one unit of work.
+
+    Registered players get Berger pairing numbers in player id order and
+    `pairing.round_robin` builds the rounds (`double` adds the return
+    cycle with colors reversed). All boards are inserted with one
+    `repo.bulk_insert_matches` call as matches without a result (player1
+    has white) on `match_date`, defaulting to the tournament date, in round
+    order; results are then entered on those rows with `update_match`.
+    Returns the list of `pairing.Round`. Raises ValueError for a missing or
+    completed tournament, fewer than two players, or a tournament that
+    already has matches.
+    """
+    t = repo.get_tournament(conn, tournament_id)
+    if not t:
+        raise ValueError("Tournament not found")
+    if repo.is_tournament_completed(conn, tournament_id):
+        raise ValueError("Tournament is completed")
+    pids = sorted(pid for pid, _ in repo.get_tournament_players(conn, tournament_id))
+    if len(pids) < 2:
+        raise ValueError("Not enough players registered")
+    if repo.get_tournament_pairings(conn, tournament_id):
+        raise ValueError("Tournament already has matches")
+
+    rounds = pairing.round_robin(pids, double)
+    if match_date is None:
+        match_date = t[2]
+    with db.UnitOfWork(conn):
+        repo.bulk_insert_matches(conn, [(tournament_id, white, black, None, match_date)
+                                        for rnd in rounds for white, black in rnd.pairs])
+    return rounds
 
 
 def complete_tournament(conn, tournament_id: int):
+    """Mark a tournament completed and checkpoint the current ratings so later
+    targeted recomputes can start from here.
+    """
     t = repo.get_tournament(conn, tournament_id)
     if not t:
         raise ValueError("Tournament not found")
-    repo.complete_tournament(conn, tournament_id)
+    with db.UnitOfWork(conn):
+        repo.complete_tournament(conn, tournament_id)
+        repo.checkpoint_current_ratings(conn)
 
 
 def reopen_tournament(conn, tournament_id: int):
     t = repo.get_tournament(conn, tournament_id)
     if not t:
         raise ValueError("Tournament not found")
-    repo.reopen_tournament(conn, tournament_id)
+    with db.UnitOfWork(conn):
+        repo.reopen_tournament(conn, tournament_id)
+
+
+def delete_player(conn, player_id: int):
+    """Delete a player with their games and recompute affected ratings.
+
+    `repo.delete_player` removes the player; `ranking.recompute_after_removal`
+    then replays only the games of players whose histories meet the removed
+    ones, from the first removed game on, falling back to a full recompute
+    when no trustworthy seed state is available. The deletion and the
+    recomputed ratings are committed together. Returns True when the full
+    recompute fallback ran.
+    """
+    if not repo.get_player(conn, player_id):
+        raise ValueError("Player not found")
+    with db.UnitOfWork(conn):
+        removed = repo.delete_player(conn, player_id)
+        try:
+            ranking.recompute_after_removal(conn, removed)
+            return False
+        except ValueError:
+            ranking.recompute(conn)
+            return True
 
 
 def update_match(conn, match_id: int, result: float, date: str = None):
     """Update a match result and recompute affected ratings.
 
-    This delegates to `repo.update_match_result` (which applies the result
-    and persists audit fields) and then attempts a targeted recompute via
-    `ranking.recompute_from_match`, falling back to a full recompute if
-    per-match audit data is missing.
+    This delegates to `repo.update_match_result` to store the new result/date
+    and then runs a targeted recompute via `ranking.recompute_from_position`
+    from the earlier of the old and new positions, falling back to a full
+    recompute when no trustworthy seed state is available.
+    The new result and the recomputed ratings are committed together.
+    Returns True when the full recompute fallback ran.
     """
     m = repo.get_match(conn, match_id)
     if not m:
         raise ValueError("Match not found")
-    _, tid, p1, p2, _, _ = m
+    _, tid, _, _, _, old_date = m
 
     if repo.is_tournament_completed(conn, tid):
         raise ValueError("Tournament is completed")
 
-    # Update the stored match row
-    repo.update_match_result(conn, match_id, result, date)
-
-    # Compute and persist rating/profile changes at business layer
-    m = repo.get_match(conn, match_id)
-    _, _, p1_id, p2_id, _, match_date = m
-    out = ratings.compute_match(conn, p1_id, p2_id, result, match_date)
-    try:
-        repo.update_player_profile(conn, p1_id, elo=out.get('p1_elo_after'),
-                                   g2_rating=out.get('p1_g2_after'), g2_rd=out.get('p1_g2_rd_after'), g2_vol=out.get('p1_g2_vol_after'),
-                                   last_game_date=match_date, last_game_match_id=match_id)
-        repo.update_player_profile(conn, p2_id, elo=out.get('p2_elo_after'),
-                                   g2_rating=out.get('p2_g2_after'), g2_rd=out.get('p2_g2_rd_after'), g2_vol=out.get('p2_g2_vol_after'),
-                                   last_game_date=match_date, last_game_match_id=match_id)
-    except Exception:
-        pass
-    try:
-        repo.update_match_elos(conn, match_id, out.get('p1_elo_before'), out.get('p1_elo_after'),
-                               out.get('p2_elo_before'), out.get('p2_elo_after'))
-    except Exception:
-        pass
-    try:
-        repo.update_match_glicko(conn, match_id,
-                                 out.get('p1_g2_before'), out.get('p1_g2_after'),
-                                 out.get('p1_g2_rd_before'), out.get('p1_g2_rd_after'),
-                                 out.get('p1_g2_vol_before'), out.get('p1_g2_vol_after'),
-                                 out.get('p2_g2_before'), out.get('p2_g2_after'),
-                                 out.get('p2_g2_rd_before'), out.get('p2_g2_rd_after'),
-                                 out.get('p2_g2_vol_before'), out.get('p2_g2_vol_after'))
-    except Exception:
-        pass
-
-    try:
-        ranking.recompute_from_match(conn, match_id)
-        return False
-    except ValueError:
-        # fallback
-        ranking.recompute(conn)
-        return True
+    new_date = date if date is not None else old_date
+    with db.UnitOfWork(conn):
+        # Update the stored match row (PlayerStats and checkpoints follow it)
+        repo.update_match_result(conn, match_id, result, date)
+        try:
+            ranking.recompute_from_position(conn, min(old_date, new_date), match_id)
+            return False
+        except ValueError:
+            # fallback
+            ranking.recompute(conn)
+            return True
@@ -0,0 +1,57 @@
+import pytest
+
+import chess_club.db as dbm
+import chess_club.repo as repo
+
+
+PLAYER_COLS = "id, elo, g2_rating, g2_rd, g2_vol, last_game_date, last_game_match_id"
+AUDIT_COLS = (
+    "id, player1_elo_before, player1_elo_after, player2_elo_before, player2_elo_after, "
+    "player1_g2_rating_before, player1_g2_rating_after, player1_g2_rd_before, player1_g2_rd_after, "
+    "player1_g2_vol_before, player1_g2_vol_after, player2_g2_rating_before, player2_g2_rating_after, "
+    "player2_g2_rd_before, player2_g2_rd_after, player2_g2_vol_before, player2_g2_vol_after, "
+    "player1_last_played_before, player2_last_played_before"
+)
+
+
+@pytest.fixture
+def club():
+    """Build a club database: connection, schema, players and a tournament.
+
+    `club(path, names, tournament, date, register=False,
+    check_same_thread=True)` returns `(conn, tournament_id, player_ids)`;
+    `tournament=None` skips the tournament (id None) and `register` enters
+    every player in it. Connections are closed at teardown.
+    """
+    conns = []
+
+    def make(path=":memory:", names=("A", "B"), tournament="T", date="2025-01-01",
+             register=False, check_same_thread=True):
+        conn = dbm.get_connection(str(path), check_same_thread=check_same_thread)
+        conns.append(conn)
+        dbm.init_db(conn)
+        tid = None
+        with dbm.UnitOfWork(conn):
+            pids = [repo.add_player(conn, name) for name in names]
+            if tournament is not None:
+                tid = repo.add_tournament(conn, tournament, date)
+                if register:
+                    for pid in pids:
+                        repo.add_tournament_player(conn, tid, pid)
+        return conn, tid, pids
+
+    yield make
+    for conn in conns:
+        conn.close()
+
+
+@pytest.fixture
+def snapshot():
+    """Rating state to compare before and after a replay: `snapshot(conn)`
+    returns the players' ratings, every match audit and PlayerStats."""
+    def take(conn):
+        players = conn.execute(f"SELECT {PLAYER_COLS} FROM Players ORDER BY id").fetchall()
+        audits = conn.execute(f"SELECT {AUDIT_COLS} FROM Matches ORDER BY id").fetchall()
+        stats = conn.execute("SELECT * FROM PlayerStats ORDER BY player_id").fetchall()
+        return players, audits, stats
+    return take
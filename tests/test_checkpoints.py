@@ -0,0 +1,72 @@
+import chess_club.config as config
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+import chess_club.ranking as ranking
+
+
+def _season(club, monkeypatch, interval=3):
+    monkeypatch.setattr(config, "CHECKPOINT_INTERVAL", interval)
+    conn, tid, pids = club(names=("A", "B", "C", "D"), tournament="T1")
+    games = [
+        (0, 1, 1.0, "2025-01-01"), (2, 3, 0.5, "2025-01-02"), (0, 2, 0.0, "2025-01-10"),
+        (1, 3, 1.0, "2025-02-03"), (3, 0, 0.5, "2025-03-20"), (1, 2, 0.0, "2025-03-21"),
+        (0, 1, 1.0, "2025-06-01"), (2, 3, 1.0, "2025-06-02"),
+    ]
+    for i, j, result, d in games:
+        tournament.create_match(conn, tid, pids[i], pids[j], result, d)
+    ranking.recompute(conn)
+    return conn, pids, tid
+
+
+def _checkpoints(conn):
+    return conn.execute("SELECT match_date, match_id FROM RatingCheckpoints ORDER BY match_date, match_id").fetchall()
+
+
+def test_recompute_writes_periodic_checkpoints(club, monkeypatch):
+    conn, pids, _ = _season(club, monkeypatch)
+    assert _checkpoints(conn) == [("2025-01-10", 3), ("2025-03-21", 6)]
+    (cp_id,) = conn.execute("SELECT id FROM RatingCheckpoints WHERE match_id = 3").fetchone()
+    rows = {row[0]: row for row in repo.get_checkpoint_players(conn, cp_id)}
+    # after three matches A played twice, D once
+    assert rows[pids[0]][5] == 2
+    assert rows[pids[3]][5] == 1
+
+
+def test_targeted_recompute_from_checkpoint_matches_full_recompute(club, snapshot, monkeypatch):
+    conn, _, _ = _season(club, monkeypatch)
+    calls = []
+    orig = repo.get_matches_from
+    monkeypatch.setattr(repo, "get_matches_from", lambda c, d, m: calls.append((d, m)) or orig(c, d, m))
+    # wipe early audits: a checkpoint-seeded replay must not depend on them
+    conn.execute("UPDATE Matches SET player1_elo_before = NULL, player2_elo_before = NULL WHERE id <= 6")
+
+    fallback = tournament.update_match(conn, 7, 0.0)
+    assert fallback is False
+    # seeded from the checkpoint after match 6, so only the tail is read
+    assert calls == [("2025-03-21", 7)]
+    targeted = snapshot(conn)[0]
+
+    ranking.recompute(conn)
+    assert snapshot(conn)[0] == targeted
+
+
+def test_editing_before_a_checkpoint_invalidates_it(club, monkeypatch):
+    conn, _, _ = _season(club, monkeypatch)
+    tournament.update_match(conn, 5, 1.0)
+    assert _checkpoints(conn) == [("2025-01-10", 3)]
+
+
+def test_date_change_without_checkpoint_matches_full_recompute(club, snapshot, monkeypatch):
+    conn, _, _ = _season(club, monkeypatch, interval=0)
+    assert _checkpoints(conn) == []
+    # move a match both later and earlier; seeds come from the untouched prefix
+    assert tournament.update_match(conn, 4, 1.0, "2025-03-25") is False
+    assert tournament.update_match(conn, 7, 0.0, "2025-01-05") is False
+    targeted = snapshot(conn)
+
+    ranking.recompute(conn)
+    assert snapshot(conn) == targeted
+
+    tid2 = repo.add_tournament(conn, "T2", "2025-06-01")
+    tournament.complete_tournament(conn, tid2)
+    assert _checkpoints(conn) == [("2025-06-02", 8)]
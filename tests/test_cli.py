@@ -0,0 +1,54 @@
+import json
+
+import chess_club.cli as cli
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def _club_file(club, path):
+    conn, tid, (a, b) = club(path, names=("Alice", "Bob"))
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-02")
+    tournament.create_match(conn, tid, b, a, 0.5, "2025-01-03")
+    conn.close()
+    return str(path), a, b
+
+
+def test_leaderboard_and_player_games_json(club, tmp_path, capsys):
+    path, a, b = _club_file(club, tmp_path / "club.db")
+
+    assert cli.main(["--db", path, "--timing", "leaderboard", "--json", "--limit", "1"]) == 0
+    captured = capsys.readouterr()
+    (top,) = json.loads(captured.out)
+    assert (top["rank"], top["name"], top["games"], top["wins"], top["draws"]) == (1, "Alice", 2, 1, 1)
+    assert "leaderboard:" in captured.err and "1 rows" in captured.err
+
+    assert cli.main(["--db", path, "leaderboard", "--json", "--as-of", "2025-01-02"]) == 0
+    board = json.loads(capsys.readouterr().out)
+    assert [(r["name"], r["games"], r["last_game"]) for r in board] == [("Alice", 1, "2025-01-02"), ("Bob", 1, "2025-01-02")]
+    assert cli.main(["--db", path, "leaderboard", "--as-of", "last season"]) == 1
+    capsys.readouterr()
+
+    assert cli.main(["--db", path, "player-games", str(b), "--json"]) == 0
+    games = json.loads(capsys.readouterr().out)
+    assert [(g["match_id"], g["opponent"], g["score"]) for g in games] == [(1, "Alice", 0.0), (2, "Alice", 0.5)]
+    assert games[0]["elo_after"] < games[0]["elo_before"]
+
+
+def test_recompute_import_and_errors(club, tmp_path, capsys):
+    path, a, b = _club_file(club, tmp_path / "club.db")
+    before = repo.get_player(dbm.get_connection(path), a)
+
+    assert cli.main(["--db", path, "--timing", "recompute"]) == 0
+    assert "recompute:" in capsys.readouterr().err
+    assert cli.main(["--db", path, "recompute", "--from-match", "2"]) == 0
+    assert "from match 2" in capsys.readouterr().out
+    assert repo.get_player(dbm.get_connection(path), a) == before
+
+    matches = tmp_path / "more.jsonl"
+    matches.write_text('{"tournament": "T", "player1": "Alice", "player2": "Bob", "result": "0-1", "date": "2025-01-04"}\n')
+    assert cli.main(["--db", path, "import", str(matches), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["imported"] == 1
+
+    assert cli.main(["--db", path, "player-games", "99"]) == 1
+    assert "not found" in capsys.readouterr().err
@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+
+import chess_club.config as config
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_connection_applies_configured_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_CACHE_SIZE_KIB", 4096)
+    monkeypatch.setattr(config, "DB_BUSY_TIMEOUT_MS", 1234)
+    conn = dbm.get_connection(str(tmp_path / "club.db"))
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute("PRAGMA synchronous").fetchone() == (1,)
+    assert conn.execute("PRAGMA cache_size").fetchone() == (-4096,)
+    assert conn.execute("PRAGMA temp_store").fetchone() == (2,)
+    assert conn.execute("PRAGMA busy_timeout").fetchone() == (1234,)
+    assert conn.execute("PRAGMA foreign_keys").fetchone() == (1,)
+
+    monkeypatch.setattr(config, "DB_SYNCHRONOUS", "sometimes")
+    try:
+        dbm.get_connection(str(tmp_path / "other.db"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_read_pool_reads_while_writer_is_open(club, tmp_path):
+    path = tmp_path / "club.db"
+    writer, tid, (a, b) = club(path)
+    tournament.create_match(writer, tid, a, b, 1.0, "2025-01-01")
+    pool = dbm.ReadPool(str(path))
+    committed_elo = repo.get_player(writer, a)[2]
+
+    # a write transaction is left open while readers run in other threads
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE Players SET elo = 0 WHERE id = ?", (a,))
+    seen = {}
+
+    def read(name):
+        conn = pool.connection()
+        assert pool.connection() is conn
+        seen[name] = (id(conn), repo.get_player(conn, a)[2], repo.get_player_summary(conn, a)[0])
+
+    threads = [threading.Thread(target=read, args=(n,)) for n in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.commit()
+
+    assert len({conn_id for conn_id, _, _ in seen.values()}) == 3
+    # readers see the last committed state, not the pending update
+    assert {(elo, games) for _, elo, games in seen.values()} == {(committed_elo, 1)}
+    try:
+        pool.connection().execute("DELETE FROM Players")
+    except sqlite3.OperationalError:
+        pass
+    else:
+        raise AssertionError("read connections must not write")
+    pool.close()
+
+
+def test_read_pool_needs_a_file():
+    try:
+        dbm.ReadPool(":memory:")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
@@ -47,3 +47,26 @@ def test_delete_player_removes_player_matches_and_registrations():
 
     # remaining player still exists
     assert repo.get_player(conn, p2) is not None
+
+
+def test_delete_player_replays_only_affected_games(club, snapshot, monkeypatch):
+    conn, tid, (a, b, c, d, e, guest) = club(names=("A", "B", "C", "D", "E", "Guest"), tournament="T1")
+    games = [
+        (a, b, 1.0, "2025-01-01"), (c, d, 0.5, "2025-01-02"), (a, c, 0.0, "2025-02-01"),
+        (guest, b, 1.0, "2025-03-01"), (d, e, 1.0, "2025-03-02"), (b, c, 0.5, "2025-03-05"),
+        (guest, e, 0.0, "2025-03-06"), (a, d, 1.0, "2025-03-07"), (e, a, 0.5, "2025-03-09"),
+    ]
+    for p1, p2, result, day in games:
+        tournament.create_match(conn, tid, p1, p2, result, day)
+
+    replayed = []
+    targeted = ranking.recompute_after_removal
+    monkeypatch.setattr(ranking, "recompute_after_removal", lambda *args: replayed.append(targeted(*args)))
+    assert tournament.delete_player(conn, guest) is False
+    # B joins at the removed 03-01 game and E at 03-06, so only B-C and E-A
+    # are replayed; D-E (before E's removed game) and A-D keep their ratings
+    assert replayed == [2]
+
+    after_delete = snapshot(conn)
+    ranking.recompute(conn)
+    assert snapshot(conn) == after_delete
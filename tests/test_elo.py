@@ -1,3 +1,5 @@
+import pytest
+
 from chess_club import elo
 
 
@@ -16,3 +18,26 @@ def test_update_elo():
     new1, new2 = elo.update_elo(1200, 1200, 1, 40, 40)
     assert new1 > 1200
     assert new2 < 1200
+
+
+def _games(n=2000, seed=3):
+    import random
+    rng = random.Random(seed)
+    return [(rng.uniform(800, 2400), rng.uniform(800, 2400), rng.choice([0.0, 0.5, 1.0]),
+             rng.randrange(80), rng.randrange(80)) for _ in range(n)]
+
+
+def test_update_elo_batch_is_bit_identical():
+    np = pytest.importorskip("numpy")
+    rows = _games()
+    ra, rb, scores, ga, gb = (np.array(col) for col in zip(*rows))
+    new_a, new_b = elo.update_elo_batch(ra, rb, scores, elo.k_factor_batch(ga), elo.k_factor_batch(gb))
+    expected = [elo.update_elo(a, b, s, elo.k_factor(g), elo.k_factor(h)) for a, b, s, g, h in rows]
+    assert list(zip(new_a.tolist(), new_b.tolist())) == expected
+
+
+def test_update_elo_batch_pure_python_fallback(monkeypatch):
+    monkeypatch.setattr(elo, "np", None)
+    rows = [(a, b, s, elo.k_factor(g), elo.k_factor(h)) for a, b, s, g, h in _games(50)]
+    new_a, new_b = elo.update_elo_batch(*zip(*rows))
+    assert list(zip(new_a, new_b)) == [elo.update_elo(*row) for row in rows]
@@ -0,0 +1,107 @@
+from datetime import date
+
+import pytest
+
+import chess_club.config as config
+import chess_club.db as dbm
+import chess_club.engine as engine
+import chess_club.ratings as ratings
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_rate_match_is_pure_and_counts_inactivity():
+    day = date(2025, 3, 10).toordinal()
+    s1 = engine.PlayerState(1300.0, 1500.0, 80.0, 0.06, games=30, last_played=day - 40, last_match_id=1)
+    s2 = engine.PlayerState(1250.0, 1450.0, 120.0, 0.06, games=5, last_played=day, last_match_id=2)
+    before1 = engine.PlayerState(*(getattr(s1, name) for name in engine.PlayerState.__slots__))
+
+    new1, new2, audit = engine.rate_match(s1, s2, 1.0, day, match_id=9)
+    assert s1 == before1
+    assert (new1.games, new2.games) == (31, 6)
+    assert (new1.last_played, new1.last_match_id) == (day, 9)
+    assert audit.p1_elo_before == 1300.0 and audit.p1_elo_after == new1.elo
+    assert audit.p1_last_played_before == day - 40
+    assert new1.elo > s1.elo and new2.elo < s2.elo
+    # forty idle days widen player 1's deviation before the game is applied
+    rested = engine.PlayerState(1300.0, 1500.0, 80.0, 0.06, games=30, last_played=day, last_match_id=1)
+    assert new1.g2_rd > engine.rate_match(rested, s2, 1.0, day)[0].g2_rd
+
+
+def test_row_round_trip_and_defaults():
+    state = engine.PlayerState.from_row((None, None, 200.0, None, None, "2025-01-31", None))
+    assert state.elo == config.DEFAULT_ELO
+    assert (state.g2_rating, state.g2_rd, state.g2_vol) == (
+        config.G2_DEFAULT_RATING, config.G2_DEFAULT_RD, config.G2_DEFAULT_VOL)
+    assert state.games == 0
+    assert engine.PlayerState.from_row(state.to_row()) == state
+    assert state.to_row()[5] == "2025-01-31"
+    assert engine.date_ordinal("not a date") is None
+
+
+def test_compute_match_matches_replay():
+    conn = dbm.get_connection(":memory:")
+    dbm.init_db(conn)
+    a = repo.add_player(conn, "A")
+    b = repo.add_player(conn, "B")
+    tid = repo.add_tournament(conn, "T", "2025-01-01")
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-01")
+
+    audit = ratings.compute_match(conn, a, b, 0.5, "2025-02-01")
+    states = {}
+    matches = [(1, a, b, 1.0, "2025-01-01"), (2, a, b, 0.5, "2025-02-01")]
+    audits, _ = engine.replay(matches, states)
+    assert audits[1] == (2, audit)
+    assert states[a].games == 2
+    assert engine.audit_row(audit, 2)[16:] == ("2025-01-01", "2025-01-01", 2)
+
+
+def test_k_factor_follows_business_config(monkeypatch):
+    monkeypatch.setattr(config, "ELO_K_VALUES", [10, 10, 10])
+    s = engine.PlayerState.default()
+    new1, _, _ = engine.rate_match(s, s, 1.0)
+    assert new1.elo == config.DEFAULT_ELO + 5
+
+
+def _random_history(n_players=40, n_matches=600, seed=11):
+    import random
+    rng = random.Random(seed)
+    rows = []
+    for match_id in range(1, n_matches + 1):
+        p1, p2 = rng.sample(range(1, n_players + 1), 2)
+        result = rng.choice([1.0, 0.5, 0.0, 1.0, 0.0, None])
+        day = date(2024, 1, 1).toordinal() + match_id // 5 + rng.randrange(3)
+        rows.append((match_id, p1, p2, result, date.fromordinal(day).isoformat()))
+    return sorted(rows, key=lambda row: (row[4], row[0]))
+
+
+def test_wavefronts_keep_each_players_order():
+    matches = _random_history()
+    seen = {}
+    for wave in engine.wavefronts(matches):
+        players = [pid for i in wave for pid in matches[i][1:3]]
+        assert len(players) == len(set(players))
+        for i in wave:
+            for pid in matches[i][1:3]:
+                assert seen.get(pid, -1) < i
+                seen[pid] = i
+
+
+def test_replay_waves_equals_replay():
+    pytest.importorskip("numpy")
+    matches = _random_history()
+    seeded = {
+        3: engine.PlayerState(1410.0, 1620.0, 90.0, 0.058, games=25, last_played=date(2023, 12, 1).toordinal(),
+                              last_match_id=None),
+        7: engine.PlayerState(1190.5, 1400.0, 200.0, 0.06, games=3),
+        99: engine.PlayerState(1300.0, 1500.0, 120.0, 0.06, games=8),
+    }
+    positions = [(matches[i][4], matches[i][0]) for i in (0, 150, 151, 420)] + [("2030-01-01", 0)]
+
+    expected_states = dict(seeded)
+    expected = engine.replay(matches, expected_states, positions)
+    states = dict(seeded)
+    assert engine.replay_waves(matches, states, positions) == expected
+    assert states == expected_states
+    # narrow waves fall back to the sequential replay with the same results
+    assert engine.replay_waves(matches, dict(seeded), positions, min_width=10_000) == expected
@@ -0,0 +1,51 @@
+import csv
+import json
+
+import chess_club.export as export
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def _season(club):
+    conn, tid, (a, b, c) = club(names=("A", "B", "C"))
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-03")
+    tournament.create_match(conn, tid, b, c, 0.5, "2025-01-02")
+    tournament.create_match(conn, tid, c, a, 0.0, "2025-01-04")
+    return conn, tid, (a, b, c)
+
+
+def test_iterators_match_list_readers(club):
+    conn, tid, (a, _, _) = _season(club)
+    assert list(repo.iter_matches_ordered(conn, chunk_size=2)) == repo.get_all_matches_ordered(conn)
+    assert list(repo.iter_matches_for_player(conn, a, chunk_size=1)) == repo.list_matches_for_player(conn, a)
+    assert list(repo.iter_matches_for_tournament(conn, tid, chunk_size=2)) == repo.list_matches_for_tournament(conn, tid)
+    assert list(repo.iter_leaderboard(conn, chunk_size=1)) == [row[:-1] for row in repo.get_leaderboard(conn)]
+
+
+def test_export_matches_and_leaderboard(club, tmp_path):
+    conn, _, _ = _season(club)
+
+    assert export.export_matches(conn, tmp_path / "matches.csv", chunk_size=2) == 3
+    with open(tmp_path / "matches.csv", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [row["date"] for row in rows] == ["2025-01-02", "2025-01-03", "2025-01-04"]
+    assert (rows[1]["player1"], rows[1]["player2"], rows[1]["result"]) == ("A", "B", "1.0")
+    assert float(rows[1]["player1_elo_after"]) > float(rows[1]["player1_elo_before"])
+    assert list(rows[0]) == list(repo.MATCH_HISTORY_FIELDS)
+
+    assert export.export_leaderboard(conn, tmp_path / "board.jsonl") == 3
+    with open(tmp_path / "board.jsonl") as fh:
+        board = [json.loads(line) for line in fh]
+    assert [(r["rank"], r["id"]) for r in board] == [(i, row[0]) for i, row in enumerate(repo.get_leaderboard(conn), 1)]
+    assert board[0]["official"] is False
+
+
+def test_cli_export(club, tmp_path, capsys):
+    import chess_club.cli as cli
+
+    path = tmp_path / "club.db"
+    conn, _, _ = _season(club)
+    conn.execute("VACUUM INTO ?", (str(path),))
+    assert cli.main(["--db", str(path), "export", "matches", "--format", "jsonl", "--chunk-size", "1"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [2, 1, 3]
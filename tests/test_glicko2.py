@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import chess_club.glicko2 as glicko2
+
+
+def _random_rows(n, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        rows.append((
+            rng.uniform(800, 2400), rng.uniform(30, 350), rng.uniform(0.03, 0.09),
+            rng.uniform(800, 2400), rng.uniform(30, 350), rng.choice([0.0, 0.5, 1.0]),
+            rng.choice([0, 0, 3, 40, 400]),
+        ))
+    return rows
+
+
+def _scalar(rows):
+    return [glicko2.glicko2_update(r, rd, vol, opp_r, opp_rd, None, s, days=d)
+            for r, rd, vol, opp_r, opp_rd, s, d in rows]
+
+
+def test_batch_matches_scalar_with_numpy():
+    pytest.importorskip("numpy")
+    rows = _random_rows(500)
+    new_r, new_rd, new_vol = glicko2.glicko2_update_batch(*zip(*rows))
+    assert list(zip(new_r.tolist(), new_rd.tolist(), new_vol.tolist())) == _scalar(rows)
+
+
+def test_batch_pure_python_fallback(monkeypatch):
+    monkeypatch.setattr(glicko2, "np", None)
+    rows = _random_rows(50)
+    new_r, new_rd, new_vol = glicko2.glicko2_update_batch(*zip(*rows))
+    assert list(zip(new_r, new_rd, new_vol)) == _scalar(rows)
+
+
+def test_period_update_matches_glickman_example():
+    # worked example from Glickman's "Example of the Glicko-2 system"
+    r, rd, vol = glicko2.glicko2_period_update(1500, 200, 0.06, [(1400, 30, 1), (1550, 100, 0), (1700, 300, 0)])
+    assert (round(r, 2), round(rd, 2), round(vol, 5)) == (1464.05, 151.52, 0.06)
+
+
+def test_period_batch_matches_scalar():
+    rng = random.Random(3)
+    players = [(rng.uniform(800, 2400), rng.uniform(30, 350), rng.uniform(0.03, 0.09), rng.choice([0, 3, 40]))
+               for _ in range(40)]
+    games = [(j, rng.uniform(800, 2400), rng.uniform(30, 350), rng.choice([0.0, 0.5, 1.0]))
+             for j in range(len(players)) for _ in range(rng.randint(1, 9))]
+    rng.shuffle(games)
+    expected = [
+        glicko2.glicko2_period_update(r, rd, vol, [game[1:] for game in games if game[0] == j], days=days)
+        for j, (r, rd, vol, days) in enumerate(players)
+    ]
+
+    out = glicko2.glicko2_period_update_batch(*zip(*players), *zip(*games))
+    if glicko2.np is not None:
+        out = [col.tolist() for col in out]
+    assert list(zip(*out)) == expected
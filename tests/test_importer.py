@@ -0,0 +1,79 @@
+import json
+
+import chess_club.importer as importer
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_csv_import_creates_names_and_reports_bad_rows(club, snapshot, tmp_path):
+    conn, _, _ = club(names=(), tournament=None)
+    path = tmp_path / "season.csv"
+    path.write_text(
+        "tournament,player1,player2,result,date\n"
+        "Spring,Ann,Bob,1-0,2025-03-01\n"
+        "Spring,Cat,Dan,1/2-1/2,2025-03-01\n"
+        "Spring,Ann,Ann,1,2025-03-02\n"
+        "Spring,Bob,Cat,2,2025-03-02\n"
+        "Spring,Bob,Dan,0,03/02/2025\n"
+        "Summer,Dan,Ann,0.5,2025-06-01\n"
+        "Summer,Bob,Cat,,2025-06-08\n",
+        encoding="utf-8",
+    )
+    report = importer.import_matches(conn, str(path), create_missing=True, chunk_size=2)
+
+    assert report["imported"] == 4
+    assert [line for line, _ in report["errors"]] == [4, 5, 6]
+    assert report["earliest_date"] == "2025-03-01"
+    assert report["full_recompute"] is False
+    assert repo.get_tournaments_by_name(conn, ["Summer"])["Summer"][1] is False
+    assert conn.execute("SELECT date FROM Tournaments WHERE name = 'Summer'").fetchone() == ("2025-06-01",)
+    # the scheduled row is stored but not counted
+    ids = repo.get_player_ids_by_name(conn, ["Bob", "Cat"])
+    assert repo.get_player_summary(conn, ids["Bob"])[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM Matches WHERE result IS NULL").fetchone() == (1,)
+
+    imported = snapshot(conn)
+    ranking.recompute(conn)
+    assert snapshot(conn) == imported
+
+
+def test_jsonl_import_replays_from_earliest_date(club, snapshot, tmp_path):
+    conn, tid, pids = club(names=("Ann", "Bob", "Cat"), tournament="Club")
+    done = repo.add_tournament(conn, "Closed", "2024-01-01")
+    repo.complete_tournament(conn, done)
+    tournament.create_match(conn, tid, pids[0], pids[1], 1.0, "2025-01-05")
+    tournament.create_match(conn, tid, pids[1], pids[2], 0.0, "2025-02-05")
+
+    rows = [
+        {"tournament": "Club", "player1": "Cat", "player2": "Ann", "result": "0-1", "date": "2025-01-20"},
+        {"tournament": "Club", "player1": "Ann", "player2": "Zed", "result": 1, "date": "2025-01-21"},
+        {"tournament": "Closed", "player1": "Ann", "player2": "Bob", "result": 1, "date": "2024-01-01"},
+        {"tournament": "Nowhere", "player1": "Ann", "player2": "Bob", "result": 1, "date": "2025-01-22"},
+        ["not", "an", "object"],
+    ]
+    path = tmp_path / "results.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n{broken\n", encoding="utf-8")
+
+    report = importer.import_matches(conn, str(path))
+    assert report["imported"] == 1
+    assert [line for line, _ in report["errors"]] == [2, 3, 4, 5, 6]
+    assert "completed" in report["errors"][1][1]
+    # the imported game lands between the two existing ones and is replayed
+    assert repo.get_player_summary(conn, pids[0])[:2] == (2, 2)
+
+    imported = snapshot(conn)
+    ranking.recompute(conn)
+    assert snapshot(conn) == imported
+
+
+def test_import_rejects_unknown_format(club, tmp_path):
+    conn, _, _ = club(names=(), tournament=None)
+    path = tmp_path / "results.txt"
+    path.write_text("", encoding="utf-8")
+    try:
+        importer.import_matches(conn, str(path))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
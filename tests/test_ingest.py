@@ -0,0 +1,82 @@
+import asyncio
+
+import chess_club.ingest as ingest
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def _ratings(conn):
+    return conn.execute("SELECT id, elo, g2_rating, g2_rd, g2_vol, last_game_date FROM Players ORDER BY id").fetchall()
+
+
+PLAYERS = ("P0", "P1", "P2", "P3")
+
+SUBMISSIONS = [(0, 1, 1.0, "2025-01-03"), (2, 3, 0.5, "2025-01-02"), (0, 2, 0.0, "2025-01-03"), (1, 3, 1.0, "2025-01-04")]
+
+
+def test_queued_results_share_one_commit_in_date_order(club, tmp_path):
+    conn, tid, ids = club(tmp_path / "queued.db", names=PLAYERS, check_same_thread=False)
+    commits = []
+    conn.set_trace_callback(lambda sql: commits.append(sql) if sql.upper().startswith("COMMIT") else None)
+
+    async def main():
+        async with ingest.ResultQueue(conn) as queue:
+            return await asyncio.gather(*(
+                queue.submit_result(tid, ids[a], ids[b], result, day) for a, b, result, day in SUBMISSIONS
+            ))
+
+    outcomes = asyncio.run(main())
+    conn.set_trace_callback(None)
+    assert len(commits) == 1
+    # ids follow (date, submission) order
+    assert [match_id for match_id, _ in outcomes] == [2, 1, 3, 4]
+
+    expected, etid, eids = club(tmp_path / "sequential.db", names=PLAYERS, check_same_thread=False)
+    for a, b, result, day in sorted(SUBMISSIONS, key=lambda s: s[3]):
+        tournament.create_match(expected, etid, eids[a], eids[b], result, day)
+    assert _ratings(conn) == _ratings(expected)
+    assert outcomes[0][1].p1_elo_after == expected.execute(
+        "SELECT player1_elo_after FROM Matches WHERE id = 2").fetchone()[0]
+
+
+def test_backdated_and_invalid_submissions(club, tmp_path):
+    conn, tid, ids = club(tmp_path / "club.db", names=PLAYERS, check_same_thread=False)
+    tournament.create_match(conn, tid, ids[0], ids[1], 1.0, "2025-01-05")
+
+    outcomes = ingest.record_batch(conn, [
+        (tid, ids[2], ids[0], 1.0, "2025-01-02"),
+        (tid, ids[1], 999, 0.5, "2025-01-06"),
+        (tid, ids[1], ids[2], 0.0, "2025-01-07"),
+    ])
+    assert isinstance(outcomes[1], ValueError)
+    assert [outcomes[0][0], outcomes[2][0]] == [2, 3]
+    assert repo.count_matches_for_tournament(conn, tid) == 3
+
+    # the backdated game was rated before the stored one, as a replay would
+    before = _ratings(conn)[:3]
+    ranking.recompute(conn)
+    assert _ratings(conn)[:3] == before
+    assert tuple(outcomes[0][1][:16]) == repo.get_match_audits(conn, [2])[2][:16]
+
+
+def test_submissions_during_close_are_refused(club, tmp_path):
+    conn, tid, ids = club(tmp_path / "club.db", names=PLAYERS, check_same_thread=False)
+
+    async def main():
+        queue = ingest.ResultQueue(conn)
+        queue.start()
+        first = asyncio.create_task(queue.submit_result(tid, ids[0], ids[1], 1.0, "2025-01-02"))
+        await asyncio.sleep(0)
+        closing = asyncio.create_task(queue.close())
+        await asyncio.sleep(0)
+        try:
+            await queue.submit_result(tid, ids[2], ids[3], 0.5, "2025-01-03")
+        except RuntimeError as e:
+            late = e
+        await closing
+        return await first, late
+
+    (match_id, _), late = asyncio.run(asyncio.wait_for(main(), timeout=10))
+    assert match_id == 1 and "closing" in str(late)
+    assert len(repo.get_all_matches_ordered(conn)) == 1
@@ -0,0 +1,75 @@
+import datetime
+
+import chess_club.config as config
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+NAMES = ("A", "B", "C", "D", "E")
+
+
+def _season(club, monkeypatch):
+    monkeypatch.setattr(config, "MIN_GAMES_FOR_OFFICIAL", 3)
+    conn, tid, ids = club(names=NAMES)
+    # A beats B three times and C once: A and B official, C provisional
+    for day in ("2025-01-02", "2025-01-03", "2025-01-04"):
+        tournament.create_match(conn, tid, ids[0], ids[1], 1.0, day)
+    tournament.create_match(conn, tid, ids[0], ids[2], 1.0, "2025-01-05")
+    return conn, ids
+
+
+def test_leaderboard_rows_sections_and_paging(club, monkeypatch):
+    conn, (a, b, c, d, e) = _season(club, monkeypatch)
+
+    rows = repo.get_leaderboard(conn)
+    assert [row[0] for row in rows] == [a, d, e, c, b]
+    assert rows[0][6:12] == (4, 4, 0, 0, "2025-01-05", True)
+    assert rows[1][6:12] == (0, 0, 0, 0, None, False)
+    assert {row[-1] for row in rows} == {5}
+
+    official = repo.get_leaderboard(conn, official=True)
+    assert [row[0] for row in official] == [a, b]
+    page = repo.get_leaderboard(conn, official=False, limit=2, offset=2)
+    assert [row[0] for row in page] == [c]
+    assert page[0][-1] == 3
+
+    monkeypatch.setattr(config, "RATING_SYSTEM", "glicko2")
+    # players without a Glicko-2 rating yet sort last
+    assert [row[0] for row in repo.get_leaderboard(conn)][-2:] == [d, e]
+
+
+def test_show_leaderboard_prints_requested_page(club, monkeypatch, capsys):
+    conn, _ = _season(club, monkeypatch)
+
+    assert ranking.show_leaderboard(conn, True, page_size=2, page=2) == 2
+    out = capsys.readouterr().out
+    assert "page 2/2" in out
+    assert "   3. C" in out
+    assert " A " not in out and " D " not in out
+
+    assert ranking.show_leaderboard(conn, False, page_size=0) == 1
+    out = capsys.readouterr().out
+    assert "   1. A" in out and "   2. B" in out
+    assert "3 provisional players hidden" in out
+
+
+def test_leaderboard_as_of_matches_a_replay_of_earlier_games(club, monkeypatch, capsys):
+    conn, (a, b, c, d, e) = _season(club, monkeypatch)
+    tournament.create_match(conn, repo.add_tournament(conn, "U", "2025-02-01"), b, c, 1.0, "2025-02-01")
+
+    # the same club with only the games up to the cutoff, fully replayed
+    scratch, tid, _ = club(names=NAMES)
+    for _, p1, p2, result, date in repo.get_all_matches_ordered(conn):
+        if date <= "2025-01-04":
+            repo.insert_match(scratch, tid, p1, p2, result, date)
+    ranking.recompute(scratch)
+
+    expected = [row[:-1] for row in repo.get_leaderboard(scratch)]
+    assert ranking.leaderboard_as_of(conn, "2025-01-04") == expected
+    assert [row[0] for row in ranking.leaderboard_as_of(conn, "2025-01-04", official=True)] == [a, b]
+    assert ranking.leaderboard_as_of(conn, "2025-01-31")[3][:2] == (c, "C")
+
+    ranking.show_leaderboard_as_of(conn, datetime.date(2025, 1, 4), limit=1)
+    out = capsys.readouterr().out
+    assert "as of 2025-01-04" in out and "   1. A" in out and " B " not in out
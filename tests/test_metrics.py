@@ -0,0 +1,43 @@
+import chess_club.config as config
+import chess_club.metrics as metrics
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_operations_are_timed_and_count_their_sql(club, monkeypatch):
+    conn, tid, (a, b) = club()
+    original = repo.get_player
+    monkeypatch.setattr(config, "METRICS_SLOW_QUERY_MS", 0)
+    metrics.reset()
+    metrics.enable(conn)
+    try:
+        tournament.create_match(conn, tid, a, b, 1.0, "2025-01-02")
+        repo.list_matches_for_player(conn, a)
+        snap = metrics.snapshot()
+    finally:
+        metrics.disable()
+    assert repo.get_player is original
+
+    ops = snap["operations"]
+    assert ops["ratings.compute_match"]["calls"] == 1
+    assert ops["service.record_match_result"]["statements"] >= 3
+    # inclusive: the service call's statements include its repo calls
+    assert ops["service.record_match_result"]["statements"] >= ops["repo.bulk_update_match_audits"]["statements"]
+    assert snap["statements"] >= sum(ops[name]["statements"] for name in ("ratings.compute_match", "service.record_match_result"))
+    assert snap["player_cache"]["hits"] >= 1
+
+    history = [q for q in snap["slow_queries"] if q["operation"] == "repo.list_matches_for_player"]
+    assert history and any("idx_matches_player1" in step for step in history[0]["plan"])
+
+
+def test_report_prints_breakdown(club, capsys):
+    conn, tid, (a, b) = club()
+    metrics.reset()
+    metrics.enable(conn)
+    try:
+        repo.get_player(conn, a)
+        metrics.report()
+    finally:
+        metrics.disable()
+    out = capsys.readouterr().out
+    assert "repo.get_player" in out and "player cache: 0 hits, 1 misses" in out
@@ -0,0 +1,114 @@
+import random
+import time
+
+import pytest
+
+import chess_club.pairing as pairing
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_first_round_pairs_top_half_against_bottom_half():
+    players = [(pid, 2000 - 10 * pid) for pid in range(1, 9)]
+    rnd = pairing.pair_round(players, [])
+    assert rnd.number == 1 and rnd.bye is None
+    # higher-ranked player has white on odd rounds
+    assert rnd.pairs == [(1, 5), (2, 6), (3, 7), (4, 8)]
+
+    rnd = pairing.pair_round(players + [(9, 1000)], [])
+    assert rnd.bye == 9
+
+
+def test_bye_scores_a_point():
+    players = [(pid, 2000 - 10 * pid) for pid in range(1, 8)]
+    first = pairing.pair_round(players, [])
+    assert first.bye == 7 and first.pairs == [(1, 4), (2, 5), (3, 6)]
+
+    history = [(1, 4, 1.0), (2, 5, 0.0), (3, 6, 1.0)]
+    assert pairing.standings(players, history, {7: 1})[7]["score"] == pairing.BYE_SCORE
+    second = pairing.pair_round(players, history, {7: 1})
+    # the bye moves on and its holder is paired in the top score group
+    assert second.number == 2 and second.bye == 6
+    assert {frozenset(pair) for pair in second.pairs[:2]} == {frozenset((1, 5)), frozenset((3, 7))}
+
+
+def test_large_open_avoids_rematches_and_balances_colors():
+    rng = random.Random(7)
+    players = [(pid, rng.randint(1200, 2600)) for pid in range(1, 502)]
+    rating = dict(players)
+    history = []
+    byes = {}
+    for _ in range(9):
+        started = time.perf_counter()
+        rnd = pairing.pair_round(players, history, byes)
+        assert time.perf_counter() - started < 1.0
+        assert len(rnd.pairs) == 250 and rnd.bye not in byes
+        byes[rnd.bye] = 1
+        for white, black in rnd.pairs:
+            expected = 1 / (1 + 10 ** ((rating[black] - rating[white]) / 400))
+            draw = rng.random()
+            history.append((white, black, 0.5 if abs(draw - expected) < 0.1 else float(draw < expected)))
+
+    games = [frozenset(pair[:2]) for pair in history]
+    assert len(games) == len(set(games))
+    table = pairing.standings(players, history)
+    balances = [abs(entry["balance"]) for entry in table.values()]
+    assert max(balances) <= 3 and sum(b <= 1 for b in balances) > 0.95 * len(balances)
+
+
+def test_pair_swiss_round_schedules_matches(club):
+    conn, tid, pids = club(names=[f"P{i}" for i in range(7)], tournament="Open", date="2025-03-01", register=True)
+
+    first = tournament.pair_swiss_round(conn, tid)
+    assert len(first.pairs) == 3 and first.bye in pids
+    rows = repo.list_matches_for_tournament(conn, tid)
+    assert sorted(row[0] for row in rows) == sorted(mid for mid, _, _ in first.pairs)
+    assert all(row[3] is None and row[4] == "2025-03-01" for row in rows)
+    with pytest.raises(ValueError):
+        tournament.pair_swiss_round(conn, tid)
+
+    for mid, _, _ in first.pairs:
+        tournament.update_match(conn, mid, 1.0)
+    assert repo.get_tournament_byes(conn, tid) == {first.bye: 1}
+    second = tournament.pair_swiss_round(conn, tid, "2025-03-02")
+    assert second.number == 2 and second.bye != first.bye
+    assert repo.get_tournament_byes(conn, tid) == {first.bye: 1, second.bye: 1}
+    played = {frozenset(pair[1:]) for pair in first.pairs}
+    assert not played & {frozenset(pair[1:]) for pair in second.pairs}
+    # first-round winners all had white, so they get black against anyone else
+    winners = {white for _, white, _ in first.pairs}
+    assert all(black in winners for _, white, black in second.pairs if (white in winners) != (black in winners))
+
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT player1_id, player2_id, result FROM Matches "
+        "WHERE tournament_id = ? ORDER BY id", (tid,)))
+    assert "COVERING INDEX idx_matches_tournament_pairs" in plan
+
+
+def test_round_robin_follows_berger_tables():
+    rounds = pairing.round_robin([1, 2, 3, 4, 5, 6])
+    assert [rnd.pairs for rnd in rounds[:2]] == [[(1, 6), (2, 5), (3, 4)], [(6, 4), (5, 3), (1, 2)]]
+
+    rounds = pairing.round_robin(range(1, 8), double=True)
+    assert len(rounds) == 14 and sorted(rnd.bye for rnd in rounds[:7]) == list(range(1, 8))
+    games = [pair for rnd in rounds for pair in rnd.pairs]
+    assert len(set(games)) == 42 and {(b, a) for a, b in games} == set(games)
+
+
+def test_generate_round_robin_bulk_inserts_schedule(club):
+    conn, tid, pids = club(names=[f"P{i}" for i in range(5)], tournament="Open", date="2025-03-01", register=True)
+
+    rounds = tournament.generate_round_robin(conn, tid)
+    rows = repo.list_matches_for_tournament(conn, tid)
+    assert len(rounds) == 5 and len(rows) == 10
+    assert all(row[3] is None for row in rows)
+    assert [row[:2] for row in repo.get_tournament_pairings(conn, tid)] == [
+        pair for rnd in rounds for pair in rnd.pairs]
+    with pytest.raises(ValueError):
+        tournament.generate_round_robin(conn, tid)
+
+    mid = rows[0][0]
+    tournament.update_match(conn, mid, 1.0)
+    assert len(repo.list_matches_for_tournament(conn, tid)) == 10
+    assert repo.get_match(conn, mid)[4] == 1.0
+    assert repo.rating_as_of(conn, repo.get_match(conn, mid)[2], "2025-03-01")["match_id"] == mid
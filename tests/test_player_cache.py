@@ -0,0 +1,71 @@
+import chess_club.cache as cache
+import chess_club.config as config
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def test_lru_is_bounded_and_counts_hits():
+    loads = []
+
+    def load(conn, ids):
+        loads.append(list(ids))
+        return {pid: (pid, f"P{pid}") for pid in ids if pid != 9}
+
+    conn = dbm.get_connection(":memory:")
+    lru = cache.PlayerCache(2)
+    assert lru.lookup(conn, [1, 2], load) == {1: (1, "P1"), 2: (2, "P2")}
+    assert lru.lookup(conn, [1], load) == {1: (1, "P1")}
+    lru.lookup(conn, [3, 9], load)  # evicts 2, the least recently used
+    lru.lookup(conn, [1, 2, 9], load)
+    assert loads == [[1, 2], [3, 9], [2, 9]]
+    assert lru.stats() == {"hits": 2, "misses": 6, "size": 2, "maxsize": 2, "invalidations": 0, "resets": 0}
+
+
+def test_repo_reads_hit_cache_until_a_write(club, tmp_path):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+    stats = conn.player_cache.stats
+
+    assert repo.get_player(conn, a)[:2] == (a, "A")
+    assert repo.get_player_glicko(conn, a) == (None, None, None)
+    assert repo.get_player(conn, 999) is None
+    assert stats()["hits"] == 1 and stats()["misses"] == 2
+
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-02")
+    states = repo.get_player_rating_states(conn, [a, b])
+    assert states[a][4] == states[b][4] == 1
+    assert states[a][0] > config.DEFAULT_ELO > states[b][0]
+    assert repo.get_player(conn, a)[3] == "2025-01-02"
+
+    with dbm.UnitOfWork(conn):
+        repo.update_player_profile(conn, a, elo=1234.0)
+    assert repo.get_player(conn, a)[2] == 1234.0
+
+    with dbm.UnitOfWork(conn):
+        repo.delete_player(conn, b)
+    assert repo.get_player(conn, b) is None
+    assert repo.get_player_rating_states(conn, [a])[a][4] == 0
+
+
+def test_other_connection_write_resets_cache(club, tmp_path):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+    assert repo.get_player(conn, a)[2] == config.DEFAULT_ELO
+
+    other = dbm.get_connection(str(tmp_path / "club.db"))
+    with dbm.UnitOfWork(other):
+        repo.update_player_profile(other, a, elo=1600.0)
+
+    assert repo.get_player(conn, a)[2] == 1600.0
+    assert conn.player_cache.resets == 1
+
+
+def test_rollback_drops_cached_rows(club, tmp_path):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+    try:
+        with dbm.UnitOfWork(conn):
+            repo.update_player_profile(conn, a, elo=1700.0)
+            assert repo.get_player(conn, a)[2] == 1700.0
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert repo.get_player(conn, a)[2] == config.DEFAULT_ELO
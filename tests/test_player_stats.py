@@ -0,0 +1,73 @@
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+import chess_club.ranking as ranking
+
+
+def _expected_stats(conn):
+    """Brute-force PlayerStats from Matches for comparison."""
+    stats = {}
+    rows = conn.execute("SELECT player1_id, player2_id, result, date FROM Matches WHERE result IS NOT NULL").fetchall()
+    for p1, p2, result, d in rows:
+        for pid, score in ((p1, result), (p2, 1.0 - result)):
+            games, wins, draws, losses, last = stats.get(pid, (0, 0, 0, 0, None))
+            stats[pid] = (
+                games + 1,
+                wins + (score == 1.0),
+                draws + (score == 0.5),
+                losses + (score == 0.0),
+                max(last, d) if last else d,
+            )
+    return stats
+
+
+def _stored_stats(conn):
+    rows = conn.execute("SELECT player_id, games, wins, draws, losses, last_game FROM PlayerStats").fetchall()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _season(club):
+    conn, t1, (a, b, c) = club(names=("A", "B", "C"), tournament="T1")
+    t2 = repo.add_tournament(conn, "T2", "2025-02-01")
+    tournament.create_match(conn, t1, a, b, 1.0, "2025-01-01")
+    tournament.create_match(conn, t1, b, c, 0.5, "2025-01-02")
+    tournament.create_match(conn, t2, c, a, 0.0, "2025-02-01")
+    tournament.create_match(conn, t2, a, b, 0.5, "2025-02-02")
+    return conn, (a, b, c), (t1, t2)
+
+
+def test_stats_follow_match_writes(club):
+    conn, (a, b, c), _ = _season(club)
+    assert _stored_stats(conn) == _expected_stats(conn)
+    assert repo.get_player_summary(conn, a) == (3, 2, 1, 0, "2025-02-02")
+    assert repo.games_played_for_player(conn, c) == 2
+
+    mid = repo.get_all_matches_ordered(conn)[0][0]
+    tournament.update_match(conn, mid, 0.0, "2025-01-03")
+    assert _stored_stats(conn) == _expected_stats(conn)
+
+    repo.delete_match(conn, mid)
+    assert _stored_stats(conn) == _expected_stats(conn)
+
+
+def test_stats_follow_player_and_tournament_deletes(club):
+    conn, (a, b, c), (t1, t2) = _season(club)
+    repo.delete_tournament(conn, t1)
+    assert _stored_stats(conn) == _expected_stats(conn)
+
+    repo.delete_player(conn, a)
+    assert _stored_stats(conn) == _expected_stats(conn)
+    assert repo.get_player_summary(conn, c) == (0, 0, 0, 0, None)
+
+
+def test_recompute_and_migration_rebuild_stats(club):
+    conn, _, _ = _season(club)
+    expected = _expected_stats(conn)
+
+    conn.execute("UPDATE PlayerStats SET games = 99")
+    ranking.recompute(conn)
+    assert _stored_stats(conn) == expected
+
+    conn.execute("DROP TABLE PlayerStats")
+    dbm.migrate_add_player_stats(conn)
+    assert _stored_stats(conn) == expected
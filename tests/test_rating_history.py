@@ -0,0 +1,63 @@
+import chess_club.db as dbm
+import chess_club.ranking as ranking
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def _season(club):
+    conn, tid, (a, b, c) = club(names=("A", "B", "C"))
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-02")
+    tournament.create_match(conn, tid, b, c, 0.5, "2025-01-05")
+    tournament.create_match(conn, tid, a, c, 0.0, "2025-01-09")
+    return conn, tid, (a, b, c)
+
+
+def _history(conn, pids):
+    return {pid: repo.list_rating_history(conn, pid) for pid in pids}
+
+
+def test_rating_as_of_follows_match_audits(club):
+    conn, _, (a, b, c) = _season(club)
+
+    assert repo.rating_as_of(conn, a, "2025-01-01") is None
+    first = repo.rating_as_of(conn, a, "2025-01-08")
+    assert (first["date"], first["match_id"]) == ("2025-01-02", 1)
+    assert first["elo"] == repo.list_matches_for_player(conn, a)[0][6]
+    assert repo.rating_as_of(conn, a, "2030-01-01")["elo"] == repo.get_player(conn, a)[2]
+
+    curve = repo.list_rating_history(conn, b, start="2025-01-03")
+    assert [row[:2] for row in curve] == [("2025-01-05", 2)]
+    assert [row[1] for row in repo.list_rating_history(conn, c, end="2025-01-05")] == [2]
+
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM RatingHistory WHERE player_id = ? AND date <= ? "
+        "ORDER BY date DESC, match_id DESC LIMIT 1", (a, "2025-01-08")))
+    assert "PRIMARY KEY" in plan and "TEMP B-TREE" not in plan
+
+
+def test_history_is_rewritten_by_updates_and_recompute(club):
+    conn, _, (a, b, c) = _season(club)
+
+    # moving the first game after the others replays every later match
+    tournament.update_match(conn, 1, 0.0, "2025-01-10")
+    assert [row[1] for row in repo.list_rating_history(conn, a)] == [3, 1]
+    assert repo.rating_as_of(conn, b, "2025-01-10")["elo"] == repo.get_player(conn, b)[2]
+
+    incremental = _history(conn, (a, b, c))
+    ranking.recompute(conn)
+    assert _history(conn, (a, b, c)) == incremental
+
+    repo.delete_match(conn, 3)
+    assert [row[1] for row in repo.list_rating_history(conn, c)] == [2]
+    assert [row[6:] for row in repo.list_rating_history(conn, a)] == [(0.0, 1, 0, 0)]
+
+
+def test_migration_backfills_from_audits(club):
+    conn, _, (a, b, c) = _season(club)
+    expected = _history(conn, (a, b, c))
+    assert [row[6:] for row in expected[a]] == [(1.0, 1, 1, 0), (0.0, 2, 1, 0)]
+    conn.execute("DROP TABLE RatingHistory")
+    conn.execute(f"PRAGMA user_version = {dbm.MIGRATIONS.index(dbm.migrate_add_rating_history)}")
+
+    dbm.init_db(conn)
+    assert _history(conn, (a, b, c)) == expected
@@ -0,0 +1,125 @@
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+import chess_club.ranking as ranking
+import chess_club.config as config
+
+
+def _club_with_history(club):
+    conn, tid, pids = club(names=("A", "B", "C", "D", "E"), tournament="T1")
+    games = [
+        (0, 1, 1.0, "2025-01-01"), (2, 3, 0.5, "2025-01-01"), (0, 2, 0.0, "2025-01-15"),
+        (1, 3, 1.0, "2025-02-03"), (3, 0, 0.5, "2025-03-20"), (1, 2, 0.0, "2025-03-20"),
+        (0, 1, 1.0, "2025-06-01"), (2, 3, 1.0, "2025-06-02"),
+    ]
+    for i, j, result, d in games:
+        tournament.create_match(conn, tid, pids[i], pids[j], result, d)
+    return conn, pids
+
+
+def test_recompute_reproduces_incremental_ratings(club, snapshot):
+    conn, pids = _club_with_history(club)
+    # the idle player has no Glicko-2 values until the first recompute
+    repo.update_player_profile(conn, pids[4], g2_rating=config.G2_DEFAULT_RATING,
+                               g2_rd=config.G2_DEFAULT_RD, g2_vol=config.G2_DEFAULT_VOL)
+    before = snapshot(conn)
+
+    ranking.recompute(conn)
+
+    assert snapshot(conn) == before
+
+
+def test_recompute_resets_players_without_games(club):
+    conn, pids = _club_with_history(club)
+    repo.update_player_profile(conn, pids[4], elo=1500.0, g2_rating=1700.0)
+
+    ranking.recompute(conn)
+
+    row = conn.execute(
+        "SELECT id, elo, g2_rating, g2_rd, g2_vol, last_game_date, last_game_match_id FROM Players WHERE id = ?",
+        (pids[4],)).fetchone()
+    assert row[1] == config.DEFAULT_ELO
+    assert row[2] == config.G2_DEFAULT_RATING
+    assert row[5] is None
+    assert row[6] is None
+
+
+def _sections_club(club):
+    """Two sections of three players that never meet, plus an idle player."""
+    conn, tid, pids = club(names=("A", "B", "C", "X", "Y", "Z", "Idle"), tournament="T1")
+    games = [
+        (0, 1, 1.0, "2025-01-01"), (3, 4, 0.5, "2025-01-01"), (1, 2, 0.0, "2025-01-08"),
+        (4, 5, 1.0, "2025-01-09"), (2, 0, 0.5, "2025-02-01"), (5, 3, 0.0, "2025-02-01"),
+        (0, 1, 0.0, "2025-03-01"), (3, 5, 1.0, "2025-03-02"), (1, 2, 1.0, "2025-03-03"),
+    ]
+    for i, j, result, d in games:
+        tournament.create_match(conn, tid, pids[i], pids[j], result, d)
+    return conn
+
+
+def test_parallel_recompute_matches_serial(club, snapshot, monkeypatch):
+    monkeypatch.setattr(config, "CHECKPOINT_INTERVAL", 4)
+    monkeypatch.setattr(config, "RECOMPUTE_PARALLEL_MIN_MATCHES", 0)
+    checkpoints = (
+        "SELECT c.match_date, c.match_id, p.player_id, p.elo, p.g2_rating, p.games, p.last_played "
+        "FROM RatingCheckpoints c JOIN RatingCheckpointPlayers p ON p.checkpoint_id = c.id "
+        "ORDER BY c.match_id, p.player_id"
+    )
+
+    monkeypatch.setattr(config, "RECOMPUTE_WORKERS", 1)
+    serial_conn = _sections_club(club)
+    ranking.recompute(serial_conn)
+    serial = snapshot(serial_conn), serial_conn.execute(checkpoints).fetchall()
+
+    pools = []
+    executor = ranking.ProcessPoolExecutor
+    monkeypatch.setattr(ranking, "ProcessPoolExecutor", lambda **kw: pools.append(kw) or executor(**kw))
+    monkeypatch.setattr(config, "RECOMPUTE_WORKERS", 2)
+    parallel_conn = _sections_club(club)
+    ranking.recompute(parallel_conn)
+    parallel = snapshot(parallel_conn), parallel_conn.execute(checkpoints).fetchall()
+
+    # one worker per section, and the merged write matches the serial replay
+    assert [kw["max_workers"] for kw in pools] == [2]
+    assert parallel == serial
+    assert sorted({row[:2] for row in serial[1]}) == [("2025-01-09", 4), ("2025-03-02", 8)]
+
+
+def test_wave_recompute_matches_sequential(club, snapshot, monkeypatch):
+    conn, pids = _club_with_history(club)
+    monkeypatch.setattr(config, "RECOMPUTE_WAVE_MIN_WIDTH", 0)
+    ranking.recompute(conn)
+    sequential = snapshot(conn)
+
+    monkeypatch.setattr(config, "RECOMPUTE_WAVE_MIN_WIDTH", 1)
+    repo.update_player_profile(conn, pids[0], elo=0.0)
+    ranking.recompute(conn)
+    assert snapshot(conn) == sequential
+
+
+def test_rating_periods_batch_each_players_games(club, snapshot, monkeypatch):
+    monkeypatch.setattr(config, "G2_RATING_PERIOD_DAYS", 7)
+    monkeypatch.setattr(config, "CHECKPOINT_INTERVAL", 2)
+    conn, tid, (a, b, c) = club(names=("A", "B", "C"), tournament="T1", date="2025-01-06")
+    # two weeks (Monday to Sunday); A plays twice in the first
+    for p1, p2, result, d in ((a, b, 1.0, "2025-01-06"), (c, a, 0.5, "2025-01-08"),
+                              (b, c, 0.0, "2025-01-13"), (a, b, 0.5, "2025-01-19")):
+        tournament.create_match(conn, tid, p1, p2, result, d)
+    incremental = snapshot(conn)
+
+    ranking.recompute(conn)
+    assert snapshot(conn) == incremental
+    week = conn.execute(
+        "SELECT player1_g2_rating_before, player1_g2_rating_after, player2_g2_rating_before, player2_g2_rating_after "
+        "FROM Matches WHERE id IN (1, 2) ORDER BY id").fetchall()
+    # A's games share the week-start rating and the week-end rating
+    assert week[0][0] == week[1][2] == config.G2_DEFAULT_RATING
+    assert week[0][1] == week[1][3] != week[0][0]
+    # checkpoints sit on the last match of a week
+    assert [row[0] for row in conn.execute("SELECT match_id FROM RatingCheckpoints ORDER BY match_id")] == [2, 4]
+
+    # a result changed mid-week replays the whole week
+    tournament.update_match(conn, 2, 1.0)
+    targeted = snapshot(conn)
+    assert targeted[1][0][6] != incremental[1][0][6]  # match 1's Glicko-2 after-values moved too
+    ranking.recompute(conn)
+    assert snapshot(conn) == targeted
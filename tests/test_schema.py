@@ -0,0 +1,143 @@
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+OLD_SCHEMA = [
+    "CREATE TABLE Players (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL, elo REAL)",
+    "CREATE TABLE Tournaments (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL, date TEXT NOT NULL)",
+    """CREATE TABLE TournamentPlayers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, tournament_id INTEGER NOT NULL, player_id INTEGER NOT NULL,
+        FOREIGN KEY(tournament_id) REFERENCES Tournaments(id), FOREIGN KEY(player_id) REFERENCES Players(id))""",
+    """CREATE TABLE Matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, tournament_id INTEGER NOT NULL,
+        player1_id INTEGER NOT NULL, player2_id INTEGER NOT NULL, result REAL NOT NULL, date TEXT NOT NULL,
+        FOREIGN KEY(tournament_id) REFERENCES Tournaments(id),
+        FOREIGN KEY(player1_id) REFERENCES Players(id), FOREIGN KEY(player2_id) REFERENCES Players(id))""",
+]
+
+
+def _season(club):
+    conn, tid, (a, b, c) = club(names=("A", "B", "C"), tournament="T1", register=True)
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-01")
+    tournament.create_match(conn, tid, b, c, 0.5, "2025-01-02")
+    return conn, (a, b, c), tid
+
+
+def _plans(conn, fn, *args):
+    """Run a repo function and return the query plan of every SELECT it issued."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn(conn, *args)
+    finally:
+        conn.set_trace_callback(None)
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith("SELECT"):
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+            plans.append(" | ".join(row[3] for row in rows))
+    return plans
+
+
+def test_player_history_uses_both_player_indexes(club):
+    conn, (a, _, _), _ = _season(club)
+    (plan,) = _plans(conn, repo.list_matches_for_player, a)
+    assert "idx_matches_player1" in plan
+    assert "idx_matches_player2" in plan
+    assert "SCAN m" not in plan
+
+
+def test_ordered_replay_uses_covering_index_without_sort(club):
+    conn, _, _ = _season(club)
+    (plan,) = _plans(conn, repo.get_all_matches_ordered)
+    assert "USING COVERING INDEX idx_matches_date_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_tournament_lookups_use_indexes(club):
+    conn, _, tid = _season(club)
+    (plan,) = _plans(conn, repo.list_matches_for_tournament, tid)
+    assert "idx_matches_tournament" in plan
+    assert "TEMP B-TREE" not in plan
+
+    (plan,) = _plans(conn, repo.get_tournament_players, tid)
+    assert "USING COVERING INDEX idx_tournament_players_tournament" in plan
+
+    (plan,) = _plans(conn, repo.count_matches_for_tournament, tid)
+    assert "idx_matches_tournament" in plan
+
+    (plan,) = _plans(conn, repo.get_tournament_pairings, tid)
+    assert "USING COVERING INDEX idx_matches_tournament_pairs" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_deletes_cascade_to_matches_and_registrations(club):
+    conn, (a, b, c), tid = _season(club)
+    repo.delete_player(conn, a)
+    assert conn.execute("SELECT COUNT(*) FROM Matches WHERE player1_id = ? OR player2_id = ?", (a, a)).fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM TournamentPlayers WHERE player_id = ?", (a,)).fetchone()[0] == 0
+
+    repo.delete_tournament(conn, tid)
+    assert conn.execute("SELECT COUNT(*) FROM Matches").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM TournamentPlayers").fetchone()[0] == 0
+
+
+def test_migration_rebuilds_old_tables_with_cascades_and_keeps_rows():
+    conn = dbm.get_connection(":memory:")
+    for stmt in OLD_SCHEMA:
+        conn.execute(stmt)
+    conn.execute("INSERT INTO Players (name, elo) VALUES ('A', 1000), ('B', 1000)")
+    conn.execute("INSERT INTO Tournaments (name, date) VALUES ('T1', '2025-01-01')")
+    conn.execute("INSERT INTO TournamentPlayers (tournament_id, player_id) VALUES (1, 1), (1, 2)")
+    conn.execute("INSERT INTO Matches (tournament_id, player1_id, player2_id, result, date) VALUES (1, 1, 2, 1.0, '2025-01-01')")
+    conn.commit()
+
+    dbm.init_db(conn)
+
+    for table in ("Matches", "TournamentPlayers"):
+        fks = conn.execute(f"PRAGMA foreign_key_list({table})").fetchall()
+        assert fks and all(fk[6] == "CASCADE" for fk in fks)
+    assert repo.get_match(conn, 1) == (1, 1, 1, 2, 1.0, "2025-01-01")
+    assert len(repo.get_tournament_players(conn, 1)) == 2
+    assert repo.get_player_summary(conn, 1)[:2] == (1, 1)
+
+    repo.delete_player(conn, 1)
+    assert repo.get_match(conn, 1) is None
+
+
+def test_up_to_date_database_skips_migrations(tmp_path):
+    path = str(tmp_path / "club.db")
+    conn = dbm.get_connection(path)
+    dbm.init_db(conn)
+    assert dbm.schema_version(conn) == dbm.SCHEMA_VERSION
+    conn.close()
+
+    conn = dbm.get_connection(path)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    dbm.init_db(conn)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_old_database_is_rebuilt_in_chunks_and_stamped(monkeypatch, capsys):
+    monkeypatch.setattr(dbm, "REBUILD_CHUNK_ROWS", 2)
+    conn = dbm.get_connection(":memory:")
+    for stmt in OLD_SCHEMA:
+        conn.execute(stmt)
+    conn.execute("INSERT INTO Players (name, elo) VALUES ('A', 1000), ('B', 1000)")
+    conn.execute("INSERT INTO Tournaments (name, date) VALUES ('T1', '2025-01-01')")
+    for day in range(1, 6):
+        conn.execute(
+            "INSERT INTO Matches (tournament_id, player1_id, player2_id, result, date) VALUES (1, 1, 2, 1.0, ?)",
+            (f"2025-01-0{day}",),
+        )
+    conn.commit()
+
+    dbm.init_db(conn)
+
+    assert dbm.schema_version(conn) == dbm.SCHEMA_VERSION
+    assert "Rebuilding Matches: 5/5 rows copied" in capsys.readouterr().out
+    assert [row[0] for row in conn.execute("SELECT id FROM Matches ORDER BY id")] == [1, 2, 3, 4, 5]
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(Matches)")}
+    assert {"idx_matches_player1", "idx_matches_date_id"} <= indexes
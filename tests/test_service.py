@@ -25,8 +25,8 @@ def test_record_match_result_persists_profiles_and_match_audits():
     # players' profiles should be updated
     p1_row = repo.get_player(conn, p1)
     p2_row = repo.get_player(conn, p2)
-    assert p1_row[2] == summary.get('p1_elo_after')
-    assert p2_row[2] == summary.get('p2_elo_after')
+    assert p1_row[2] == summary.p1_elo_after
+    assert p2_row[2] == summary.p2_elo_after
 
     # last_game_date should be set
     assert p1_row[3] == "2025-12-30"
@@ -38,5 +38,5 @@ def test_record_match_result_persists_profiles_and_match_audits():
     row = matches[0]
     # with the explicit SELECT ordering in repo.list_matches_for_tournament,
     # indices are: 0=id,1=p1_name,2=p2_name,3=result,4=date,5=player1_elo_before,6=player1_elo_after
-    assert row[5] == summary.get('p1_elo_before')
-    assert row[6] == summary.get('p1_elo_after')
+    assert row[5] == summary.p1_elo_before
+    assert row[6] == summary.p1_elo_after
@@ -0,0 +1,53 @@
+import chess_club.db as dbm
+import chess_club.repo as repo
+import chess_club.tournament as tournament
+
+
+def _trace_commits(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return lambda: [s for s in statements if s.strip().upper().startswith(("COMMIT", "ROLLBACK"))]
+
+
+def test_create_match_is_one_commit(club, tmp_path):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+    ends = _trace_commits(conn)
+    tournament.create_match(conn, tid, a, b, 1.0, "2025-01-01")
+    tournament.update_match(conn, 1, 0.5)
+    tournament.complete_tournament(conn, tid)
+    assert [s.upper() for s in ends()] == ["COMMIT"] * 3
+    assert not conn.in_transaction
+
+
+def test_failed_operation_leaves_no_partial_writes(club, tmp_path, monkeypatch):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(repo, "bulk_update_match_audits", boom)
+    try:
+        tournament.create_match(conn, tid, a, b, 1.0, "2025-01-01")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+    assert not conn.in_transaction
+    assert repo.count_matches_for_tournament(conn, tid) == 0
+    assert repo.get_player_summary(conn, a)[0] == 0
+
+
+def test_nested_unit_rolls_back_to_its_savepoint(club, tmp_path):
+    conn, tid, (a, b) = club(tmp_path / "club.db")
+    with dbm.UnitOfWork(conn):
+        repo.add_player(conn, "C")
+        try:
+            with dbm.UnitOfWork(conn):
+                repo.add_player(conn, "D")
+                raise ValueError("inner")
+        except ValueError:
+            pass
+    names = set(repo.get_player_ids_by_name(conn, ["C", "D"]))
+    assert names == {"C"}
+    other = dbm.get_connection(str(tmp_path / "club.db"))
+    assert set(repo.get_player_ids_by_name(other, ["C", "D"])) == {"C"}